@@ -2,6 +2,8 @@ from typing import Dict
 class Course:
     """Represents a course entity in the grade management system."""
 
+    __slots__ = ("_course_code", "_course_name")  ## no per-instance __dict__
+
     def __init__(self, course_code: str, course_name: str):
         self._course_code = course_code
         self._course_name = course_name
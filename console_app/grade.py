@@ -1,6 +1,8 @@
 from typing import Dict, List, Optional
 from student import Student
 from course import Course
+from bisect import bisect_right
+import csv
 import json
 import os
 
@@ -14,7 +16,11 @@ class GradeManager:
         """Initialize the GradeManager with empty collections."""
         self._students: Dict[str, Student] = {}  ##mapping student_id to Student
         self._courses: Dict[str, Course] = {}    ##mapping course_code to Course
-        self._enrollments: Dict[str, List[str]] = {}  ##mapping course_code to list of student_ids
+        self._enrollments: Dict[str, Dict[str, None]] = {}  ##mapping course_code to insertion-ordered set of student_ids
+        self._student_courses: Dict[str, List[str]] = {}  ##mapping student_id to list of course_codes
+        self._transcript_cache: Dict[str, Dict] = {}  ##memoized transcripts, dropped when a student's grades change
+        self.transcript_cache_hits = 0
+        self.transcript_cache_misses = 0
 
     def add_student(self, student: Student) -> bool:
         """
@@ -34,7 +40,7 @@ class GradeManager:
             return False
 
         self._courses[course.course_code] = course
-        self._enrollments[course.course_code] = []
+        self._enrollments[course.course_code] = {}
         return True
 
     def get_student(self, student_id: str) -> Optional[Student]:
@@ -51,10 +57,11 @@ class GradeManager:
         """
         if (student_id not in self._students or
             course_code not in self._courses or
-            student_id in self._enrollments.get(course_code, [])):
+            student_id in self._enrollments.get(course_code, {})):
             return False
 
-        self._enrollments[course_code].append(student_id)
+        self._enrollments[course_code][student_id] = None
+        self._student_courses.setdefault(student_id, []).append(course_code)
         return True
 
     def assign_grade(self, student_id: str, course_code: str, grade: float) -> bool:
@@ -63,11 +70,12 @@ class GradeManager:
         """
         if (student_id not in self._students or
             course_code not in self._courses or
-            student_id not in self._enrollments.get(course_code, [])):
+            student_id not in self._enrollments.get(course_code, {})):
             return False
 
         student = self._students[student_id]
         student.add_grade(course_code, grade)
+        self._transcript_cache.pop(student_id, None)
         return True
 
     def get_student_grades(self, student_id: str) -> Optional[Dict[str, float]]:
@@ -85,7 +93,7 @@ class GradeManager:
             return None
 
         grades = []
-        for student_id in self._enrollments.get(course_code, []):
+        for student_id in self._enrollments.get(course_code, {}):
             student = self._students[student_id]
             grade = student.get_grade(course_code)
             if grade is not None:
@@ -106,9 +114,21 @@ class GradeManager:
         if course_code not in self._courses:
             return []
 
-        student_ids = self._enrollments.get(course_code, [])
+        student_ids = self._enrollments.get(course_code, {})
         return [self._students[sid] for sid in student_ids if sid in self._students]
 
+    def get_student_courses(self, student_id: str) -> List[Course]:
+        """Gets all courses a specific student is enrolled in."""
+        course_codes = self._student_courses.get(student_id, [])
+        return [self._courses[code] for code in course_codes if code in self._courses]
+
+    def _rebuild_student_courses(self) -> None:
+        """Rebuilds the student to courses index from the enrollments."""
+        self._student_courses = {}
+        for course_code, student_ids in self._enrollments.items():
+            for student_id in student_ids:
+                self._student_courses.setdefault(student_id, []).append(course_code)
+
     def save_to_json(self, filename: str) -> bool:
         """
         Saves the system data to a JSON file.
@@ -117,7 +137,7 @@ class GradeManager:
             data = {
                 "students": {sid: student.to_dict() for sid, student in self._students.items()},
                 "courses": {code: course.to_dict() for code, course in self._courses.items()},
-                "enrollments": self._enrollments
+                "enrollments": {code: list(roster) for code, roster in self._enrollments.items()}
             }
 
             with open(filename, 'w') as f:
@@ -149,21 +169,72 @@ class GradeManager:
                 student = Student.from_dict(student_data)
                 manager._students[student.student_id] = student
 
-            manager._enrollments = data["enrollments"]
+            manager._enrollments = {code: dict.fromkeys(ids) for code, ids in data["enrollments"].items()}
+            manager._rebuild_student_courses()
             return manager
         except Exception as e:
             print(f"Error loading data: {e}")
             return None
 
+    def import_roster(self, filename: str, create_missing: bool = False) -> Optional[Dict[str, int]]:
+        """
+        Enrolls many students from a CSV roster file in one pass.
+
+        Each row holds student_id, course_code and optionally student_name,
+        which is used to create unknown students when create_missing is set.
+        A header row naming the columns is skipped.
+        """
+        summary = {"enrolled": 0, "duplicates": 0, "created_students": 0,
+                   "unknown_students": 0, "unknown_courses": 0, "invalid_rows": 0}
+        try:
+            with open(filename, newline='') as f:
+                for row in csv.reader(f):
+                    row = [value.strip() for value in row]
+                    if not row or row[:2] == ["student_id", "course_code"]:
+                        continue
+                    if len(row) < 2 or not row[0] or not row[1]:
+                        summary["invalid_rows"] += 1
+                        continue
+
+                    student_id, course_code = row[0], row[1]
+                    if course_code not in self._courses:
+                        summary["unknown_courses"] += 1
+                        continue
+                    if student_id not in self._students:
+                        if not create_missing or len(row) < 3 or not row[2]:
+                            summary["unknown_students"] += 1
+                            continue
+                        self.add_student(Student(student_id, row[2]))
+                        summary["created_students"] += 1
+
+                    if self.register_student_for_course(student_id, course_code):
+                        summary["enrolled"] += 1
+                    else:
+                        summary["duplicates"] += 1
+            return summary
+        except Exception as e:
+            print(f"Error importing roster: {e}")
+            return None
+
     def generate_student_transcript(self, student_id: str) -> Optional[Dict]:
         """
         Generates a complete transcript for a specific student.
+
+        Transcripts are memoized per student until that student's grades change.
         """
+        cached = self._transcript_cache.get(student_id)
+        if cached is not None:
+            self.transcript_cache_hits += 1
+            return cached
+
         student = self.get_student(student_id)
         if not student:
             return None
 
-        return student.get_transcript(self)
+        self.transcript_cache_misses += 1
+        transcript = student.get_transcript(self)
+        self._transcript_cache[student_id] = transcript
+        return transcript
 
     def print_student_transcript(self, student_id: str) -> bool:
         """
@@ -191,7 +262,17 @@ class GradeManager:
         return True
     
 class GradeCategory:
-    """Utility class for categorizing numeric grades into letter grades."""
+    """
+    Utility class for categorizing numeric grades into letter grades.
+
+    The grading scale is a sorted table of lower bounds, so a grade is looked
+    up with a binary search instead of a chain of comparisons.
+    """
+
+    BOUNDS = [40, 50, 60, 70, 75, 80]              ## lower bound of every letter above F
+    LETTERS = ["F", "E", "C-", "C+", "B-", "B+", "A"]
+    POINTS = [0.0, 2.0, 3.0, 3.5, 4.0, 4.5, 5.0]   ## grade points per letter
+    PASS_MARK = 40
 
     @staticmethod
     def get_letter_grade(numeric_grade: float) -> str:
@@ -204,20 +285,18 @@ class GradeCategory:
         Returns:
             The corresponding letter grade
         """
-        if numeric_grade >= 80:
-            return "A"
-        elif numeric_grade >= 75:
-            return "B+"
-        elif numeric_grade >= 70:
-            return "B-"
-        elif numeric_grade >= 60:
-            return "C+"
-        elif numeric_grade >= 50:
-            return "C-"
-        elif numeric_grade >= 40:
-            return "E"
-        else:
-            return "F"
+        return GradeCategory.LETTERS[bisect_right(GradeCategory.BOUNDS, numeric_grade)]
+
+    @staticmethod
+    def get_grade_points(numeric_grade: float) -> float:
+        """Get the grade points a numeric grade counts for in the GPA."""
+        return GradeCategory.POINTS[bisect_right(GradeCategory.BOUNDS, numeric_grade)]
+
+    @staticmethod
+    def get_letter_grades(numeric_grades: List[float]) -> List[str]:
+        """Convert many numeric grades to letter grades in one call."""
+        bounds, letters = GradeCategory.BOUNDS, GradeCategory.LETTERS
+        return [letters[bisect_right(bounds, grade)] for grade in numeric_grades]
 
     @staticmethod
     def is_passing(numeric_grade: float) -> bool:
@@ -230,4 +309,4 @@ class GradeCategory:
         Returns:
             True if the grade is passing, False otherwise
         """
-        return numeric_grade >= 40
\ No newline at end of file
+        return numeric_grade >= GradeCategory.PASS_MARK
@@ -93,10 +93,11 @@ def data_menu():
     print("\n===== DATA MANAGEMENT =====")
     print("1. Save Data to File")
     print("2. Load Data from File")
+    print("3. Import Roster File")
     print("0. Back to Main Menu")
 
-    return get_input("\nSelect an option (0-2): ",
-                    [lambda x: x.isdigit() and 0 <= int(x) <= 2])
+    return get_input("\nSelect an option (0-3): ",
+                    [lambda x: x.isdigit() and 0 <= int(x) <= 3])
 
 def run_grade_management_system():
     """Runing the interactive grade management system."""
@@ -161,11 +162,7 @@ def handle_student_menu(manager):
                 print(f"ID: {student.student_id}")
                 print(f"Name: {student.student_name}")
 
-                enrolled_courses = []
-                for course in manager.get_all_courses():
-                    course_students = manager.get_course_students(course.course_code)
-                    if student in course_students:
-                        enrolled_courses.append(course)
+                enrolled_courses = manager.get_student_courses(student_id)
 
                 if enrolled_courses:
                     print("\nEnrolled Courses:")
@@ -271,11 +268,7 @@ def handle_grade_menu(manager):
                 print(f"\nStudent with ID {student_id} not found!")
             else:
                 # finding courses the student is enrolled in
-                enrolled_courses = []
-                for course in manager.get_all_courses():
-                    course_students = manager.get_course_students(course.course_code)
-                    if student in course_students:
-                        enrolled_courses.append(course)
+                enrolled_courses = manager.get_student_courses(student_id)
 
                 if not enrolled_courses:
                     print(f"\nStudent {student.student_name} is not enrolled in any courses.")
@@ -358,15 +351,10 @@ def handle_report_menu(manager):
                     print(f"\n===== PERFORMANCE SUMMARY FOR {course.course_name} =====")
 
                     ## getting grades for reporting
-                    grades = []
-                    grade_distribution = {"A": 0, "B+": 0, "B-": 0, "C+": 0, "C-": 0, "E": 0, "F": 0}
-
-                    for student in students:
-                        grade = student.get_grade(course_code)
-                        if grade is not None:
-                            grades.append(grade)
-                            letter_grade = GradeCategory.get_letter_grade(grade)
-                            grade_distribution[letter_grade] += 1
+                    grades = [g for g in (student.get_grade(course_code) for student in students) if g is not None]
+                    grade_distribution = {letter: 0 for letter in reversed(GradeCategory.LETTERS)}
+                    for letter_grade in GradeCategory.get_letter_grades(grades):
+                        grade_distribution[letter_grade] += 1
 
                     ## printing summary statistics
                     if grades:
@@ -419,6 +407,21 @@ def handle_data_menu(manager):
             else:
                 print(f"\nFailed to load data from {filename}.")
 
+        elif choice == "3":  ##importing a roster of enrollments
+            filename = get_input("Enter roster CSV filename (student_id,course_code[,student_name]): ")
+            create_missing = get_input("Create missing students? (y/n): ").strip().lower() == "y"
+            summary = manager.import_roster(filename, create_missing)
+            if summary:
+                print(f"\nRoster imported from {filename}:")
+                print(f"  Enrolled: {summary['enrolled']}")
+                print(f"  Already enrolled: {summary['duplicates']}")
+                print(f"  Students created: {summary['created_students']}")
+                print(f"  Unknown students: {summary['unknown_students']}")
+                print(f"  Unknown courses: {summary['unknown_courses']}")
+                print(f"  Invalid rows: {summary['invalid_rows']}")
+            else:
+                print(f"\nFailed to import roster from {filename}.")
+
         ##waiting for user to press Enter before returning to the menu
         input("\nPress Enter to continue...")
 
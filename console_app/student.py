@@ -6,6 +6,8 @@ if TYPE_CHECKING:
 class Student:
     """Represents a student entity in the grade management system."""
 
+    __slots__ = ("_student_id", "_student_name", "_grades")  ## no per-instance __dict__
+
     def __init__(self, student_id: str, student_name: str):
         self._student_id = student_id
         self._student_name = student_name
@@ -96,19 +98,8 @@ class Student:
 
             if passed:
                 transcript["passed_courses"] += 1
-                # Simple GPA calculation (can be refined with proper credit hours)
-                if letter_grade == "A":
-                    total_grade_points += 5.0
-                elif letter_grade == "B+":
-                    total_grade_points += 4.5
-                elif letter_grade == "B-":
-                    total_grade_points += 4.0
-                elif letter_grade == "C+":
-                    total_grade_points += 3.5
-                elif letter_grade == "C-":
-                    total_grade_points += 3.0
-                elif letter_grade == "E":
-                    total_grade_points += 2.0
+            # Simple GPA calculation (can be refined with proper credit hours)
+            total_grade_points += GradeCategory.get_grade_points(numeric_grade)
 
         if transcript["total_courses"] > 0:
             transcript["gpa"] = round(total_grade_points / transcript["total_courses"], 2)
@@ -0,0 +1,59 @@
+"""
+Cohort-wide analytics: columnar NumPy engine versus the ReportController path.
+
+Times course performance for every course plus the GPA of every student,
+once through ReportController/transcripts and once through the columnar
+engine. Requires numpy. Run from web_app/backend:
+
+    python -m benchmarks.bench_columnar_engine --grades 1000000
+"""
+import argparse
+import time
+
+from controllers.report_controller import ReportController
+from models.domain_models import GradeManager
+from repositories.json_repository import JSONRepository
+from services.data_service import DataService
+from services.columnar_engine import ColumnarGradeEngine
+from benchmarks.synthetic import make_dataset
+
+COURSES_PER_STUDENT = 4
+
+def run(grades, num_courses):
+    manager = GradeManager.from_dict(make_dataset(grades // COURSES_PER_STUDENT, num_courses=num_courses,
+                                                  courses_per_student=COURSES_PER_STUDENT))
+    controller = ReportController(DataService(JSONRepository("/dev/null"), manager))
+    codes = [c.course_code for c in manager.get_all_courses()]
+    ids = [s.student_id for s in manager.get_all_students()]
+    
+    start = time.perf_counter()
+    for code in codes:
+        controller.generate_course_performance(code)
+    courses_py = time.perf_counter() - start
+    start = time.perf_counter()
+    for sid in ids:
+        manager._build_student_transcript(sid)["gpa"]
+    gpa_py = time.perf_counter() - start
+    
+    start = time.perf_counter()
+    engine = ColumnarGradeEngine(manager)
+    build = time.perf_counter() - start
+    start = time.perf_counter()
+    engine.course_summaries()
+    courses_np = time.perf_counter() - start
+    start = time.perf_counter()
+    engine.student_gpas()
+    gpa_np = time.perf_counter() - start
+    
+    print(f"grades: {grades}, courses: {num_courses}, students: {len(ids)}")
+    print(f"{'':>22} {'python (s)':>11} {'columnar (s)':>13}")
+    print(f"{'all course reports':>22} {courses_py:>11.3f} {courses_np:>13.3f}")
+    print(f"{'all student GPAs':>22} {gpa_py:>11.3f} {gpa_np:>13.3f}")
+    print(f"{'engine build':>22} {'':>11} {build:>13.3f}")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--grades", type=int, default=1000000)
+    parser.add_argument("--courses", type=int, default=200)
+    args = parser.parse_args()
+    run(args.grades, args.courses)
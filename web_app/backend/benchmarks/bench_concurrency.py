@@ -0,0 +1,130 @@
+"""
+Throughput and latency with many concurrent clients against a live server.
+
+Starts uvicorn on a copy of a synthetic dataset and runs the given number
+of concurrent clients for a fixed time. Each client loops over student
+lookups and transcripts, with a share of grade assignments mixed in, and
+the run reports requests per second and latency percentiles. Run from
+web_app/backend:
+
+    python -m benchmarks.bench_concurrency --clients 50 200 400
+
+Every client keeps its own keep-alive connection and speaks plain
+HTTP/1.1 over asyncio streams, since a pooled HTTP client spends more
+time managing hundreds of connections than the server spends answering.
+--app-dir points the server at another checkout of web_app/backend, for
+comparing against an older version of the routes.
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import subprocess
+import sys
+import tempfile
+import time
+
+import httpx
+
+from benchmarks.synthetic import make_dataset
+
+def percentile(values, fraction: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * fraction))]
+
+async def request(reader, writer, method: str, path: str, body: bytes = b"") -> int:
+    """Send one request on a keep-alive connection and return the status code."""
+    head = f"{method} {path} HTTP/1.1\r\nHost: bench\r\nContent-Length: {len(body)}\r\n"
+    if body:
+        head += "Content-Type: application/json\r\n"
+    writer.write(head.encode() + b"\r\n" + body)
+    status_line = await reader.readline()
+    length = 0
+    while True:
+        line = await reader.readline()
+        if line in (b"\r\n", b""):
+            break
+        name, _, value = line.decode().partition(":")
+        if name.lower() == "content-length":
+            length = int(value)
+    await reader.readexactly(length)
+    return int(status_line.split()[1])
+
+async def client_loop(port: int, pairs, write_share: float, deadline: float, latencies, rng: random.Random):
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    try:
+        while time.perf_counter() < deadline:
+            student_id, course_code = rng.choice(pairs)
+            roll = rng.random()
+            start = time.perf_counter()
+            if roll < write_share:
+                body = json.dumps({"student_id": student_id, "course_code": course_code,
+                                   "grade": float(rng.randint(0, 100))}).encode()
+                status = await request(reader, writer, "POST", "/grades/assign", body)
+            elif roll < (1 + write_share) / 2:
+                status = await request(reader, writer, "GET", f"/students/{student_id}")
+            else:
+                status = await request(reader, writer, "GET", f"/reports/transcript/{student_id}")
+            latencies.append((time.perf_counter() - start) * 1000)
+            if status >= 400:
+                raise RuntimeError(f"Request failed with status {status}")
+    finally:
+        writer.close()
+
+async def run_clients(port: int, clients: int, seconds: float, pairs, write_share: float):
+    latencies = []
+    deadline = time.perf_counter() + seconds
+    start = time.perf_counter()
+    await asyncio.gather(*(client_loop(port, pairs, write_share, deadline, latencies, random.Random(i))
+                           for i in range(clients)))
+    elapsed = time.perf_counter() - start
+    return len(latencies) / elapsed, percentile(latencies, 0.5), percentile(latencies, 0.99)
+
+def wait_for_server(url: str, timeout: float = 120) -> None:
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        try:
+            if httpx.get(url + "/students/?limit=1").status_code == 200:
+                return
+        except httpx.HTTPError:
+            pass
+        time.sleep(0.2)
+    raise RuntimeError("Server did not start")
+
+def run(app_dir: str, client_counts, students: int, seconds: float, write_share: float,
+        writer_delay: float, port: int):
+    data = make_dataset(students)
+    pairs = [(sid, code) for sid, s in data["students"].items() for code in s["grades"]]
+    url = f"http://127.0.0.1:{port}"
+    print(f"{'clients':>8} {'req/s':>8} {'p50 ms':>8} {'p99 ms':>8}")
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "grade_data.json")
+        with open(path, "w") as f:
+            json.dump(data, f)
+        env = dict(os.environ, GRADE_DATA_FILE=path, GRADE_WRITER_MAX_DELAY=str(writer_delay))
+        server = subprocess.Popen(
+            [sys.executable, "-m", "uvicorn", "main:app", "--port", str(port), "--log-level", "warning", "--timeout-keep-alive", "120"],
+            cwd=app_dir, env=env)
+        try:
+            wait_for_server(url)
+            for clients in client_counts:
+                rate, p50, p99 = asyncio.run(run_clients(port, clients, seconds, pairs, write_share))
+                print(f"{clients:>8} {rate:>8.0f} {p50:>8.1f} {p99:>8.1f}")
+        finally:
+            server.terminate()
+            server.wait()
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--clients", type=int, nargs="+", default=[50, 200, 400])
+    parser.add_argument("--students", type=int, default=10000)
+    parser.add_argument("--seconds", type=float, default=10)
+    parser.add_argument("--write-share", type=float, default=0.1)
+    parser.add_argument("--writer-delay", type=float, default=0.05,
+                        help="GRADE_WRITER_MAX_DELAY for the server, 0 saves on every write")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--app-dir", default=".")
+    args = parser.parse_args()
+    run(args.app_dir, args.clients, args.students, args.seconds, args.write_share,
+        args.writer_delay, args.port)
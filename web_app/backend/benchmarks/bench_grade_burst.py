@@ -0,0 +1,67 @@
+"""
+Throughput of a burst of grade entries with and without group commit.
+
+Fires all grade entries at the grade controller concurrently, as the
+event loop does under load, and reports grades per second and the number
+of saves issued.
+Run from web_app/backend:
+
+    python -m benchmarks.bench_grade_burst
+"""
+import argparse
+import asyncio
+import os
+import tempfile
+import time
+
+from controllers.grade_controller import GradeController
+from models.domain_models import GradeManager
+from repositories.json_repository import JSONRepository
+from services.data_service import DataService
+from benchmarks.synthetic import make_dataset
+
+class CountingRepository(JSONRepository):
+    """JSONRepository that counts how often it writes the file."""
+    
+    def __init__(self, file_path: str):
+        super().__init__(file_path)
+        self.saves = 0
+    
+    def save(self, manager: GradeManager) -> bool:
+        self.saves += 1
+        return super().save(manager)
+
+def run_burst(size: int, grades: int, max_delay: float):
+    manager = GradeManager.from_dict(make_dataset(size))
+    pairs = [(s.student_id, code) for s in manager.get_all_students()
+             for code in s.get_all_grades()][:grades]
+    
+    with tempfile.TemporaryDirectory() as tmp:
+        repository = CountingRepository(os.path.join(tmp, "grade_data.json"))
+        service = DataService(repository, manager)
+        if max_delay > 0:
+            service.start_background_writer(max_delay)
+        controller = GradeController(service)
+        
+        async def burst():
+            await asyncio.gather(*(controller.assign_grade(sid, code, 65.0) for sid, code in pairs))
+        
+        start = time.perf_counter()
+        asyncio.run(burst())
+        service.wait_until_saved()
+        elapsed = time.perf_counter() - start
+        service.close()
+    return len(pairs) / elapsed, repository.saves
+
+def run(size, grades):
+    print(f"{'mode':>14} {'grades/s':>10} {'saves':>7}")
+    for label, delay in [("sync", 0.0), ("group 50ms", 0.05), ("group 500ms", 0.5)]:
+        rate, saves = run_burst(size, grades, delay)
+        print(f"{label:>14} {rate:>10.0f} {saves:>7}")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--students", type=int, default=5000)
+    parser.add_argument("--grades", type=int, default=500)
+    args = parser.parse_args()
+    run(args.students, args.grades)
@@ -0,0 +1,102 @@
+"""
+Memory used by loading a large synthetic grade_data.json.
+
+Writes a synthetic dataset, then loads it with JSONRepository in fresh
+interpreters so the numbers only cover loading: peak RSS, the RSS held
+after the load, the bytes per student the loaded GradeManager keeps
+allocated (measured with tracemalloc in a second run, since RSS also
+counts freed but unreturned memory) and the size of a single Student and
+Course object, including its __dict__ if it has one. Run from
+web_app/backend:
+
+    python -m benchmarks.bench_memory --students 1000000
+"""
+import argparse
+import gc
+import json
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import tracemalloc
+
+from benchmarks.synthetic import make_dataset
+
+def current_rss_kb() -> int:
+    with open("/proc/self/statm") as f:
+        return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") // 1024
+
+def object_size(obj) -> int:
+    size = sys.getsizeof(obj)
+    if hasattr(obj, "__dict__"):
+        size += sys.getsizeof(obj.__dict__)
+    return size
+
+def measure(path: str) -> dict:
+    """Load the file and report RSS figures; runs in a child process."""
+    from repositories.json_repository import JSONRepository
+
+    gc.collect()
+    before = current_rss_kb()
+    manager = JSONRepository(path).load()
+    gc.collect()
+    after = current_rss_kb()
+
+    return {
+        "students": len(manager.get_all_students()),
+        "peak_rss_mb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,
+        "held_rss_mb": (after - before) / 1024,
+        "student_object_bytes": object_size(manager.get_all_students()[0]),
+        "course_object_bytes": object_size(manager.get_all_courses()[0])
+    }
+
+def trace(path: str) -> dict:
+    """Load the file under tracemalloc and report the bytes kept allocated."""
+    from repositories.json_repository import JSONRepository
+
+    tracemalloc.start()
+    manager = JSONRepository(path).load()
+    gc.collect()
+    kept, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    students = len(manager.get_all_students())
+    return {"bytes_per_student": kept / max(1, students), "traced_peak_mb": peak / 1024 / 1024}
+
+def run_child(*args) -> dict:
+    output = subprocess.run([sys.executable, "-m", "benchmarks.bench_memory", *args],
+                            check=True, capture_output=True, text=True).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+def run(num_students: int, courses_per_student: int):
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "grade_data.json")
+        with open(path, "w") as f:
+            json.dump(make_dataset(num_students, courses_per_student=courses_per_student), f)
+        size_mb = os.path.getsize(path) / 1024 / 1024
+
+        result = run_child("--measure", path)
+        result.update(run_child("--trace", path))
+
+    print(f"students:             {result['students']}")
+    print(f"file size:            {size_mb:.1f} MB")
+    print(f"peak RSS:             {result['peak_rss_mb']:.1f} MB")
+    print(f"RSS held after load:  {result['held_rss_mb']:.1f} MB")
+    print(f"traced peak:          {result['traced_peak_mb']:.1f} MB")
+    print(f"bytes per student:    {result['bytes_per_student']:.0f}")
+    print(f"Student object:       {result['student_object_bytes']} bytes")
+    print(f"Course object:        {result['course_object_bytes']} bytes")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--students", type=int, default=1000000)
+    parser.add_argument("--courses-per-student", type=int, default=4)
+    parser.add_argument("--measure", metavar="PATH", help=argparse.SUPPRESS)
+    parser.add_argument("--trace", metavar="PATH", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    if args.measure:
+        print(json.dumps(measure(args.measure)))
+    elif args.trace:
+        print(json.dumps(trace(args.trace)))
+    else:
+        run(args.students, args.courses_per_student)
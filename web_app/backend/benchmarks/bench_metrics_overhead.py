@@ -0,0 +1,92 @@
+"""
+Overhead of the /metrics instrumentation.
+
+Times the metric primitives on their own, then runs the in-process load test
+with GRADE_METRICS=1 and GRADE_METRICS=0, alternating, and compares
+throughput and latency. The default mix is read-only: with writes, every
+request waits on a save of the whole file and any difference disappears in
+the noise. GRADE_METRICS only switches the per-request middleware; the
+repository and serialization timers always run and are covered by the
+primitive timings, next to the milliseconds a load or save takes. Run from
+web_app/backend:
+
+    python -m benchmarks.bench_metrics_overhead --students 10000 --rounds 3
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+from services import metrics
+
+def per_call_ns(func, calls: int = 200000) -> float:
+    start = time.perf_counter()
+    for _ in range(calls):
+        func()
+    return (time.perf_counter() - start) / calls * 1e9
+
+def primitives() -> None:
+    counter = metrics.Counter("bench_total", "", ("method", "route", "status"))
+    histogram = metrics.Histogram("bench_seconds", "", ("method", "route"))
+
+    def timed_block():
+        with histogram.time(method="GET", route="/students/{student_id}"):
+            pass
+
+    print(f"{'primitive':<28} {'ns/call':>8}")
+    for name, func in [
+        ("Counter.inc", lambda: counter.inc(method="GET", route="/students/{student_id}", status=200)),
+        ("Histogram.observe", lambda: histogram.observe(0.0012, method="GET", route="/students/{student_id}")),
+        ("with Histogram.time()", timed_block),
+    ]:
+        print(f"{name:<28} {per_call_ns(func):>8.0f}")
+    start = time.perf_counter()
+    metrics.REGISTRY.render()
+    print(f"{'REGISTRY.render()':<28} {(time.perf_counter() - start) * 1e9:>8.0f}")
+
+def load_test(enabled: bool, args, output: str) -> dict:
+    env = dict(os.environ, GRADE_METRICS="1" if enabled else "0")
+    subprocess.run(
+        [sys.executable, "-m", "benchmarks.load_test", "--students", str(args.students),
+         "--clients", str(args.clients), "--seconds", str(args.seconds),
+         "--write-share", str(args.write_share), "--output", output],
+        env=env, check=True, stdout=subprocess.DEVNULL)
+    with open(output) as f:
+        rows = json.load(f)["results"][0]["routes"]
+    return next(row for row in rows if row["route"] == "ALL")
+
+def run(args) -> None:
+    primitives()
+
+    results = {True: [], False: []}
+    with tempfile.TemporaryDirectory() as tmp:
+        for round_number in range(args.rounds):
+            # Alternate the order so drift in machine load hits both sides
+            for enabled in ((True, False) if round_number % 2 == 0 else (False, True)):
+                results[enabled].append(load_test(enabled, args, os.path.join(tmp, "load.json")))
+
+    print(f"\n{args.students} students, {args.clients} clients, {args.rounds} rounds of {args.seconds:.0f}s, medians")
+    print(f"{'GRADE_METRICS':<14} {'req/s':>8} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8}")
+    medians = {}
+    for enabled in (False, True):
+        rows = results[enabled]
+        medians[enabled] = {key: statistics.median(row[key] for row in rows)
+                            for key in ("requests_per_second", "p50_ms", "p95_ms", "p99_ms")}
+        m = medians[enabled]
+        print(f"{int(enabled):<14} {m['requests_per_second']:>8.1f} {m['p50_ms']:>8.3f} "
+              f"{m['p95_ms']:>8.3f} {m['p99_ms']:>8.3f}")
+    change = medians[True]["requests_per_second"] / medians[False]["requests_per_second"] - 1
+    print(f"throughput change with metrics: {change * 100:+.1f}%")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--students", type=int, default=10000)
+    parser.add_argument("--clients", type=int, default=20)
+    parser.add_argument("--seconds", type=float, default=5)
+    parser.add_argument("--rounds", type=int, default=3)
+    parser.add_argument("--write-share", type=float, default=0, help="share of requests that are writes")
+    run(parser.parse_args())
@@ -0,0 +1,77 @@
+"""
+Cost of keeping a worker's data current with writes made by other processes.
+
+For each dataset size, compares what a read pays to see the latest data:
+re-loading the data file on every read against DataService.refresh_if_changed,
+which only stats the file when nothing changed. Also times the refresh after
+another process wrote one grade, for plain JSON (full reload) and the journal
+(replay of the new records). Run from web_app/backend:
+
+    python -m benchmarks.bench_refresh --students 1000 10000 100000
+"""
+import argparse
+import os
+import tempfile
+import time
+
+from models.domain_models import GradeManager
+from repositories.json_repository import JSONRepository
+from repositories.journal_repository import JournaledJSONRepository
+from services.data_service import DataService
+from benchmarks.synthetic import make_dataset
+
+def timed_ms(func, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, (time.perf_counter() - start) * 1000)
+    return best
+
+def refresh_after_write_ms(repository_class, path: str, repeat: int) -> float:
+    """Time the refresh of a reader after a writer process assigned one grade."""
+    reader = DataService(repository_class(path))
+    writer = DataService(repository_class(path))
+    student = writer.manager.get_all_students()[0]
+    course_code = next(iter(student.get_all_grades()))
+
+    times = []
+    for i in range(repeat):
+        with writer.lock:
+            writer.manager.assign_grade(student.student_id, course_code, float(i % 101))
+            writer.record("assign_grade", {"student_id": student.student_id,
+                                           "course_code": course_code, "grade": float(i % 101)})
+        start = time.perf_counter()
+        refreshed = reader.refresh_if_changed()
+        times.append((time.perf_counter() - start) * 1000)
+        assert refreshed and reader.manager.get_student(student.student_id).get_grade(course_code) == i % 101
+    reader.close()
+    writer.close()
+    return min(times)
+
+def run(sizes, repeat: int):
+    print(f"{'students':>9} {'reload/read ms':>15} {'unchanged us':>13} "
+          f"{'json after write ms':>20} {'journal after write ms':>23}")
+    for size in sizes:
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "grade_data.json")
+            JSONRepository(path).save(GradeManager.from_dict(make_dataset(size)))
+
+            repository = JSONRepository(path)
+            reload_ms = timed_ms(repository.load, repeat)
+
+            service = DataService(JSONRepository(path))
+            unchanged_us = timed_ms(lambda: [service.refresh_if_changed() for _ in range(1000)], repeat)
+            service.close()
+
+            json_ms = refresh_after_write_ms(JSONRepository, path, repeat)
+            journal_ms = refresh_after_write_ms(JournaledJSONRepository, path, repeat)
+
+        print(f"{size:>9} {reload_ms:>15.1f} {unchanged_us:>13.2f} {json_ms:>20.1f} {journal_ms:>23.2f}")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--students", type=int, nargs="+", default=[1000, 10000, 100000])
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+    run(args.students, args.repeat)
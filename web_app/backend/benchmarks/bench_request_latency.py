@@ -0,0 +1,57 @@
+"""
+Request latency versus dataset size.
+
+Compares the shared, app-scoped DataService against the previous behaviour
+of loading the JSON file on every request. Run from web_app/backend:
+
+    python -m benchmarks.bench_request_latency
+"""
+import argparse
+import json
+import os
+import tempfile
+import time
+
+from fastapi.testclient import TestClient
+
+import main
+from repositories.json_repository import JSONRepository
+from benchmarks.synthetic import make_dataset
+
+def time_requests(client: TestClient, path: str, repeat: int) -> float:
+    """Return the mean latency of GET path in milliseconds."""
+    start = time.perf_counter()
+    for _ in range(repeat):
+        response = client.get(path)
+        assert response.status_code == 200, response.text
+    return (time.perf_counter() - start) / repeat * 1000
+
+def run(sizes, repeat):
+    print(f"{'students':>10} {'shared (ms)':>12} {'reload (ms)':>12}")
+    for size in sizes:
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "grade_data.json")
+            with open(path, "w") as f:
+                json.dump(make_dataset(size), f)
+            
+            main.DATA_FILE = path
+            with TestClient(main.app) as client:
+                shared = time_requests(client, "/students/st0000000", repeat)
+                
+                # Previous behaviour: every request re-parsed the whole file
+                service = main.app.state.data_service
+                start = time.perf_counter()
+                for _ in range(repeat):
+                    service.manager = JSONRepository(path).load()
+                    response = client.get("/students/st0000000")
+                    assert response.status_code == 200
+                reload = (time.perf_counter() - start) / repeat * 1000
+        
+        print(f"{size:>10} {shared:>12.3f} {reload:>12.3f}")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[100, 1000, 10000, 50000])
+    parser.add_argument("--repeat", type=int, default=50)
+    args = parser.parse_args()
+    run(args.sizes, args.repeat)
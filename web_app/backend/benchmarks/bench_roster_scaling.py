@@ -0,0 +1,40 @@
+"""
+Cost of registering and grading students in one large course.
+
+With set-backed rosters the per-operation cost stays flat as the roster
+grows; with the previous list-backed rosters it grew linearly. Run from
+web_app/backend:
+
+    python -m benchmarks.bench_roster_scaling
+"""
+import argparse
+import time
+
+from models.domain_models import GradeManager, Student, Course
+
+def run(sizes):
+    print(f"{'roster':>8} {'register us/op':>15} {'assign us/op':>13}")
+    for size in sizes:
+        manager = GradeManager()
+        manager.add_course(Course("cs0000", "Intro"))
+        ids = [f"st{i:07d}" for i in range(size)]
+        for sid in ids:
+            manager.add_student(Student(sid, sid))
+        
+        start = time.perf_counter()
+        for sid in ids:
+            manager.register_student_for_course(sid, "cs0000")
+        register = (time.perf_counter() - start) / size * 1e6
+        
+        start = time.perf_counter()
+        for sid in ids:
+            manager.assign_grade(sid, "cs0000", 60.0)
+        assign = (time.perf_counter() - start) / size * 1e6
+        
+        print(f"{size:>8} {register:>15.2f} {assign:>13.2f}")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000, 100000])
+    args = parser.parse_args()
+    run(args.sizes)
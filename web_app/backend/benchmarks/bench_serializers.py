@@ -0,0 +1,44 @@
+"""
+Save and load times and file sizes of the snapshot serializers.
+
+Every installed format writes the same synthetic dataset through
+JSONRepository.save and reads it back with JSONRepository.load, which
+includes building the GradeManager; decode is the time spent parsing the
+file alone. Run from web_app/backend:
+
+    python -m benchmarks.bench_serializers --students 10000 100000
+"""
+import argparse
+import os
+import tempfile
+import time
+
+from models.domain_models import GradeManager
+from repositories.json_repository import JSONRepository
+from repositories.serializers import available_serializers, read_snapshot
+from benchmarks.synthetic import make_dataset
+
+def timed(func):
+    start = time.perf_counter()
+    result = func()
+    return result, (time.perf_counter() - start) * 1000
+
+def run(sizes, repeat: int):
+    print(f"{'students':>9} {'format':>13} {'size MB':>9} {'save ms':>9} {'decode ms':>10} {'load ms':>9}")
+    for num_students in sizes:
+        manager = GradeManager.from_dict(make_dataset(num_students))
+        with tempfile.TemporaryDirectory() as tmp:
+            for fmt in available_serializers():
+                repository = JSONRepository(os.path.join(tmp, f"grade_data.{fmt}"), fmt)
+                save_ms = min(timed(lambda: repository.save(manager))[1] for _ in range(repeat))
+                decode_ms = min(timed(lambda: read_snapshot(repository.file_path))[1] for _ in range(repeat))
+                load_ms = min(timed(repository.load)[1] for _ in range(repeat))
+                size_mb = os.path.getsize(repository.file_path) / 1024 / 1024
+                print(f"{num_students:>9} {fmt:>13} {size_mb:>9.2f} {save_ms:>9.1f} {decode_ms:>10.1f} {load_ms:>9.1f}")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--students", type=int, nargs="+", default=[10000, 100000])
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+    run(args.students, args.repeat)
@@ -0,0 +1,62 @@
+"""
+Cost of persisting one grade and reading one student versus shard count.
+
+For each shard count the synthetic dataset is written once, then a grade
+change is recorded (rewriting a single shard) and a single student is read
+back from disk (reading a single shard). Shard count 0 is the plain
+JSONRepository, which rewrites and reads the whole file. Run from
+web_app/backend:
+
+    python -m benchmarks.bench_sharding --students 100000 --shards 0 1 4 16 64
+"""
+import argparse
+import os
+import tempfile
+import time
+
+from models.domain_models import GradeManager
+from repositories.json_repository import JSONRepository
+from repositories.sharded_repository import ShardedJSONRepository
+from benchmarks.synthetic import make_dataset
+
+def timed(func):
+    start = time.perf_counter()
+    result = func()
+    return result, (time.perf_counter() - start) * 1000
+
+def run(num_students: int, shard_counts, repeat: int, serializer: str):
+    manager = GradeManager.from_dict(make_dataset(num_students))
+    student = manager.get_all_students()[0]
+    course_code = next(iter(student.get_all_grades()))
+
+    print(f"{num_students} students, {serializer}")
+    print(f"{'shards':>7} {'full save ms':>13} {'grade save ms':>14} {'read student ms':>16}")
+    for shards in shard_counts:
+        with tempfile.TemporaryDirectory() as tmp:
+            if shards == 0:
+                repository = JSONRepository(os.path.join(tmp, "grade_data.json"), serializer)
+                read_student = lambda: repository.load().get_student(student.student_id)
+            else:
+                repository = ShardedJSONRepository(os.path.join(tmp, "shards"), shards, serializer)
+                read_student = lambda: repository.get_student(student.student_id)
+            _, full_ms = timed(lambda: repository.save(manager))
+
+            grade_times = []
+            for i in range(repeat):
+                manager.assign_grade(student.student_id, course_code, 50.0 + i)
+                payload = {"student_id": student.student_id, "course_code": course_code, "grade": 50.0 + i}
+                grade_times.append(timed(lambda: repository.record(manager, "assign_grade", payload))[1])
+            read_ms = min(timed(read_student)[1] for _ in range(repeat))
+            if hasattr(repository, "close"):
+                repository.close()
+
+        print(f"{shards or 'none':>7} {full_ms:>13.1f} {min(grade_times):>14.2f} {read_ms:>16.2f}")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--students", type=int, default=100000)
+    parser.add_argument("--shards", type=int, nargs="+", default=[0, 1, 4, 16, 64, 256])
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--serializer", default="json-compact")
+    args = parser.parse_args()
+    run(args.students, args.shards, args.repeat, args.serializer)
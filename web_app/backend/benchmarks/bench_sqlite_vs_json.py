@@ -0,0 +1,74 @@
+"""
+JSON versus SQLite backend at growing numbers of grades.
+
+For each size this times opening the data (full load for JSON, just the
+connection for SQLite), a single-student lookup, a course roster, a course
+average and persisting one grade. Run from web_app/backend:
+
+    python -m benchmarks.bench_sqlite_vs_json --grades 10000 100000 1000000
+"""
+import argparse
+import json
+import os
+import tempfile
+import time
+
+from repositories.json_repository import JSONRepository
+from repositories.sqlite_repository import SQLiteRepository
+from benchmarks.synthetic import make_dataset
+
+COURSES_PER_STUDENT = 4
+
+def timed(func):
+    start = time.perf_counter()
+    result = func()
+    return result, (time.perf_counter() - start) * 1000
+
+def bench_json(path: str, student_id: str, course_code: str) -> dict:
+    repository = JSONRepository(path)
+    manager, open_ms = timed(repository.load)
+    _, student_ms = timed(lambda: manager.get_student(student_id))
+    _, roster_ms = timed(lambda: manager.get_course_students(course_code))
+    _, average_ms = timed(lambda: manager.calculate_course_average(course_code))
+    payload = {"student_id": student_id, "course_code": course_code, "grade": 55.0}
+    manager.apply_operation("assign_grade", payload)
+    _, write_ms = timed(lambda: repository.record(manager, "assign_grade", payload))
+    return {"open": open_ms, "student": student_ms, "roster": roster_ms,
+            "average": average_ms, "write": write_ms}
+
+def bench_sqlite(db_path: str, student_id: str, course_code: str) -> dict:
+    repository, open_ms = timed(lambda: SQLiteRepository(db_path))
+    _, student_ms = timed(lambda: repository.get_student(student_id))
+    _, roster_ms = timed(lambda: repository.get_course_students(course_code))
+    _, average_ms = timed(lambda: repository.calculate_course_average(course_code))
+    payload = {"student_id": student_id, "course_code": course_code, "grade": 55.0}
+    _, write_ms = timed(lambda: repository.record(None, "assign_grade", payload))
+    repository.close()
+    return {"open": open_ms, "student": student_ms, "roster": roster_ms,
+            "average": average_ms, "write": write_ms}
+
+def run(grade_counts):
+    columns = ["open", "student", "roster", "average", "write"]
+    print(f"{'grades':>9} {'backend':>8} " + " ".join(f"{c + ' ms':>11}" for c in columns))
+    for grades in grade_counts:
+        data = make_dataset(grades // COURSES_PER_STUDENT, courses_per_student=COURSES_PER_STUDENT)
+        student_id = next(iter(data["students"]))
+        course_code = next(iter(data["students"][student_id]["grades"]))
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "grade_data.json")
+            with open(path, "w") as f:
+                json.dump(data, f)
+            del data
+            
+            db_path = os.path.join(tmp, "grade_data.db")
+            SQLiteRepository(db_path).import_json(path)
+            
+            for name, result in [("json", bench_json(path, student_id, course_code)),
+                                 ("sqlite", bench_sqlite(db_path, student_id, course_code))]:
+                print(f"{grades:>9} {name:>8} " + " ".join(f"{result[c]:>11.3f}" for c in columns))
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--grades", type=int, nargs="+", default=[10000, 100000, 1000000])
+    args = parser.parse_args()
+    run(args.grades)
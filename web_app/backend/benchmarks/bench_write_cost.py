@@ -0,0 +1,46 @@
+"""
+Cost of persisting a single grade entry versus dataset size.
+
+Compares JSONRepository, which rewrites the whole file, with
+JournaledJSONRepository, which appends one record. Run from web_app/backend:
+
+    python -m benchmarks.bench_write_cost
+"""
+import argparse
+import os
+import tempfile
+import time
+
+from models.domain_models import GradeManager
+from repositories.json_repository import JSONRepository
+from repositories.journal_repository import JournaledJSONRepository
+from benchmarks.synthetic import make_dataset
+
+def time_writes(repository: JSONRepository, manager: GradeManager, writes: int) -> float:
+    """Return the mean cost of persisting one assign_grade in milliseconds."""
+    student_id = manager.get_all_students()[0].student_id
+    course_code = next(iter(manager.get_student_grades(student_id)))
+    start = time.perf_counter()
+    for i in range(writes):
+        payload = {"student_id": student_id, "course_code": course_code, "grade": float(i % 100)}
+        manager.apply_operation("assign_grade", payload)
+        repository.record(manager, "assign_grade", payload)
+    return (time.perf_counter() - start) / writes * 1000
+
+def run(sizes, writes):
+    print(f"{'students':>10} {'json (ms)':>12} {'journal (ms)':>13}")
+    for size in sizes:
+        manager = GradeManager.from_dict(make_dataset(size))
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "grade_data.json")
+            json_cost = time_writes(JSONRepository(path), manager, writes)
+            journal = JournaledJSONRepository(path, compact_every=writes + 1)
+            journal_cost = time_writes(journal, manager, writes)
+        print(f"{size:>10} {json_cost:>12.3f} {journal_cost:>13.3f}")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[100, 1000, 10000, 50000])
+    parser.add_argument("--writes", type=int, default=20)
+    args = parser.parse_args()
+    run(args.sizes, args.writes)
@@ -0,0 +1,277 @@
+"""
+Load test of the API with a mix of reads and writes, reporting latency per route.
+
+Concurrent clients send requests drawn from a weighted mix over /students,
+/courses, /grades and /reports for a fixed time, either to main:app in this
+process (through httpx's ASGI transport, no network or server involved) or
+to a uvicorn server started for the run. Throughput and p50/p95/p99 latency
+are reported per route and overall, for each dataset size. Run from
+web_app/backend:
+
+    python -m benchmarks.load_test --students 1000 100000 --clients 20
+    python -m benchmarks.load_test --target uvicorn --clients 200 --write-share 0.2
+    python -m benchmarks.load_test --data data/large.json --mix "GET /students/{id}=1" "POST /grades/assign=1"
+
+Requests answered with an error status are counted per route and left out
+of the latencies. --output writes the results as JSON.
+"""
+import argparse
+import asyncio
+import json
+import os
+import platform
+import random
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+from typing import Dict, List, Optional, Tuple
+
+import httpx
+
+from benchmarks.bench_concurrency import percentile, request, wait_for_server
+from benchmarks.suite import git_commit
+from benchmarks.synthetic import make_dataset
+
+# Relative weights of the routes in the default mix
+MIX = {
+    "GET /students/{id}": 20,
+    "GET /students/{id}/courses": 5,
+    "GET /students/?limit=100": 2,
+    "GET /courses/{code}": 5,
+    "GET /courses/": 1,
+    "GET /grades/student/{id}": 10,
+    "GET /grades/course/{code}": 2,
+    "GET /reports/transcript/{id}": 20,
+    "GET /reports/course-performance/{code}": 5,
+    "GET /reports/cohort-summary": 1,
+    "POST /students/": 2,
+    "POST /grades/enroll": 2,
+    "POST /grades/assign": 6,
+}
+
+class Client:
+    """
+    One simulated user: draws a route from the mix and fills in ids.
+
+    Students it created are later enrolled in courses they do not take yet,
+    so writes succeed instead of being rejected as duplicates.
+    """
+
+    def __init__(self, number: int, mix: Dict[str, float], courses_of: Dict[str, str], course_codes: List[str]):
+        """
+        Args:
+            number: Client number, also the seed of its random choices
+            mix: Routes and their weights
+            courses_of: A course each existing student is enrolled in, by student id
+            course_codes: Codes of all courses
+        """
+        self.number = number
+        self.rng = random.Random(number)
+        self.routes, self.weights = list(mix), list(mix.values())
+        self.courses_of = courses_of
+        self.student_ids = list(courses_of)
+        self.course_codes = course_codes
+        self.created: List[str] = []
+        self.enrolled: Dict[str, set] = {}
+
+    def next_request(self) -> Tuple[str, str, str, Optional[Dict]]:
+        """Return (route, method, path, JSON body) of the next request."""
+        route = self.rng.choices(self.routes, self.weights)[0]
+        method, template = route.split(" ", 1)
+        student_id = self.rng.choice(self.student_ids)
+        course_code = self.rng.choice(self.course_codes)
+        body = None
+        if route == "POST /grades/enroll":
+            candidates = [sid for sid in self.created if len(self.enrolled[sid]) < len(self.course_codes)]
+            if not candidates:
+                route, template = "POST /students/", "/students/"
+            else:
+                student_id = self.rng.choice(candidates)
+                course_code = self.rng.choice([c for c in self.course_codes if c not in self.enrolled[student_id]])
+                self.enrolled[student_id].add(course_code)
+                body = {"student_id": student_id, "course_code": course_code}
+        elif route == "POST /grades/assign":
+            body = {"student_id": student_id, "course_code": self.courses_of[student_id],
+                    "grade": float(self.rng.randint(0, 100))}
+        if route == "POST /students/":
+            student_id = f"load-{self.number}-{len(self.created)}"
+            self.created.append(student_id)
+            self.enrolled[student_id] = set()
+            body = {"student_id": student_id, "student_name": "Load Test"}
+        return route, method, template.format(id=student_id, code=course_code), body
+
+class Run:
+    """Collects latencies and errors per route."""
+
+    def __init__(self):
+        self.latencies: Dict[str, List[float]] = {}
+        self.errors: Dict[str, int] = {}
+
+    def record(self, route: str, status: int, elapsed_ms: float) -> None:
+        if status >= 400:
+            self.errors[route] = self.errors.get(route, 0) + 1
+        else:
+            self.latencies.setdefault(route, []).append(elapsed_ms)
+
+    def summary(self, seconds: float) -> List[Dict]:
+        rows = []
+        routes = sorted(set(self.latencies) | set(self.errors))
+        everything = [ms for route in routes for ms in self.latencies.get(route, [])]
+        for route, values in [(route, self.latencies.get(route, [])) for route in routes] + [("ALL", everything)]:
+            errors = sum(self.errors.values()) if route == "ALL" else self.errors.get(route, 0)
+            row = {"route": route, "requests": len(values), "errors": errors,
+                   "requests_per_second": round(len(values) / seconds, 1)}
+            if values:
+                row.update({f"p{p}_ms": round(percentile(values, p / 100), 3) for p in (50, 95, 99)})
+                row["max_ms"] = round(max(values), 3)
+            rows.append(row)
+        return rows
+
+async def drive(send, client: Client, run: Run, warmup_until: float, deadline: float) -> None:
+    while time.perf_counter() < deadline:
+        route, method, path, body = client.next_request()
+        start = time.perf_counter()
+        status = await send(method, path, body)
+        if start >= warmup_until:
+            run.record(route, status, (time.perf_counter() - start) * 1000)
+
+async def load_in_process(data_path: str, clients: List[Client], seconds: float, warmup: float,
+                          writer_delay: float) -> Run:
+    import main
+
+    main.DATA_FILE, main.STORAGE_MODE, main.WRITER_MAX_DELAY = data_path, "json", writer_delay
+    run = Run()
+    # ASGITransport does not run the lifespan, which creates the DataService
+    async with main.app.router.lifespan_context(main.app):
+        async with httpx.AsyncClient(transport=httpx.ASGITransport(app=main.app), base_url="http://test") as http:
+            async def send(method: str, path: str, body: Optional[Dict]) -> int:
+                return (await http.request(method, path, json=body)).status_code
+
+            start = time.perf_counter()
+            await asyncio.gather(*(drive(send, c, run, start + warmup, start + warmup + seconds) for c in clients))
+    return run
+
+async def load_over_http(port: int, clients: List[Client], seconds: float, warmup: float) -> Run:
+    run = Run()
+    start = time.perf_counter()
+
+    async def one_client(client: Client) -> None:
+        # One keep-alive connection per client, as in bench_concurrency
+        reader, writer = await asyncio.open_connection("127.0.0.1", port)
+
+        async def send(method: str, path: str, body: Optional[Dict]) -> int:
+            return await request(reader, writer, method, path, json.dumps(body).encode() if body else b"")
+        try:
+            await drive(send, client, run, start + warmup, start + warmup + seconds)
+        finally:
+            writer.close()
+
+    await asyncio.gather(*(one_client(c) for c in clients))
+    return run
+
+def make_clients(count: int, mix: Dict[str, float], data: Dict) -> List[Client]:
+    # Grades can only be assigned for a course the student is enrolled in
+    courses_of = {}
+    for code, student_ids in data["enrollments"].items():
+        for sid in student_ids:
+            courses_of.setdefault(sid, code)
+    return [Client(i, mix, courses_of, list(data["courses"])) for i in range(count)]
+
+def load_dataset(students: Optional[int], data_file: Optional[str]) -> Dict:
+    if data_file:
+        from repositories.serializers import read_snapshot
+        return read_snapshot(data_file)
+    return make_dataset(students)
+
+def run_size(label: str, data: Dict, args, mix: Dict[str, float]) -> Dict:
+    clients = make_clients(args.clients, mix, data)
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "grade_data.json")
+        with open(path, "w") as f:
+            json.dump(data, f)
+        if args.target == "inprocess":
+            run = asyncio.run(load_in_process(path, clients, args.seconds, args.warmup, args.writer_delay))
+        else:
+            env = dict(os.environ, GRADE_DATA_FILE=path, GRADE_WRITER_MAX_DELAY=str(args.writer_delay))
+            server = subprocess.Popen(
+                [sys.executable, "-m", "uvicorn", "main:app", "--port", str(args.port),
+                 "--log-level", "warning", "--timeout-keep-alive", "120"], env=env)
+            try:
+                wait_for_server(f"http://127.0.0.1:{args.port}")
+                run = asyncio.run(load_over_http(args.port, clients, args.seconds, args.warmup))
+            finally:
+                server.terminate()
+                server.wait()
+
+    rows = run.summary(args.seconds)
+    print(f"\n{label}, {args.clients} clients, {args.target}")
+    print(f"{'route':<40} {'requests':>9} {'errors':>7} {'req/s':>8} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8}")
+    for row in rows:
+        print(f"{row['route']:<40} {row['requests']:>9} {row['errors']:>7} {row['requests_per_second']:>8.1f} "
+              f"{row.get('p50_ms', 0):>8.2f} {row.get('p95_ms', 0):>8.2f} {row.get('p99_ms', 0):>8.2f}")
+    return {"dataset": label, "students": len(data["students"]), "routes": rows}
+
+def parse_mix(overrides: Optional[List[str]], write_share: Optional[float]) -> Dict[str, float]:
+    """Apply --mix entries to the default mix and rescale the writes to --write-share."""
+    mix = dict(MIX)
+    if overrides:
+        mix = {}
+        for entry in overrides:
+            route, _, weight = entry.rpartition("=")
+            if route not in MIX:
+                raise ValueError(f"Unknown route {route!r}; choose from: {', '.join(MIX)}")
+            mix[route] = float(weight)
+    if write_share is not None:
+        writes = sum(w for route, w in mix.items() if route.startswith("POST"))
+        reads = sum(mix.values()) - writes
+        for route in mix:
+            if route.startswith("POST"):
+                mix[route] = mix[route] / writes * write_share if writes else 0
+            else:
+                mix[route] = mix[route] / reads * (1 - write_share) if reads else 0
+    return {route: weight for route, weight in mix.items() if weight > 0}
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--students", type=int, nargs="+", default=[10000],
+                        help="sizes of the generated datasets to run against")
+    parser.add_argument("--data", help="run against this data file instead of generated data")
+    parser.add_argument("--target", choices=["inprocess", "uvicorn"], default="inprocess")
+    parser.add_argument("--clients", type=int, default=20)
+    parser.add_argument("--seconds", type=float, default=10)
+    parser.add_argument("--warmup", type=float, default=1, help="seconds of requests left out of the results")
+    parser.add_argument("--mix", nargs="+", metavar="ROUTE=WEIGHT", help="routes and weights replacing the default mix")
+    parser.add_argument("--write-share", type=float, help="share of requests that are writes")
+    parser.add_argument("--writer-delay", type=float, default=0,
+                        help="GRADE_WRITER_MAX_DELAY for the app, 0 saves on every write")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--output", help="write the results as JSON to this file")
+    args = parser.parse_args()
+
+    try:
+        mix = parse_mix(args.mix, args.write_share)
+    except ValueError as e:
+        parser.error(str(e))
+
+    datasets = [(args.data, None)] if args.data else [(f"{n} students", n) for n in args.students]
+    results = [run_size(label, load_dataset(size, args.data), args, mix) for label, size in datasets]
+
+    if args.output:
+        report = {
+            "meta": {
+                "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+                "commit": git_commit(),
+                "python": platform.python_version(),
+                "target": args.target,
+                "clients": args.clients,
+                "seconds": args.seconds,
+                "writer_delay": args.writer_delay,
+                "mix": mix,
+            },
+            "results": results,
+        }
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+        print(f"\nWrote results to {args.output}")
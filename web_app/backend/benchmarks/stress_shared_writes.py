@@ -0,0 +1,150 @@
+"""
+Stress test for several processes writing to the same data at once.
+
+Starts a number of worker processes, like uvicorn --workers, that each
+create a DataService on the same repository and fire grade assignments
+and new students at it through the controllers. Afterwards the data is
+loaded once more and every write is checked: a write that was accepted
+but is missing or overwritten on disk is a lost update. Writes refused
+with a PersistenceError (409 over HTTP) count as failed, not lost. Run from
+web_app/backend:
+
+    python -m benchmarks.stress_shared_writes --processes 4 --writes 200
+    python -m benchmarks.stress_shared_writes --unshared   # processes retry rejected saves instead of locking
+"""
+import argparse
+import asyncio
+import contextlib
+import io
+import json
+import multiprocessing
+import os
+import sys
+import tempfile
+import time
+
+from benchmarks.synthetic import make_dataset
+
+def create_repository(storage: str, directory: str):
+    from repositories.json_repository import JSONRepository
+    from repositories.journal_repository import JournaledJSONRepository
+    from repositories.sharded_repository import ShardedJSONRepository
+    from repositories.sqlite_repository import SQLiteRepository
+
+    if storage == "journal":
+        return JournaledJSONRepository(os.path.join(directory, "grade_data.json"), compact_every=50)
+    if storage == "sharded":
+        return ShardedJSONRepository(os.path.join(directory, "shards"), 4)
+    if storage == "sqlite":
+        return SQLiteRepository(os.path.join(directory, "grade_data.db"))
+    return JSONRepository(os.path.join(directory, "grade_data.json"))
+
+def planned_writes(worker: int, processes: int, writes: int, pairs):
+    """Writes of one worker: distinct (student, course, grade) triples and one new student per ten."""
+    grades, students = [], []
+    for k in range(writes):
+        if k % 10 == 9:
+            students.append((f"stress-{worker}-{k}", f"Stress {worker} {k}"))
+        else:
+            student_id, course_code = pairs[(worker + k * processes) % len(pairs)]
+            grades.append((student_id, course_code, float((worker * 7 + k) % 101)))
+    return grades, students
+
+async def hammer(service, grades, students):
+    """Apply the writes and return the ones that were accepted, and the number refused."""
+    from controllers.grade_controller import GradeController
+    from controllers.student_controller import StudentController
+    from services.data_service import PersistenceError
+
+    async def attempt(write, coroutine):
+        try:
+            success = await coroutine
+        except PersistenceError:
+            return None
+        return write if (success[0] if isinstance(success, tuple) else success) else None
+
+    results = [await attempt(student, StudentController(service).create_student(*student)) for student in students]
+    results += await asyncio.gather(*(attempt(grade, GradeController(service).assign_grade(*grade))
+                                      for grade in grades))
+    accepted = [write for write in results if write is not None]
+    return accepted, len(results) - len(accepted)
+
+def worker_main(worker: int, processes: int, writes: int, storage: str, directory: str,
+                shared: bool, pairs, start_event, results) -> None:
+    from services.data_service import DataService
+
+    output = io.StringIO()
+    with contextlib.redirect_stdout(output):
+        service = DataService(create_repository(storage, directory), shared=shared)
+        grades, students = planned_writes(worker, processes, writes, pairs)
+        start_event.wait()
+        accepted, failed = asyncio.run(hammer(service, grades, students))
+        service.close()
+    results.put((worker, accepted, failed, output.getvalue().count("Error saving data")))
+
+def run(processes: int, writes: int, storage: str, students: int, shared: bool) -> bool:
+    from repositories.json_repository import JSONRepository
+    from models.domain_models import GradeManager
+
+    data = make_dataset(students, num_courses=20)
+    pairs = sorted((sid, code) for sid, s in data["students"].items() for code in s["grades"])
+    context = multiprocessing.get_context("spawn")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        repository = create_repository(storage, tmp)
+        repository.save(GradeManager.from_dict(data))
+        repository.close()
+
+        start_event, results = context.Event(), context.Queue()
+        workers = [context.Process(target=worker_main,
+                                   args=(w, processes, writes, storage, tmp, shared, pairs, start_event, results))
+                   for w in range(processes)]
+        for process in workers:
+            process.start()
+        time.sleep(1.0)  # Let every worker finish loading before the burst
+        start = time.perf_counter()
+        start_event.set()
+        outcomes = [results.get() for _ in workers]
+        elapsed = time.perf_counter() - start
+        for process in workers:
+            process.join()
+
+        repository = create_repository(storage, tmp)
+        manager = repository.load()
+        repository.close()
+
+    lost = 0
+    for _, accepted_writes, _, _ in outcomes:
+        for write in accepted_writes:
+            student = manager.get_student(write[0])
+            if student is None or (len(write) == 3 and student.get_grade(write[1]) != write[2]):
+                lost += 1
+
+    accepted = sum(len(outcome[1]) for outcome in outcomes)
+    failed = sum(outcome[2] for outcome in outcomes)
+    rejected_saves = sum(outcome[3] for outcome in outcomes)
+    print(json.dumps({
+        "storage": storage,
+        "shared": shared,
+        "processes": processes,
+        "accepted_writes": accepted,
+        "failed_writes": failed,
+        "writes_per_second": round(accepted / elapsed, 1),
+        "rejected_saves": rejected_saves,
+        "lost_updates": lost
+    }))
+    return lost == 0
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--processes", type=int, default=4)
+    parser.add_argument("--writes", type=int, default=200, help="writes per process")
+    parser.add_argument("--students", type=int, default=2000)
+    parser.add_argument("--storage", nargs="+", default=["json", "journal", "sharded", "sqlite"],
+                        choices=["json", "journal", "sharded", "sqlite"])
+    parser.add_argument("--unshared", action="store_true",
+                        help="run the workers without cross-process transactions")
+    args = parser.parse_args()
+    ok = all([run(args.processes, args.writes, storage, args.students, not args.unshared)
+              for storage in args.storage])
+    sys.exit(0 if ok else 1)
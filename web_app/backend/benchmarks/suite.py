@@ -0,0 +1,283 @@
+"""
+Benchmark suite over storage, the domain model, the controllers and the API.
+
+For every dataset size it times JSONRepository load and save,
+GradeManager serialization and operations, every public controller method
+and the main read and report endpoints, and writes the results as JSON so
+runs of different releases can be compared. Run from web_app/backend:
+
+    python -m benchmarks.suite --students 1000 10000 --output results.json
+    python -m benchmarks.suite --compare results-v1.json results.json --threshold 1.25
+
+--compare prints the change of every benchmark present in both files and
+exits with status 1 if any got slower than the threshold allows.
+"""
+import argparse
+import asyncio
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+from typing import Callable, Dict, List, Optional
+
+from benchmarks.synthetic import make_dataset
+
+# Calls of a benchmark are batched until one timed run takes at least this long
+MIN_RUN_SECONDS = 0.01
+
+def measure(func: Callable[[int], object], repeat: int, max_calls: Optional[int] = None) -> Dict:
+    """
+    Time func over repeat runs and return per-call figures in milliseconds.
+
+    func receives a call counter, so benchmarks that change data can use a
+    fresh student or course on every call; max_calls caps the calls made.
+    """
+    calls = 0
+
+    def run(number: int) -> float:
+        nonlocal calls
+        start = time.perf_counter()
+        for _ in range(number):
+            func(calls)
+            calls += 1
+        return time.perf_counter() - start
+
+    first = run(1)
+    number = max(1, int(MIN_RUN_SECONDS / first)) if first > 0 else 1000
+    if max_calls is not None:
+        number = max(1, min(number, (max_calls - 1) // repeat))
+    times = [run(number) / number * 1000 for _ in range(repeat)]
+    return {"min_ms": round(min(times), 6), "median_ms": round(statistics.median(times), 6),
+            "calls_per_run": number, "runs": repeat}
+
+class Suite:
+    """Runs the benchmarks of one dataset size and collects their results."""
+
+    def __init__(self, students: int, repeat: int, workdir: str):
+        self.students = students
+        self.repeat = repeat
+        self.workdir = workdir
+        self.results: List[Dict] = []
+        self.data = make_dataset(students)
+        self.path = os.path.join(workdir, "grade_data.json")
+
+    def add(self, group: str, name: str, func: Callable[[int], object], max_calls: Optional[int] = None) -> None:
+        result = {"group": group, "name": name, "students": self.students,
+                  **measure(func, self.repeat, max_calls)}
+        self.results.append(result)
+        print(f"{self.students:>9} {group:<11} {name:<44} {result['median_ms']:>12.4f}", flush=True)
+
+    def run(self) -> List[Dict]:
+        self.repository_benchmarks()
+        self.manager_benchmarks()
+        self.controller_benchmarks()
+        self.api_benchmarks()
+        return self.results
+
+    def repository_benchmarks(self) -> None:
+        from models.domain_models import GradeManager
+        from repositories.json_repository import JSONRepository
+
+        manager = GradeManager.from_dict(self.data)
+        for serializer in ("json", "json-compact"):
+            repository = JSONRepository(os.path.join(self.workdir, f"repository-{serializer}.json"), serializer)
+            self.add("repository", f"JSONRepository.save[{serializer}]", lambda i: repository.save(manager))
+            self.add("repository", f"JSONRepository.load[{serializer}]", lambda i: repository.load())
+            repository.close()
+        self.add("repository", "GradeManager.to_dict", lambda i: manager.to_dict())
+        self.add("repository", "GradeManager.from_dict", lambda i: GradeManager.from_dict(self.data))
+
+    def manager_benchmarks(self) -> None:
+        from models.domain_models import Course, GradeManager, Student
+
+        manager = GradeManager.from_dict(self.data)
+        student_id = "st0000000"
+        course_code = next(iter(manager.get_student(student_id).get_all_grades()))
+        courses = [course.course_code for course in manager.get_all_courses()]
+
+        self.add("manager", "add_student", lambda i: manager.add_student(Student(f"bench-s{i}", "Bench")))
+        self.add("manager", "add_course", lambda i: manager.add_course(Course(f"bench-c{i}", "Bench")))
+        pool = [s.student_id for s in manager.get_all_students() if s.student_id.startswith("bench-s")]
+        self.add("manager", "register_student_for_course",
+                 lambda i: manager.register_student_for_course(pool[i % len(pool)], courses[i // len(pool)]),
+                 max_calls=len(pool) * len(courses))
+        self.add("manager", "assign_grade", lambda i: manager.assign_grade(student_id, course_code, float(i % 101)))
+        self.add("manager", "get_student", lambda i: manager.get_student(student_id))
+        self.add("manager", "get_student_courses", lambda i: manager.get_student_courses(student_id))
+        self.add("manager", "get_course_students", lambda i: manager.get_course_students(course_code))
+        self.add("manager", "calculate_course_average", lambda i: manager.calculate_course_average(course_code))
+        self.add("manager", "generate_student_transcript[cached]",
+                 lambda i: manager.generate_student_transcript(student_id))
+
+        def transcript_after_change(i: int):
+            manager.assign_grade(student_id, course_code, float(i % 101))
+            return manager.generate_student_transcript(student_id)
+        self.add("manager", "generate_student_transcript[after change]", transcript_after_change)
+        self.add("manager", "list_students[100]", lambda i: manager.list_students(100))
+        self.add("manager", "get_all_students", lambda i: manager.get_all_students())
+
+    def controller_benchmarks(self) -> None:
+        from controllers.course_controller import CourseController
+        from controllers.grade_controller import GradeController
+        from controllers.report_controller import ReportController
+        from controllers.student_controller import StudentController
+        from models.domain_models import GradeManager
+        from repositories.json_repository import JSONRepository
+        from services.data_service import DataService
+
+        # Mutations save the whole file on every call, as they do in the API
+        service = DataService(JSONRepository(os.path.join(self.workdir, "controllers.json")),
+                              GradeManager.from_dict(self.data))
+        students, courses = StudentController(service), CourseController(service)
+        grades, reports = GradeController(service), ReportController(service)
+        loop = asyncio.new_event_loop()
+        run = loop.run_until_complete
+        student_id = "st0000000"
+        course_code = next(iter(service.manager.get_student(student_id).get_all_grades()))
+
+        self.add("controller", "StudentController.create_student",
+                 lambda i: run(students.create_student(f"bench-s{i}", "Bench")))
+        self.add("controller", "StudentController.get_all_students", lambda i: students.get_all_students())
+        self.add("controller", "StudentController.list_students", lambda i: students.list_students(100))
+        self.add("controller", "StudentController.get_student", lambda i: students.get_student(student_id))
+        self.add("controller", "StudentController.get_student_courses",
+                 lambda i: students.get_student_courses(student_id))
+        self.add("controller", "CourseController.create_course",
+                 lambda i: run(courses.create_course(f"bench-c{i}", "Bench")))
+        self.add("controller", "CourseController.get_all_courses", lambda i: courses.get_all_courses())
+        self.add("controller", "CourseController.list_courses", lambda i: courses.list_courses(100))
+        self.add("controller", "CourseController.get_course", lambda i: courses.get_course(course_code))
+        self.add("controller", "CourseController.get_course_students",
+                 lambda i: courses.get_course_students(course_code))
+        self.add("controller", "CourseController.calculate_course_average",
+                 lambda i: courses.calculate_course_average(course_code))
+        self.add("controller", "GradeController.register_for_course",
+                 lambda i: run(grades.register_for_course(f"bench-s{i}", course_code)),
+                 max_calls=len([s for s in service.manager.get_all_students() if s.student_id.startswith("bench-s")]))
+        self.add("controller", "GradeController.assign_grade",
+                 lambda i: run(grades.assign_grade(student_id, course_code, float(i % 101))))
+        rows = [(line, {"student_id": student_id, "course_code": course_code, "grade": str(line % 101)})
+                for line in range(100)]
+        self.add("controller", "GradeController.assign_grades[100]", lambda i: run(grades.assign_grades(rows)))
+        roster = lambda i: [(line, {"student_id": f"roster-{i}-{line}", "course_code": course_code,
+                                    "student_name": "Roster"}) for line in range(100)]
+        self.add("controller", "GradeController.enroll_students[100]",
+                 lambda i: run(grades.enroll_students(roster(i), create_missing=True)))
+        self.add("controller", "GradeController.save", lambda i: run(grades.save()))
+        self.add("controller", "GradeController.get_student_grades", lambda i: grades.get_student_grades(student_id))
+        self.add("controller", "GradeController.get_course_grades", lambda i: grades.get_course_grades(course_code))
+        self.add("controller", "ReportController.generate_student_transcript",
+                 lambda i: reports.generate_student_transcript(student_id))
+        self.add("controller", "ReportController.iter_transcripts", lambda i: list(reports.iter_transcripts()))
+        self.add("controller", "ReportController.generate_course_performance",
+                 lambda i: reports.generate_course_performance(course_code))
+        if reports.generate_cohort_summary() is not None:
+            self.add("controller", "ReportController.generate_cohort_summary",
+                     lambda i: reports.generate_cohort_summary())
+        self.add("controller", "ReportController.get_cache_stats", lambda i: reports.get_cache_stats())
+        loop.close()
+        service.close()
+
+    def api_benchmarks(self) -> None:
+        from fastapi.testclient import TestClient
+        from repositories.json_repository import write_atomic
+        import main
+
+        write_atomic(self.path, json.dumps(self.data).encode("utf-8"))
+        main.DATA_FILE, main.STORAGE_MODE = self.path, "json"
+        student_id = "st0000000"
+        course_code = next(iter(self.data["students"][student_id]["grades"]))
+        paths = ["/students/?limit=100", f"/students/{student_id}", f"/students/{student_id}/courses",
+                 "/courses/", f"/courses/{course_code}", f"/grades/student/{student_id}",
+                 f"/grades/course/{course_code}", f"/reports/transcript/{student_id}",
+                 f"/reports/course-performance/{course_code}", "/reports/cohort-summary", "/reports/transcripts"]
+
+        with TestClient(main.app) as client:
+            for path in paths:
+                if client.get(path).status_code != 200:
+                    continue
+
+                def get(i: int, path=path):
+                    response = client.get(path)
+                    assert response.status_code == 200, response.text
+                self.add("api", f"GET {path.replace(student_id, '{id}').replace(course_code, '{code}')}", get)
+
+            def assign(i: int):
+                response = client.post("/grades/assign", json={
+                    "student_id": student_id, "course_code": course_code, "grade": float(i % 101)})
+                assert response.status_code == 201, response.text
+            self.add("api", "POST /grades/assign", assign)
+
+def git_commit() -> Optional[str]:
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+def run_suite(sizes: List[int], repeat: int, output: Optional[str]) -> Dict:
+    report = {
+        "meta": {
+            "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "commit": git_commit(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpus": os.cpu_count(),
+            "sizes": sizes,
+            "repeat": repeat,
+        },
+        "results": [],
+    }
+    print(f"{'students':>9} {'group':<11} {'benchmark':<44} {'median ms':>12}")
+    for size in sizes:
+        with tempfile.TemporaryDirectory() as tmp:
+            report["results"].extend(Suite(size, repeat, tmp).run())
+    if output:
+        with open(output, "w") as f:
+            json.dump(report, f, indent=2)
+        print(f"Wrote {len(report['results'])} results to {output}")
+    return report
+
+def compare(old_path: str, new_path: str, threshold: float) -> bool:
+    """Print the change of every common benchmark; False if any regressed past threshold."""
+    with open(old_path) as f:
+        old = json.load(f)
+    with open(new_path) as f:
+        new = json.load(f)
+    key = lambda r: (r["group"], r["name"], r["students"])
+    baseline = {key(r): r for r in old["results"]}
+
+    regressions = 0
+    print(f"{old['meta'].get('commit')} -> {new['meta'].get('commit')}")
+    print(f"{'students':>9} {'benchmark':<56} {'old ms':>11} {'new ms':>11} {'ratio':>7}")
+    for result in new["results"]:
+        before = baseline.get(key(result))
+        if before is None:
+            continue
+        ratio = result["median_ms"] / before["median_ms"] if before["median_ms"] else float("inf")
+        flag = ""
+        if ratio > threshold:
+            regressions += 1
+            flag = "  REGRESSION"
+        print(f"{result['students']:>9} {result['group'] + ' ' + result['name']:<56} "
+              f"{before['median_ms']:>11.4f} {result['median_ms']:>11.4f} {ratio:>7.2f}{flag}")
+    print(f"{regressions} regression(s) above {threshold:.2f}x")
+    return regressions == 0
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--students", type=int, nargs="+", default=[1000, 10000])
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--output", help="write the results as JSON to this file")
+    parser.add_argument("--compare", nargs=2, metavar=("OLD", "NEW"), help="compare two result files")
+    parser.add_argument("--threshold", type=float, default=1.25,
+                        help="slowdown ratio counted as a regression by --compare")
+    args = parser.parse_args()
+    if args.compare:
+        sys.exit(0 if compare(*args.compare, args.threshold) else 1)
+    run_suite(args.students, args.repeat, args.output)
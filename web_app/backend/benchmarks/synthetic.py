@@ -0,0 +1,171 @@
+"""
+Generate a synthetic dataset in the repository format.
+
+Students get names, course enrollments and grades drawn from a chosen
+distribution; courses can mix grading scales. The same arguments and seed
+always produce the same data. Run from web_app/backend:
+
+    python -m benchmarks.synthetic --students 100000 --output data/large.json
+    python -m benchmarks.synthetic --students 20000 --courses 200 --courses-per-student 3 8 \\
+        --distribution bimodal --graded-share 0.7 --scales standard=0.8 pass_fail=0.2 \\
+        --storage sqlite --output data/large.db
+"""
+import argparse
+import os
+import random
+import time
+from typing import Dict, Optional, Tuple, Union
+
+FIRST_NAMES = ["Ava", "Noah", "Mia", "Liam", "Zara", "Omar", "Ines", "Kenji", "Lena", "Mateo",
+               "Priya", "Tomas", "Chloe", "Arjun", "Sofia", "Ivan", "Amara", "Lucas", "Yara", "Elias"]
+LAST_NAMES = ["Nguyen", "Smith", "Garcia", "Okafor", "Müller", "Rossi", "Kim", "Haddad", "Silva", "Novak",
+              "Tanaka", "Kowalski", "Dubois", "Patel", "Jensen", "Moreau", "Ali", "Costa", "Larsen", "Ivanova"]
+SUBJECTS = ["Algorithms", "Databases", "Operating Systems", "Linear Algebra", "Statistics", "Compilers",
+            "Networks", "Calculus", "Machine Learning", "Software Engineering", "Security", "Graphics"]
+
+# Grade distributions: uniform matches the data the benchmarks were first written against
+DISTRIBUTIONS = ("uniform", "normal", "bimodal")
+
+def draw_grade(rng: random.Random, distribution: str) -> float:
+    """Draw one grade between 0 and 100 from the named distribution."""
+    if distribution == "uniform":
+        return float(rng.randint(20, 100))
+    if distribution == "normal":
+        mark = rng.gauss(65, 14)
+    elif distribution == "bimodal":
+        # A struggling group and a larger group doing well
+        mark = rng.gauss(42, 10) if rng.random() < 0.3 else rng.gauss(76, 9)
+    else:
+        raise ValueError(f"Unknown distribution: {distribution}")
+    return float(min(100, max(0, round(mark))))
+
+def student_name(i: int) -> str:
+    return f"{FIRST_NAMES[i % len(FIRST_NAMES)]} {LAST_NAMES[i // len(FIRST_NAMES) % len(LAST_NAMES)]}"
+
+def course_name(i: int) -> str:
+    level = 100 * (1 + i // len(SUBJECTS) % 4)
+    return f"{SUBJECTS[i % len(SUBJECTS)]} {level + i // (4 * len(SUBJECTS))}"
+
+def make_dataset(num_students: int, num_courses: int = 50,
+                 courses_per_student: Union[int, Tuple[int, int]] = 4, seed: int = 42,
+                 distribution: str = "uniform", graded_share: float = 1.0,
+                 scales: Optional[Dict[str, float]] = None) -> Dict:
+    """
+    Build a synthetic dataset in the repository's JSON format.
+
+    Args:
+        num_students: Number of students to create
+        num_courses: Number of courses to create
+        courses_per_student: Number of courses each student is enrolled in,
+            or a (low, high) range to draw it from
+        seed: Seed for the random generator so runs are reproducible
+        distribution: Grade distribution, one of DISTRIBUTIONS
+        graded_share: Share of enrollments that have a grade; the rest are
+            enrolled but not graded yet
+        scales: Weights of the grading scales courses use, e.g.
+            {"standard": 0.8, "pass_fail": 0.2}; all standard if omitted
+
+    Returns:
+        Dictionary accepted by GradeManager.from_dict
+    """
+    if distribution not in DISTRIBUTIONS:
+        raise ValueError(f"Unknown distribution: {distribution}")
+    rng = random.Random(seed)
+    # Scales come from a generator of their own so they leave the grades unchanged
+    scale_rng = random.Random(seed + 1)
+    courses = {}
+    enrollments = {}
+    for i in range(num_courses):
+        code = f"cs{i:04d}"
+        courses[code] = {"course_code": code, "course_name": course_name(i)}
+        if scales:
+            courses[code]["grading_scale"] = scale_rng.choices(list(scales), weights=list(scales.values()))[0]
+        enrollments[code] = []
+
+    low, high = courses_per_student if isinstance(courses_per_student, tuple) else (courses_per_student,) * 2
+    course_codes = list(courses)
+    students = {}
+    for i in range(num_students):
+        sid = f"st{i:07d}"
+        grades = {}
+        count = low if low == high else rng.randint(low, high)
+        for code in rng.sample(course_codes, min(count, num_courses)):
+            enrollments[code].append(sid)
+            if graded_share >= 1 or rng.random() < graded_share:
+                grades[code] = draw_grade(rng, distribution)
+        students[sid] = {"student_id": sid, "student_name": student_name(i), "grades": grades}
+
+    return {"students": students, "courses": courses, "enrollments": enrollments}
+
+def write_dataset(data: Dict, output: str, storage: str = "json", serializer: str = "json",
+                  num_shards: int = 16) -> None:
+    """
+    Write a dataset to output with the repository of the given storage mode.
+
+    json writes a data file in the given serializer's format, sharded a
+    shard directory and sqlite a database; existing data there is replaced.
+    """
+    from models.domain_models import GradeManager
+    from repositories.json_repository import write_atomic
+    from repositories.serializers import get_serializer
+    from repositories.sharded_repository import ShardedJSONRepository
+    from repositories.sqlite_repository import SQLiteRepository
+
+    directory = output if storage == "sharded" else os.path.dirname(output)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    if storage == "json":
+        # No GradeManager needed: the dictionary already is the file format
+        write_atomic(output, get_serializer(serializer).dumps(data))
+        return
+
+    manager = GradeManager.from_dict(data)
+    repository = (ShardedJSONRepository(output, num_shards, serializer) if storage == "sharded"
+                  else SQLiteRepository(output))
+    success = repository.save(manager)
+    repository.close()
+    if not success:
+        raise RuntimeError(f"Could not write {output}")
+
+def parse_scales(values) -> Optional[Dict[str, float]]:
+    if not values:
+        return None
+    scales = {}
+    for value in values:
+        name, _, weight = value.partition("=")
+        scales[name] = float(weight or 1)
+    return scales
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--students", type=int, required=True)
+    parser.add_argument("--courses", type=int, default=50)
+    parser.add_argument("--courses-per-student", type=int, nargs="+", default=[4], metavar="N",
+                        help="a count, or LOW HIGH to draw each student's count from")
+    parser.add_argument("--distribution", choices=DISTRIBUTIONS, default="uniform")
+    parser.add_argument("--graded-share", type=float, default=1.0)
+    parser.add_argument("--scales", nargs="+", metavar="NAME=WEIGHT")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--storage", choices=["json", "sharded", "sqlite"], default="json")
+    parser.add_argument("--serializer", default="json", help="format of json and sharded files")
+    parser.add_argument("--shards", type=int, default=16)
+    parser.add_argument("--output", required=True, help="data file, shard directory or database")
+    args = parser.parse_args()
+
+    from models.domain_models import GRADING_SCALES
+    scales = parse_scales(args.scales)
+    unknown = set(scales or ()) - set(GRADING_SCALES)
+    if unknown or len(args.courses_per_student) > 2:
+        parser.error(f"unknown grading scales: {', '.join(sorted(unknown))}" if unknown
+                     else "--courses-per-student takes one or two values")
+
+    start = time.perf_counter()
+    per_student = tuple(args.courses_per_student) if len(args.courses_per_student) == 2 else args.courses_per_student[0]
+    data = make_dataset(args.students, args.courses, per_student, args.seed,
+                        args.distribution, args.graded_share, scales)
+    write_dataset(data, args.output, args.storage, args.serializer, args.shards)
+
+    enrolled = sum(len(ids) for ids in data["enrollments"].values())
+    graded = sum(len(s["grades"]) for s in data["students"].values())
+    print(f"Wrote {args.students} students, {args.courses} courses, {enrolled} enrollments "
+          f"and {graded} grades to {args.output} in {time.perf_counter() - start:.1f}s")
@@ -1,25 +1,43 @@
-from typing import List, Optional
-from models.domain_models import Course, GradeManager
-from repositories.json_repository import JSONRepository
-from models.domain_models import Student
+from typing import List, Optional, Tuple
+from models.domain_models import Course, Student, DEFAULT_SCALE
+from services.data_service import DataService
 
 class CourseController:
-    def __init__(self, repository: JSONRepository):
-        self.repository = repository
-        self.manager = repository.load() or GradeManager()
+    def __init__(self, service: DataService):
+        self.service = service
+        self.repository = service.repository
+        self.manager = service.manager
     
-    def create_course(self, course_code: str, course_name: str) -> bool:
+    def get_course_version(self, course_code: str) -> Optional[str]:
+        """Get the data version of a course, used as its ETag"""
+        return self.manager.get_course_version(course_code)
+    
+    async def create_course(self, course_code: str, course_name: str, durable: bool = False,
+                            grading_scale: str = DEFAULT_SCALE) -> bool:
         """Create a new course"""
-        course = Course(course_code, course_name)
-        success = self.manager.add_course(course)
-        if success:
-            self.repository.save(self.manager)
+        success = await self.service.execute(self._create_course, course_code, course_name, grading_scale)
+        if success and durable:
+            await self.service.wait_until_saved_async()
+        return success
+    
+    def _create_course(self, course_code: str, course_name: str, grading_scale: str) -> bool:
+        course = Course(course_code, course_name, grading_scale)
+        with self.service.transaction() as manager:
+            success = manager.add_course(course)
+            if success:
+                self.service.record("add_course", {"course_code": course_code, "course_name": course_name,
+                                                   "grading_scale": grading_scale})
         return success
     
     def get_all_courses(self) -> List[Course]:
         """Get all courses"""
         return self.manager.get_all_courses()
     
+    def list_courses(self, limit: int, after: Optional[str] = None,
+                     name_contains: Optional[str] = None) -> Tuple[List[Course], Optional[str]]:
+        """Get one page of courses ordered by code, with the cursor of the next page"""
+        return self.manager.list_courses(limit, after, name_contains)
+    
     def get_course(self, course_code: str) -> Optional[Course]:
         """Get a course by code"""
         return self.manager.get_course(course_code)
@@ -1,28 +1,131 @@
 from typing import Dict, List, Optional, Tuple
-from models.domain_models import GradeManager, GradeCategory
-from repositories.json_repository import JSONRepository
+from models.domain_models import Student
+from services.data_service import DataService, PersistenceError
 
 class GradeController:
-    def __init__(self, repository: JSONRepository):
-        self.repository = repository
-        self.manager = repository.load() or GradeManager()
+    def __init__(self, service: DataService):
+        self.service = service
+        self.repository = service.repository
+        self.manager = service.manager
     
-    def register_for_course(self, student_id: str, course_code: str) -> bool:
+    def get_student_version(self, student_id: str) -> Optional[str]:
+        """Get the data version of a student, used as its ETag"""
+        return self.manager.get_student_version(student_id)
+    
+    def get_course_version(self, course_code: str) -> Optional[str]:
+        """Get the data version of a course, used as its ETag"""
+        return self.manager.get_course_version(course_code)
+    
+    async def register_for_course(self, student_id: str, course_code: str, durable: bool = False) -> bool:
         """Register a student for a course"""
-        success = self.manager.register_student_for_course(student_id, course_code)
-        if success:
-            self.repository.save(self.manager)
+        success = await self.service.execute(self._register_for_course, student_id, course_code)
+        if success and durable:
+            await self.service.wait_until_saved_async()
+        return success
+    
+    def _register_for_course(self, student_id: str, course_code: str) -> bool:
+        with self.service.transaction() as manager:
+            success = manager.register_student_for_course(student_id, course_code)
+            if success:
+                self.service.record("register", {"student_id": student_id, "course_code": course_code})
         return success
     
-    def assign_grade(self, student_id: str, course_code: str, grade: float) -> Tuple[bool, Optional[str]]:
+    async def assign_grade(self, student_id: str, course_code: str, grade: float, durable: bool = False) -> Tuple[bool, Optional[str]]:
         """Assign a grade to a student for a course"""
-        success = self.manager.assign_grade(student_id, course_code, grade)
+        success = await self.service.execute(self._assign_grade, student_id, course_code, grade)
+        if success and durable:
+            await self.service.wait_until_saved_async()
         if success:
-            self.repository.save(self.manager)
-            letter_grade = GradeCategory.get_letter_grade(grade)
+            # The manager may have been reloaded by the transaction
+            letter_grade = self.service.manager.get_course(course_code).scale.get_letter_grade(grade)
             return True, letter_grade
         return False, None
     
+    def _assign_grade(self, student_id: str, course_code: str, grade: float) -> bool:
+        with self.service.transaction() as manager:
+            success = manager.assign_grade(student_id, course_code, grade)
+            if success:
+                self.service.record("assign_grade", {"student_id": student_id, "course_code": course_code, "grade": grade})
+        return success
+    
+    async def assign_grades(self, rows: List[Tuple[int, Dict[str, str]]]) -> List[Dict]:
+        """
+        Assign a batch of parsed (line number, row) grade entries without saving.
+        
+        Returns a list of errors for the rows that could not be applied; call
+        save() once the whole upload has been processed.
+        """
+        return await self.service.execute(self._assign_grades, rows)
+    
+    def _assign_grades(self, rows: List[Tuple[int, Dict[str, str]]]) -> List[Dict]:
+        errors = []
+        with self.service.transaction() as manager:
+            for line, row in rows:
+                try:
+                    grade = float(row["grade"])
+                except ValueError:
+                    errors.append({"line": line, "error": "Grade must be a number"})
+                    continue
+                if not 0 <= grade <= 100:
+                    errors.append({"line": line, "error": "Grade must be between 0 and 100"})
+                    continue
+                if not manager.assign_grade(row["student_id"], row["course_code"], grade):
+                    errors.append({"line": line, "error": "Unknown student or course, or student not enrolled"})
+        return errors
+    
+    async def enroll_students(self, rows: List[Tuple[int, Dict[str, str]]], create_missing: bool = False) -> Dict:
+        """
+        Enroll a batch of parsed (line number, row) roster entries without saving.
+        
+        Rows naming an unknown student create it when create_missing is set
+        and the row carries a student_name. Returns counts per outcome plus
+        the rows that could not be applied; call save() once the whole roster
+        has been processed.
+        """
+        return await self.service.execute(self._enroll_students, rows, create_missing)
+    
+    def _enroll_students(self, rows: List[Tuple[int, Dict[str, str]]], create_missing: bool) -> Dict:
+        summary = {"enrolled": 0, "duplicates": 0, "created_students": 0,
+                   "unknown_students": 0, "unknown_courses": 0, "errors": []}
+        with self.service.transaction() as manager:
+            for line, row in rows:
+                student_id, course_code = row["student_id"], row["course_code"]
+                if not manager.get_course(course_code):
+                    summary["unknown_courses"] += 1
+                    summary["errors"].append({"line": line, "error": f"Unknown course {course_code}"})
+                    continue
+                if not manager.get_student(student_id):
+                    if not create_missing or "student_name" not in row:
+                        summary["unknown_students"] += 1
+                        summary["errors"].append({"line": line, "error": f"Unknown student {student_id}"})
+                        continue
+                    manager.add_student(Student(student_id, row["student_name"]))
+                    summary["created_students"] += 1
+                if manager.is_enrolled(student_id, course_code):
+                    summary["duplicates"] += 1
+                    continue
+                manager.register_student_for_course(student_id, course_code)
+                summary["enrolled"] += 1
+        return summary
+    
+    async def save(self) -> bool:
+        """
+        Persist all changes made so far.
+        
+        Raises PersistenceError if they could not be saved; they are then
+        dropped from memory as well.
+        """
+        return await self.service.execute(self._save)
+    
+    def _save(self) -> bool:
+        with self.service.transaction():
+            if self.service.save():
+                return True
+            conflict = self.repository.has_changed()
+            self.service.discard_unsaved()
+        raise PersistenceError("The data was changed by another process, try again" if conflict
+                               else "Could not save the data", conflict)
+    
     def get_student_grades(self, student_id: str) -> Optional[Dict]:
         """Get all grades for a student with formatted information"""
         student = self.manager.get_student(student_id)
@@ -39,7 +142,7 @@ class GradeController:
                     "course_code": course_code,
                     "course_name": course.course_name,
                     "grade": grade,
-                    "letter_grade": GradeCategory.get_letter_grade(grade)
+                    "letter_grade": course.scale.get_letter_grade(grade)
                 })
         
         return {
@@ -55,17 +158,19 @@ class GradeController:
             return None
         
         students = self.manager.get_course_students(course_code)
-        grades = []
+        graded = [(student, student.get_grade(course_code)) for student in students]
+        graded = [(student, grade) for student, grade in graded if grade is not None]
+        letters = course.scale.get_letter_grades([grade for _, grade in graded])
         
-        for student in students:
-            grade = student.get_grade(course_code)
-            if grade is not None:
-                grades.append({
-                    "student_id": student.student_id,
-                    "student_name": student.student_name,
-                    "grade": grade,
-                    "letter_grade": GradeCategory.get_letter_grade(grade)
-                })
+        grades = [
+            {
+                "student_id": student.student_id,
+                "student_name": student.student_name,
+                "grade": grade,
+                "letter_grade": letter
+            }
+            for (student, grade), letter in zip(graded, letters)
+        ]
         
         return {
             "course_code": course.course_code,
@@ -1,24 +1,96 @@
-from typing import Dict, Optional
-from models.domain_models import GradeManager, GradeCategory
-from repositories.json_repository import JSONRepository
+from typing import Dict, Iterator, Optional
+from models.domain_models import Course
+from services.data_service import DataService
 
 class ReportController:
-    def __init__(self, repository: JSONRepository):
-        self.repository = repository
-        self.manager = repository.load() or GradeManager()
+    def __init__(self, service: DataService):
+        self.service = service
+        self.repository = service.repository
+        self.manager = service.manager
+    
+    def get_student_version(self, student_id: str) -> Optional[str]:
+        """Get the data version of a student, used as its ETag"""
+        return self.manager.get_student_version(student_id)
+    
+    def get_course_version(self, course_code: str) -> Optional[str]:
+        """Get the data version of a course, used as its ETag"""
+        return self.manager.get_course_version(course_code)
     
     def generate_student_transcript(self, student_id: str) -> Optional[Dict]:
         """Generate a transcript for a student"""
         return self.manager.generate_student_transcript(student_id)
     
+    def get_course(self, course_code: str) -> Optional[Course]:
+        """Get a course by code"""
+        return self.manager.get_course(course_code)
+    
+    def iter_transcripts(self, course_code: Optional[str] = None, page_size: int = 500) -> Iterator[Dict]:
+        """
+        Generate transcripts for all students, optionally only those enrolled in a course.
+        
+        Students are walked page by page in ID order and transcripts built here
+        are not kept in the transcript cache, so memory use does not grow with
+        the number of students. Students added meanwhile are picked up if their
+        ID sorts after the current page. With a course only its roster is
+        walked, also in ID order.
+        """
+        if course_code is not None:
+            student_ids = sorted(student.student_id for student in self.manager.get_course_students(course_code))
+            for student_id in student_ids:
+                yield self.manager.generate_student_transcript(student_id, store=False)
+            return
+        
+        cursor = None
+        while True:
+            students, cursor = self.manager.list_students(page_size, cursor)
+            for student in students:
+                yield self.manager.generate_student_transcript(student.student_id, store=False)
+            if cursor is None:
+                return
+    
+    def get_cache_stats(self) -> Dict[str, int]:
+        """Get the transcript cache hit/miss counters"""
+        return self.manager.get_transcript_cache_stats()
+    
+    def generate_cohort_summary(self) -> Optional[Dict]:
+        """
+        Generate performance figures for every course and the GPA of the cohort
+        in vectorized passes over the columnar engine.
+        
+        Returns None if numpy is not installed.
+        """
+        engine = self.service.get_columnar_engine()
+        if engine is None:
+            return None
+        
+        with self.service.lock:
+            summaries = engine.course_summaries()
+            gpas = engine.student_gpas()
+        
+        courses = []
+        for code, summary in summaries.items():
+            course = self.manager.get_course(code)
+            courses.append({
+                "course_code": code,
+                "course_name": course.course_name,
+                "num_students": self.manager.count_course_students(code),
+                **summary
+            })
+        
+        return {
+            "num_students": len(gpas),
+            "average_gpa": round(sum(gpas.values()) / len(gpas), 2) if gpas else None,
+            "courses": courses
+        }
+    
     def generate_course_performance(self, course_code: str) -> Optional[Dict]:
         """Generate a performance report for a course"""
         course = self.manager.get_course(course_code)
         if not course:
             return None
         
-        students = self.manager.get_course_students(course_code)
-        if not students:
+        num_students = self.manager.count_course_students(course_code)
+        if not num_students:
             return {
                 "course_code": course_code,
                 "course_name": course.course_name,
@@ -27,40 +99,25 @@ class ReportController:
                 "grade_distribution": {}
             }
         
-        # Get grades for reporting
-        grades = []
-        grade_distribution = {"A": 0, "B+": 0, "B-": 0, "C+": 0, "C-": 0, "E": 0, "F": 0}
-        
-        for student in students:
-            grade = student.get_grade(course_code)
-            if grade is not None:
-                grades.append(grade)
-                letter_grade = GradeCategory.get_letter_grade(grade)
-                grade_distribution[letter_grade] += 1
-        
-        if not grades:
+        # Statistics are maintained incrementally by the manager
+        stats = self.manager.get_course_stats(course_code)
+        if not stats.count:
             return {
                 "course_code": course_code,
                 "course_name": course.course_name,
-                "num_students": len(students),
+                "num_students": num_students,
                 "num_graded": 0,
                 "grade_distribution": {}
             }
         
-        avg = sum(grades) / len(grades)
-        max_grade = max(grades)
-        min_grade = min(grades)
-        passing = sum(1 for g in grades if GradeCategory.is_passing(g))
-        pass_rate = (passing / len(grades)) * 100
-        
         return {
             "course_code": course_code,
             "course_name": course.course_name,
-            "num_students": len(students),
-            "num_graded": len(grades),
-            "average_grade": avg,
-            "highest_grade": max_grade,
-            "lowest_grade": min_grade,
-            "pass_rate": pass_rate,
-            "grade_distribution": {k: v for k, v in grade_distribution.items() if v > 0}
+            "num_students": num_students,
+            "num_graded": stats.count,
+            "average_grade": stats.average,
+            "highest_grade": stats.highest,
+            "lowest_grade": stats.lowest,
+            "pass_rate": (stats.passed / stats.count) * 100,
+            "grade_distribution": {k: stats.distribution[k] for k in stats.scale.letters_descending if k in stats.distribution}
         }
\ No newline at end of file
@@ -1,24 +1,45 @@
-from typing import List, Optional
-from models.domain_models import Student, GradeManager
-from repositories.json_repository import JSONRepository
+from typing import List, Optional, Tuple
+from models.domain_models import Student, Course
+from services.data_service import DataService
 
 class StudentController:
-    def __init__(self, repository: JSONRepository):
-        self.repository = repository
-        self.manager = repository.load() or GradeManager()
+    def __init__(self, service: DataService):
+        self.service = service
+        self.repository = service.repository
+        self.manager = service.manager
     
-    def create_student(self, student_id: str, student_name: str) -> bool:
+    def get_student_version(self, student_id: str) -> Optional[str]:
+        """Get the data version of a student, used as its ETag"""
+        return self.manager.get_student_version(student_id)
+    
+    async def create_student(self, student_id: str, student_name: str, durable: bool = False) -> bool:
         """Creating a new student"""
+        success = await self.service.execute(self._create_student, student_id, student_name)
+        if success and durable:
+            await self.service.wait_until_saved_async()
+        return success
+    
+    def _create_student(self, student_id: str, student_name: str) -> bool:
         student = Student(student_id, student_name)
-        success = self.manager.add_student(student)
-        if success:
-            self.repository.save(self.manager)
+        with self.service.transaction() as manager:
+            success = manager.add_student(student)
+            if success:
+                self.service.record("add_student", {"student_id": student_id, "student_name": student_name})
         return success
     
     def get_all_students(self) -> List[Student]:
         """Getting all students"""
         return self.manager.get_all_students()
     
+    def list_students(self, limit: int, after: Optional[str] = None,
+                      name_contains: Optional[str] = None) -> Tuple[List[Student], Optional[str]]:
+        """Getting one page of students ordered by ID, with the cursor of the next page"""
+        return self.manager.list_students(limit, after, name_contains)
+    
     def get_student(self, student_id: str) -> Optional[Student]:
         """Getting a student by ID"""
-        return self.manager.get_student(student_id)
\ No newline at end of file
+        return self.manager.get_student(student_id)
+    
+    def get_student_courses(self, student_id: str) -> List[Course]:
+        """Getting all courses a student is enrolled in"""
+        return self.manager.get_student_courses(student_id)
\ No newline at end of file
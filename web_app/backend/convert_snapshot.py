@@ -0,0 +1,37 @@
+"""
+Rewrite a grade data file in another serializer format.
+
+The input format is detected automatically. Usage (from web_app/backend):
+
+    python convert_snapshot.py data/grade_data.json data/grade_data.msgpack msgpack
+
+Formats: json, json-compact, orjson, msgpack (the last two need the
+orjson and msgpack packages).
+"""
+import os
+import sys
+import time
+from repositories.json_repository import write_atomic
+from repositories.serializers import get_serializer, read_snapshot, available_serializers
+
+def convert(source: str, target: str, fmt: str) -> bool:
+    """Read source in whatever format it has and write it to target as fmt."""
+    try:
+        serializer = get_serializer(fmt)
+        start = time.perf_counter()
+        data = read_snapshot(source)
+        content = serializer.dumps(data)
+        write_atomic(target, content)
+    except Exception as e:
+        print(f"Error converting data: {e}")
+        return False
+    print(f"Converted {source} ({os.path.getsize(source)} bytes) to {fmt} {target} "
+          f"({len(content)} bytes) in {time.perf_counter() - start:.2f}s")
+    return True
+
+if __name__ == "__main__":
+    if len(sys.argv) != 4:
+        print(__doc__.strip())
+        print(f"Available here: {', '.join(available_serializers())}")
+        sys.exit(2)
+    sys.exit(0 if convert(sys.argv[1], sys.argv[2], sys.argv[3]) else 1)
@@ -1,13 +1,65 @@
 # app/main.py
-from fastapi import FastAPI
+import os
+from typing import Union
+from contextlib import asynccontextmanager
+from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
-from routes import student_routes, course_routes, grade_routes, report_routes
+from fastapi.responses import JSONResponse
+from routes import student_routes, course_routes, grade_routes, report_routes, metrics_routes
+from repositories.json_repository import JSONRepository
+from repositories.journal_repository import JournaledJSONRepository
+from repositories.sqlite_repository import SQLiteRepository
+from repositories.sharded_repository import ShardedJSONRepository
+from services.data_service import DataService, DurabilityError, PersistenceError
+
+DATA_FILE = os.environ.get("GRADE_DATA_FILE", "data/grade_data.json")
+DB_FILE = os.environ.get("GRADE_DB_FILE", "data/grade_data.db")
+SHARD_DIR = os.environ.get("GRADE_SHARD_DIR", "data/shards")
+# Shard count of a new SHARD_DIR; change an existing one with reshard.py
+NUM_SHARDS = int(os.environ.get("GRADE_SHARDS", "16"))
+# "json" rewrites the whole file on every change, "journal" appends to a write-ahead log,
+# "sqlite" stores the data in DB_FILE (see migrate_to_sqlite.py), "sharded" splits
+# students over files in SHARD_DIR and rewrites only the changed ones
+STORAGE_MODE = os.environ.get("GRADE_STORAGE", "json")
+# Format of the data files in json, journal and sharded mode: json, json-compact, orjson or msgpack
+# (see convert_snapshot.py); existing files are read whatever their format
+SERIALIZER = os.environ.get("GRADE_SERIALIZER", "json")
+# Seconds a mutation may wait for a group save; 0 saves synchronously on every request
+WRITER_MAX_DELAY = float(os.environ.get("GRADE_WRITER_MAX_DELAY", "0"))
+WRITER_MAX_PENDING = int(os.environ.get("GRADE_WRITER_MAX_PENDING", "500"))
+# Set to 1 when several processes serve the same data, e.g. uvicorn --workers N; every
+# mutation then holds a cross-process lock and reloads data written by the other workers
+# (cannot be combined with GRADE_WRITER_MAX_DELAY)
+SHARED_STORAGE = os.environ.get("GRADE_SHARED_STORAGE", "0") == "1"
+# Set to 0 to serve no /metrics page and skip the per-request timing
+METRICS_ENABLED = os.environ.get("GRADE_METRICS", "1") == "1"
+
+def create_repository() -> Union[JSONRepository, SQLiteRepository, ShardedJSONRepository]:
+    """Create the repository selected by the GRADE_STORAGE setting."""
+    if STORAGE_MODE == "journal":
+        return JournaledJSONRepository(DATA_FILE, serializer=SERIALIZER)
+    if STORAGE_MODE == "sqlite":
+        return SQLiteRepository(DB_FILE)
+    if STORAGE_MODE == "sharded":
+        return ShardedJSONRepository(SHARD_DIR, NUM_SHARDS, SERIALIZER)
+    return JSONRepository(DATA_FILE, SERIALIZER)
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Load the data once and share it between all requests
+    service = DataService(create_repository(), shared=SHARED_STORAGE)
+    if WRITER_MAX_DELAY > 0:
+        service.start_background_writer(WRITER_MAX_DELAY, WRITER_MAX_PENDING)
+    app.state.data_service = service
+    yield
+    service.close()
 
 # Create FastAPI app
 app = FastAPI(
     title="Grade Management System API",
     description="API for managing students, courses, and grades",
-    version="1.0.0"
+    version="1.0.0",
+    lifespan=lifespan
 )
 
 # Add CORS middleware to allow frontend connection
@@ -17,13 +69,30 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],  # Allows all methods
     allow_headers=["*"],  # Allows all headers
+    expose_headers=["X-Next-Cursor", "ETag"],  # Lets the frontend read pagination cursors and versions
 )
 
+# Count and time requests per route; added last so it also times the CORS handling
+if METRICS_ENABLED:
+    app.add_middleware(metrics_routes.MetricsMiddleware)
+
+@app.exception_handler(PersistenceError)
+async def persistence_error_handler(request: Request, exc: PersistenceError):
+    # A conflict with another process's write can be retried, other failures cannot
+    return JSONResponse(status_code=409 if exc.conflict else 500, content={"detail": str(exc)})
+
+@app.exception_handler(DurabilityError)
+async def durability_error_handler(request: Request, exc: DurabilityError):
+    # The change is applied but not on disk yet; the writer keeps retrying
+    return JSONResponse(status_code=503, content={"detail": str(exc)})
+
 # Include routers
 app.include_router(student_routes.router)
 app.include_router(course_routes.router)
 app.include_router(grade_routes.router)
 app.include_router(report_routes.router)
+if METRICS_ENABLED:
+    app.include_router(metrics_routes.router)
 
 @app.get("/")
 def read_root():
@@ -34,7 +103,8 @@ def read_root():
             "students": "/students",
             "courses": "/courses",
             "grades": "/grades",
-            "reports": "/reports"
+            "reports": "/reports",
+            "metrics": "/metrics"
         }
     }
 
@@ -0,0 +1,27 @@
+"""
+Import an existing grade_data.json into a SQLite database.
+
+Usage (from web_app/backend):
+
+    python migrate_to_sqlite.py [data/grade_data.json] [data/grade_data.db]
+"""
+import sys
+import time
+from repositories.sqlite_repository import SQLiteRepository
+
+def migrate(json_path: str, db_path: str) -> bool:
+    """Bulk import json_path into the database at db_path."""
+    repository = SQLiteRepository(db_path)
+    try:
+        start = time.perf_counter()
+        if not repository.import_json(json_path):
+            return False
+        print(f"Imported {json_path} into {db_path} in {time.perf_counter() - start:.2f}s")
+        return True
+    finally:
+        repository.close()
+
+if __name__ == "__main__":
+    json_path = sys.argv[1] if len(sys.argv) > 1 else "data/grade_data.json"
+    db_path = sys.argv[2] if len(sys.argv) > 2 else "data/grade_data.db"
+    sys.exit(0 if migrate(json_path, db_path) else 1)
@@ -1,11 +1,24 @@
-from typing import Dict, List, Optional, Union
+import sys
+import hashlib
+import math
+import threading
+import uuid
+from bisect import bisect_right, insort
+from fractions import Fraction
+from typing import Callable, Dict, List, Optional, Tuple, Union
+
+DEFAULT_SCALE = "standard"
 
 class Course:
     """Represents a course entity in the grade management system."""
     
-    def __init__(self, course_code: str, course_name: str):
-        self._course_code = course_code
+    # Slots instead of a per-instance __dict__ keep large datasets compact
+    __slots__ = ("_course_code", "_course_name", "_grading_scale")
+    
+    def __init__(self, course_code: str, course_name: str, grading_scale: str = DEFAULT_SCALE):
+        self._course_code = sys.intern(course_code)
         self._course_name = course_name
+        self._grading_scale = grading_scale
     
     @property
     def course_code(self) -> str:
@@ -17,28 +30,50 @@ class Course:
         """Get the course name."""
         return self._course_name
     
+    @property
+    def grading_scale(self) -> str:
+        """Get the name of the grading scale used for this course."""
+        return self._grading_scale
+    
+    @property
+    def scale(self) -> 'GradingScale':
+        """Get the grading scale used for this course."""
+        return GradeCategory.get_scale(self._grading_scale)
+    
     def __str__(self) -> str:
         """String representation of the Course."""
         return f"{self._course_code}: {self._course_name}"
     
     def to_dict(self) -> Dict:
         """Convert Course object to dictionary for JSON serialization."""
-        return {
+        data = {
             "course_code": self._course_code,
             "course_name": self._course_name
         }
+        # Only written when set, so files without scales stay unchanged
+        if self._grading_scale != DEFAULT_SCALE:
+            data["grading_scale"] = self._grading_scale
+        return data
     
     @classmethod
     def from_dict(cls, data: Dict) -> 'Course':
         """Create a Course object from a dictionary."""
-        return cls(data["course_code"], data["course_name"])
+        return cls(data["course_code"], data["course_name"], data.get("grading_scale", DEFAULT_SCALE))
 
 
 class Student:
-    """Represents a student entity in the grade management system."""
+    """
+    Represents a student entity in the grade management system.
+    
+    Student ids and the course codes used as grade keys are interned, so
+    the many rosters, indexes and grade dictionaries referring to them
+    share one string object per id instead of one per occurrence.
+    """
+    
+    __slots__ = ("_student_id", "_student_name", "_grades")
     
     def __init__(self, student_id: str, student_name: str):
-        self._student_id = student_id
+        self._student_id = sys.intern(student_id)
         self._student_name = student_name
         self._grades: Dict[str, float] = {}  # Maps course_code to grade
     
@@ -53,7 +88,7 @@ class Student:
         return self._student_name
     
     def add_grade(self, course: Union[Course, str], grade: float) -> None:
-        course_code = course.course_code if isinstance(course, Course) else course
+        course_code = course.course_code if isinstance(course, Course) else sys.intern(course)
         self._grades[course_code] = grade
     
     def get_grade(self, course: Union[Course, str]) -> Optional[float]:
@@ -80,34 +115,225 @@ class Student:
     def from_dict(cls, data: Dict) -> 'Student':
         """Create a Student object from a dictionary."""
         student = cls(data["student_id"], data["student_name"])
-        student._grades = data["grades"]
+        student._grades = {sys.intern(code): grade for code, grade in data["grades"].items()}
         return student
 
 
+class GradingScale:
+    """
+    A grading scale defined as a sorted table of boundaries.
+    
+    Each letter covers marks from its lower bound up to the next one. Single
+    marks are looked up with a bisect; the batched methods map a whole
+    sequence or NumPy array of marks in one call.
+    """
+    
+    def __init__(self, name: str, bounds: List[float], letters: List[str],
+                 points: Optional[List[float]], pass_mark: float):
+        """
+        Args:
+            name: Name the scale is selected by
+            bounds: Ascending lower bounds of every letter except the lowest
+            letters: Letters from lowest to highest, one more than bounds
+            points: Grade points per letter, or None if the scale does not count towards the GPA
+            pass_mark: Lowest passing mark
+        """
+        if len(letters) != len(bounds) + 1 or bounds != sorted(bounds):
+            raise ValueError("letters must follow ascending bounds, with one letter below the first bound")
+        self.name = name
+        self.bounds = bounds
+        self.letters = letters
+        self.points = points
+        self.pass_mark = pass_mark
+    
+    @property
+    def counts_towards_gpa(self) -> bool:
+        return self.points is not None
+    
+    @property
+    def letters_descending(self) -> List[str]:
+        """Letters from best to worst, the order used in reports."""
+        return self.letters[::-1]
+    
+    def letter_index(self, mark: float) -> int:
+        return bisect_right(self.bounds, mark)
+    
+    def get_letter_grade(self, mark: float) -> str:
+        return self.letters[bisect_right(self.bounds, mark)]
+    
+    def get_grade_points(self, mark: float) -> float:
+        """Grade points earned for a mark; 0 for failing marks or scales without points."""
+        if self.points is None or mark < self.pass_mark:
+            return 0.0
+        return self.points[bisect_right(self.bounds, mark)]
+    
+    def is_passing(self, mark: float) -> bool:
+        return mark >= self.pass_mark
+    
+    def letter_indexes(self, marks):
+        """Letter indexes for many marks; a NumPy array in gives a NumPy array out."""
+        if hasattr(marks, "dtype"):
+            import numpy as np
+            return np.searchsorted(self.bounds, marks, side="right")
+        return [bisect_right(self.bounds, mark) for mark in marks]
+    
+    def get_letter_grades(self, marks) -> List[str]:
+        """Letters for many marks in one call."""
+        letters = self.letters
+        return [letters[i] for i in self.letter_indexes(marks)]
+    
+    def get_grade_points_batch(self, marks):
+        """Grade points for many marks in one call; NumPy arrays are handled vectorized."""
+        indexes = self.letter_indexes(marks)
+        if hasattr(marks, "dtype"):
+            import numpy as np
+            if self.points is None:
+                return np.zeros(len(marks))
+            return np.where(marks >= self.pass_mark, np.asarray(self.points)[indexes], 0.0)
+        if self.points is None:
+            return [0.0] * len(indexes)
+        return [self.points[i] if mark >= self.pass_mark else 0.0 for i, mark in zip(indexes, marks)]
+
+
+GRADING_SCALES: Dict[str, GradingScale] = {
+    "standard": GradingScale(
+        "standard",
+        bounds=[40, 50, 60, 70, 75, 80],
+        letters=["F", "E", "C-", "C+", "B-", "B+", "A"],
+        points=[0.0, 2.0, 3.0, 3.5, 4.0, 4.5, 5.0],
+        pass_mark=40
+    ),
+    "pass_fail": GradingScale(
+        "pass_fail",
+        bounds=[40],
+        letters=["F", "P"],
+        points=None,
+        pass_mark=40
+    ),
+}
+
+
 class GradeCategory:
     """Utility class for categorizing numeric grades into letter grades."""
     
     @staticmethod
-    def get_letter_grade(numeric_grade: float) -> str:
-
-        if numeric_grade >= 80:
-            return "A"
-        elif numeric_grade >= 75:
-            return "B+"
-        elif numeric_grade >= 70:
-            return "B-"
-        elif numeric_grade >= 60:
-            return "C+"
-        elif numeric_grade >= 50:
-            return "C-"
-        elif numeric_grade >= 40:
-            return "E"
-        else:
-            return "F"
+    def get_scale(scale: str = DEFAULT_SCALE) -> GradingScale:
+        """Get a grading scale by name, falling back to the default scale."""
+        return GRADING_SCALES.get(scale) or GRADING_SCALES[DEFAULT_SCALE]
     
     @staticmethod
-    def is_passing(numeric_grade: float) -> bool:
-        return numeric_grade >= 40
+    def get_letter_grade(numeric_grade: float, scale: str = DEFAULT_SCALE) -> str:
+        return GradeCategory.get_scale(scale).get_letter_grade(numeric_grade)
+    
+    @staticmethod
+    def is_passing(numeric_grade: float, scale: str = DEFAULT_SCALE) -> bool:
+        return GradeCategory.get_scale(scale).is_passing(numeric_grade)
+    
+    @staticmethod
+    def get_grade_points(numeric_grade: float, scale: str = DEFAULT_SCALE) -> float:
+        return GradeCategory.get_scale(scale).get_grade_points(numeric_grade)
+
+
+class CourseStats:
+    """
+    Running grade statistics for one course.
+    
+    Updated on every grade assignment, so reports read them in O(1). The sum
+    is kept as an exact Fraction so overwriting grades never accumulates
+    floating point error, and the grade values are kept as a multiset so the
+    minimum and maximum survive overwrites. The extremes themselves are
+    cached; the multiset is only scanned when the last copy of one is
+    removed.
+    
+    Grades that are not finite numbers cannot be summed exactly and are
+    left out, as if the student were ungraded.
+    """
+    
+    def __init__(self, scale: Optional[GradingScale] = None):
+        self.scale = scale or GradeCategory.get_scale()
+        self.count = 0
+        self.passed = 0
+        self._total = Fraction(0)
+        self._values: Dict[float, int] = {}          # Maps grade value to number of students
+        self._highest: Optional[float] = None
+        self._lowest: Optional[float] = None
+        self.distribution: Dict[str, int] = {}       # Maps letter grade to number of students
+    
+    def add(self, grade: float) -> None:
+        """Account for a new grade."""
+        # Work out everything that can fail before changing any counter
+        exact, letter, passing = Fraction(grade), self.scale.get_letter_grade(grade), self.scale.is_passing(grade)
+        self.count += 1
+        self._total += exact
+        self._values[grade] = self._values.get(grade, 0) + 1
+        if self._highest is None or grade > self._highest:
+            self._highest = grade
+        if self._lowest is None or grade < self._lowest:
+            self._lowest = grade
+        self.distribution[letter] = self.distribution.get(letter, 0) + 1
+        if passing:
+            self.passed += 1
+    
+    def remove(self, grade: float) -> None:
+        """Forget a grade that is being overwritten."""
+        exact, letter, passing = Fraction(grade), self.scale.get_letter_grade(grade), self.scale.is_passing(grade)
+        self.count -= 1
+        self._total -= exact
+        self._values[grade] -= 1
+        if not self._values[grade]:
+            del self._values[grade]
+            if grade == self._highest:
+                self._highest = max(self._values) if self._values else None
+            if grade == self._lowest:
+                self._lowest = min(self._values) if self._values else None
+        self.distribution[letter] -= 1
+        if not self.distribution[letter]:
+            del self.distribution[letter]
+        if passing:
+            self.passed -= 1
+    
+    def add_many(self, grades: List[float]) -> int:
+        """
+        Account for many new grades at once.
+        
+        Equivalent to calling add() for each grade, but the exact sum, letters
+        and pass count are worked out once per distinct value, which makes
+        rebuilding the statistics of a large course much cheaper.
+        
+        Returns:
+            Number of grades left out because they are not finite numbers
+        """
+        counts: Dict[float, int] = {}
+        skipped = 0
+        for grade in grades:
+            if not math.isfinite(grade):
+                skipped += 1
+                continue
+            counts[grade] = counts.get(grade, 0) + 1
+        for grade, count in counts.items():
+            self.count += count
+            self._total += Fraction(grade) * count
+            self._values[grade] = self._values.get(grade, 0) + count
+            letter = self.scale.get_letter_grade(grade)
+            self.distribution[letter] = self.distribution.get(letter, 0) + count
+            if self.scale.is_passing(grade):
+                self.passed += count
+        if counts:
+            self._highest = max(self._values)
+            self._lowest = min(self._values)
+        return skipped
+    
+    @property
+    def average(self) -> Optional[float]:
+        return float(self._total / self.count) if self.count else None
+    
+    @property
+    def highest(self) -> Optional[float]:
+        return self._highest
+    
+    @property
+    def lowest(self) -> Optional[float]:
+        return self._lowest
 
 
 class GradeManager:
@@ -120,13 +346,37 @@ class GradeManager:
         """Initialize the GradeManager with empty collections."""
         self._students: Dict[str, Student] = {}  # Maps student_id to Student
         self._courses: Dict[str, Course] = {}    # Maps course_code to Course
-        self._enrollments: Dict[str, List[str]] = {}  # Maps course_code to list of student_ids
+        self._enrollments: Dict[str, Dict[str, None]] = {}  # Maps course_code to insertion-ordered set of student_ids
+        self._student_courses: Dict[str, List[str]] = {}  # Maps student_id to list of course_codes
+        self._course_stats: Dict[str, CourseStats] = {}  # Maps course_code to its running statistics
+        self._student_order: List[str] = []  # Sorted student_ids, used for cursor pagination
+        self._course_order: List[str] = []   # Sorted course_codes, used for cursor pagination
+        # Data versions: the global one is bumped by every mutation and each
+        # student/course records the global version of its last change
+        self._epoch = uuid.uuid4().hex[:8]  # Distinguishes versions of different loads within a process
+        self._version = 0
+        self._student_versions: Dict[str, int] = {}
+        self._course_versions: Dict[str, int] = {}
+        # Content hashes served as ETag versions, with the version they were computed at
+        self._content_versions: Dict[Tuple[str, str], Tuple[int, str]] = {}
+        # Callbacks invoked as listener(op, payload) after every mutation
+        self._listeners: List[Callable[[str, Dict], None]] = []
+        # Memoized transcripts, dropped when the student's grades change. Reads
+        # run beside mutations on other threads, so storing a transcript and
+        # dropping it on a grade change happen under this lock
+        self._transcript_cache: Dict[str, Dict] = {}
+        self._transcript_lock = threading.Lock()
+        self.transcript_cache_hits = 0
+        self.transcript_cache_misses = 0
     
     def add_student(self, student: Student) -> bool:
         if student.student_id in self._students:
             return False
         
         self._students[student.student_id] = student
+        insort(self._student_order, student.student_id)
+        self._bump(student_id=student.student_id)
+        self._notify("add_student", {"student_id": student.student_id, "student_name": student.student_name})
         return True
     
     def add_course(self, course: Course) -> bool:
@@ -134,7 +384,12 @@ class GradeManager:
             return False
         
         self._courses[course.course_code] = course
-        self._enrollments[course.course_code] = []
+        self._enrollments[course.course_code] = {}
+        self._course_stats[course.course_code] = CourseStats(course.scale)
+        insort(self._course_order, course.course_code)
+        self._bump(course_code=course.course_code)
+        self._notify("add_course", {"course_code": course.course_code, "course_name": course.course_name,
+                                    "grading_scale": course.grading_scale})
         return True
     
     def get_student(self, student_id: str) -> Optional[Student]:
@@ -148,22 +403,111 @@ class GradeManager:
     def register_student_for_course(self, student_id: str, course_code: str) -> bool:
         if (student_id not in self._students or 
             course_code not in self._courses or
-            student_id in self._enrollments.get(course_code, [])):
+            student_id in self._enrollments.get(course_code, {})):
             return False
         
-        self._enrollments[course_code].append(student_id)
+        student_id, course_code = sys.intern(student_id), sys.intern(course_code)
+        self._enrollments[course_code][student_id] = None
+        self._student_courses.setdefault(student_id, []).append(course_code)
+        self._bump(student_id, course_code)
+        self._notify("register", {"student_id": student_id, "course_code": course_code})
         return True
     
+    def is_enrolled(self, student_id: str, course_code: str) -> bool:
+        """Check whether a student is enrolled in a course."""
+        return student_id in self._enrollments.get(course_code, {})
+    
     def assign_grade(self, student_id: str, course_code: str, grade: float) -> bool:
         if (student_id not in self._students or 
             course_code not in self._courses or
-            student_id not in self._enrollments.get(course_code, [])):
+            student_id not in self._enrollments.get(course_code, {}) or
+            not math.isfinite(grade)):
             return False
         
         student = self._students[student_id]
+        stats = self._course_stats[course_code]
+        previous = student.get_grade(course_code)
+        # Add before removing, so a failure leaves the statistics as they were
+        stats.add(grade)
+        # A non-finite grade loaded from old data was never counted
+        if previous is not None and math.isfinite(previous):
+            stats.remove(previous)
         student.add_grade(course_code, grade)
+        with self._transcript_lock:
+            self._bump(student_id, course_code)
+            self._transcript_cache.pop(student_id, None)
+        self._notify("assign_grade", {"student_id": student_id, "course_code": course_code, "grade": grade})
         return True
     
+    def _bump(self, student_id: Optional[str] = None, course_code: Optional[str] = None) -> None:
+        """Advance the data version and stamp the affected student and course with it."""
+        self._version += 1
+        if student_id is not None:
+            self._student_versions[student_id] = self._version
+        if course_code is not None:
+            self._course_versions[course_code] = self._version
+    
+    def add_listener(self, listener: Callable[[str, Dict], None]) -> None:
+        """
+        Register a callback invoked after every mutation.
+        
+        The callback receives the operation name and arguments in the same
+        form GradeManager.apply_operation accepts.
+        """
+        self._listeners.append(listener)
+    
+    def remove_listener(self, listener: Callable[[str, Dict], None]) -> None:
+        """Unregister a callback added with add_listener."""
+        self._listeners.remove(listener)
+    
+    def _notify(self, op: str, payload: Dict) -> None:
+        for listener in self._listeners:
+            listener(op, payload)
+    
+    @property
+    def version(self) -> str:
+        """Version of the whole data set; changes on every mutation."""
+        return f"{self._epoch}-{self._version}"
+    
+    def get_student_version(self, student_id: str) -> Optional[str]:
+        """
+        Version of a student's data, or None if the student does not exist.
+        
+        The version is a hash of the data itself, so every process serving the
+        same data, and every reload of it, hands out the same version.
+        """
+        student = self._students.get(student_id)
+        if student is None:
+            return None
+        return self._content_version(
+            ("student", student_id), self._student_versions.get(student_id, 0),
+            lambda: (student.student_name, list(student.get_all_grades().items()),
+                     list(self._student_courses.get(student_id, ()))))
+    
+    def get_course_version(self, course_code: str) -> Optional[str]:
+        """Version of a course's roster and grades, or None if the course does not exist."""
+        course = self._courses.get(course_code)
+        if course is None:
+            return None
+        students = self._students
+        
+        def content():
+            # Copied first, since the roster can grow while it is being hashed
+            roster = list(self._enrollments.get(course_code, ()))
+            return (course.course_name, course.grading_scale,
+                    [(sid, students[sid].get_grade(course_code)) for sid in roster if sid in students])
+        return self._content_version(("course", course_code), self._course_versions.get(course_code, 0), content)
+    
+    def _content_version(self, key: Tuple[str, str], version: int, content: Callable[[], object]) -> str:
+        """Hash of content(), recomputed only after the entity's version changed."""
+        cached = self._content_versions.get(key)
+        if cached is not None and cached[0] == version:
+            return cached[1]
+        digest = hashlib.blake2b(repr(content()).encode("utf-8"), digest_size=8).hexdigest()
+        # A change racing the hash bumps the version afterwards, so the next call hashes again
+        self._content_versions[key] = (version, digest)
+        return digest
+    
     def get_student_grades(self, student_id: str) -> Optional[Dict[str, float]]:
         student = self._students.get(student_id)
         return student.get_all_grades() if student else None
@@ -172,14 +516,23 @@ class GradeManager:
         if course_code not in self._courses:
             return None
         
-        grades = []
-        for student_id in self._enrollments.get(course_code, []):
-            student = self._students[student_id]
-            grade = student.get_grade(course_code)
-            if grade is not None:
-                grades.append(grade)
-        
-        return sum(grades) / len(grades) if grades else None
+        return self._course_stats[course_code].average
+    
+    def get_course_stats(self, course_code: str) -> Optional[CourseStats]:
+        """Get the running grade statistics of a course."""
+        return self._course_stats.get(course_code)
+    
+    def count_course_students(self, course_code: str) -> int:
+        """Get the number of students enrolled in a course."""
+        return len(self._enrollments.get(course_code, {}))
+    
+    def count_students(self) -> int:
+        """Get the number of students in the system."""
+        return len(self._students)
+    
+    def count_courses(self) -> int:
+        """Get the number of courses in the system."""
+        return len(self._courses)
     
     def get_all_students(self) -> List[Student]:
         """Get all students in the system."""
@@ -189,15 +542,136 @@ class GradeManager:
         """Get all courses in the system."""
         return list(self._courses.values())
     
+    def list_students(self, limit: int, after: Optional[str] = None,
+                      name_contains: Optional[str] = None) -> Tuple[List[Student], Optional[str]]:
+        """
+        Get one page of students ordered by ID.
+        
+        Args:
+            limit: Maximum number of students to return
+            after: Cursor; only students with an ID greater than this are returned
+            name_contains: Only return students whose name contains this text (case-insensitive)
+            
+        Returns:
+            The page and the cursor for the next page, or None if this is the last page
+        """
+        predicate = None
+        if name_contains:
+            needle = name_contains.lower()
+            predicate = lambda student: needle in student.student_name.lower()
+        return self._page(self._student_order, self._students, limit, after, predicate)
+    
+    def list_courses(self, limit: int, after: Optional[str] = None,
+                     name_contains: Optional[str] = None) -> Tuple[List[Course], Optional[str]]:
+        """
+        Get one page of courses ordered by code.
+        
+        Args:
+            limit: Maximum number of courses to return
+            after: Cursor; only courses with a code greater than this are returned
+            name_contains: Only return courses whose name contains this text (case-insensitive)
+            
+        Returns:
+            The page and the cursor for the next page, or None if this is the last page
+        """
+        predicate = None
+        if name_contains:
+            needle = name_contains.lower()
+            predicate = lambda course: needle in course.course_name.lower()
+        return self._page(self._course_order, self._courses, limit, after, predicate)
+    
+    @staticmethod
+    def _page(order: List[str], items: Dict, limit: int, after: Optional[str],
+              predicate: Optional[Callable]) -> Tuple[List, Optional[str]]:
+        """Walk a sorted key index from the cursor and collect up to limit matching items."""
+        start = bisect_right(order, after) if after is not None else 0
+        page = []
+        last_key = None
+        for index in range(start, len(order)):
+            key = order[index]
+            item = items[key]
+            if predicate and not predicate(item):
+                continue
+            if len(page) == limit:
+                return page, last_key
+            page.append(item)
+            last_key = key
+        return page, None
+    
     def get_course_students(self, course_code: str) -> List[Student]:
         """Get all students enrolled in a specific course."""
         if course_code not in self._courses:
             return []
         
-        student_ids = self._enrollments.get(course_code, [])
+        # Copied first, since the roster can grow while the list is built
+        student_ids = list(self._enrollments.get(course_code, ()))
         return [self._students[sid] for sid in student_ids if sid in self._students]
     
-    def generate_student_transcript(self, student_id: str) -> Optional[Dict]:
+    def get_student_courses(self, student_id: str) -> List[Course]:
+        """Get all courses a specific student is enrolled in."""
+        course_codes = list(self._student_courses.get(student_id, ()))
+        return [self._courses[code] for code in course_codes if code in self._courses]
+    
+    def _rebuild_student_courses(self) -> None:
+        """Rebuild the student to courses index from the enrollments."""
+        self._student_courses = {}
+        for course_code, student_ids in self._enrollments.items():
+            for student_id in student_ids:
+                self._student_courses.setdefault(student_id, []).append(course_code)
+    
+    def _rebuild_course_stats(self) -> None:
+        """Rebuild the per-course statistics from the enrolled students' grades."""
+        self._course_stats = {code: CourseStats(course.scale) for code, course in self._courses.items()}
+        for course_code, student_ids in self._enrollments.items():
+            stats = self._course_stats.get(course_code)
+            if stats is None:
+                continue
+            students = self._students
+            grades = [students[sid]._grades.get(course_code) for sid in student_ids if sid in students]
+            skipped = stats.add_many([grade for grade in grades if grade is not None])
+            if skipped:
+                print(f"Error loading data: {skipped} grade(s) in course {course_code} are not finite "
+                      "numbers and are left out of its statistics")
+    
+    def generate_student_transcript(self, student_id: str, store: bool = True) -> Optional[Dict]:
+        """
+        Get a student's transcript, served from the cache when possible.
+        
+        The returned dictionary is shared with the cache and must not be modified.
+        
+        Args:
+            student_id: ID of the student
+            store: Whether to keep a freshly built transcript in the cache; exports
+                walking every student pass False so the cache does not end up
+                holding the whole cohort. Such lookups are not counted as hits
+                or misses either, so an export leaves the hit ratio alone
+        """
+        cached = self._transcript_cache.get(student_id)
+        if not store:
+            return cached if cached is not None else self._build_student_transcript(student_id)
+        if cached is not None:
+            self.transcript_cache_hits += 1
+            return cached
+        
+        self.transcript_cache_misses += 1
+        version = self._student_versions.get(student_id)
+        transcript = self._build_student_transcript(student_id)
+        # Only cache if no grade was assigned to the student meanwhile. A grade
+        # assigned after the check drops the entry once the lock is released
+        with self._transcript_lock:
+            if transcript is not None and self._student_versions.get(student_id) == version:
+                self._transcript_cache[student_id] = transcript
+        return transcript
+    
+    def get_transcript_cache_stats(self) -> Dict[str, int]:
+        """Get the hit/miss counters and size of the transcript cache."""
+        return {
+            "hits": self.transcript_cache_hits,
+            "misses": self.transcript_cache_misses,
+            "size": len(self._transcript_cache)
+        }
+    
+    def _build_student_transcript(self, student_id: str) -> Optional[Dict]:
         student = self.get_student(student_id)
         if not student:
             return None
@@ -212,14 +686,16 @@ class GradeManager:
         }
         
         total_grade_points = 0
+        gpa_courses = 0
         
         for course_code, numeric_grade in student.get_all_grades().items():
             course = self.get_course(course_code)
             if not course:
                 continue
-                
-            letter_grade = GradeCategory.get_letter_grade(numeric_grade)
-            passed = GradeCategory.is_passing(numeric_grade)
+            
+            scale = course.scale
+            letter_grade = scale.get_letter_grade(numeric_grade)
+            passed = scale.is_passing(numeric_grade)
             
             course_info = {
                 "course_code": course_code,
@@ -231,47 +707,82 @@ class GradeManager:
             
             transcript["courses"].append(course_info)
             transcript["total_courses"] += 1
-            
             if passed:
                 transcript["passed_courses"] += 1
-                if letter_grade == "A":
-                    total_grade_points += 5.0
-                elif letter_grade == "B+":
-                    total_grade_points += 4.5
-                elif letter_grade == "B-":
-                    total_grade_points += 4.0
-                elif letter_grade == "C+":
-                    total_grade_points += 3.5
-                elif letter_grade == "C-":
-                    total_grade_points += 3.0
-                elif letter_grade == "E":
-                    total_grade_points += 2.0
+            
+            # Courses on a scale without grade points do not count towards the GPA
+            if scale.counts_towards_gpa:
+                gpa_courses += 1
+                total_grade_points += scale.get_grade_points(numeric_grade)
         
-        if transcript["total_courses"] > 0:
-            transcript["gpa"] = round(total_grade_points / transcript["total_courses"], 2)
+        if gpa_courses > 0:
+            transcript["gpa"] = round(total_grade_points / gpa_courses, 2)
         
         return transcript
     
-    def to_dict(self) -> Dict:
-        """Convert GradeManager object to dictionary for JSON serialization."""
-        return {
-            "students": {sid: student.to_dict() for sid, student in self._students.items()},
+    def apply_operation(self, op: str, payload: Dict) -> bool:
+        """
+        Apply a single mutation described by an operation name and its arguments.
+        
+        Used to replay journaled mutations; replaying an operation that was
+        already applied has no further effect.
+        """
+        if op == "add_student":
+            return self.add_student(Student(payload["student_id"], payload["student_name"]))
+        if op == "add_course":
+            return self.add_course(Course(payload["course_code"], payload["course_name"],
+                                          payload.get("grading_scale", DEFAULT_SCALE)))
+        if op == "register":
+            return self.register_student_for_course(payload["student_id"], payload["course_code"])
+        if op == "assign_grade":
+            return self.assign_grade(payload["student_id"], payload["course_code"], payload["grade"])
+        raise ValueError(f"Unknown operation: {op}")
+    
+    def to_dict(self, include_students: bool = True) -> Dict:
+        """
+        Convert GradeManager object to dictionary for JSON serialization.
+        
+        Args:
+            include_students: Leave out the students section when False, for
+                callers that store students separately
+        """
+        data = {
             "courses": {code: course.to_dict() for code, course in self._courses.items()},
-            "enrollments": self._enrollments
+            "enrollments": {code: list(roster) for code, roster in self._enrollments.items()}
         }
+        if include_students:
+            data = {"students": {sid: student.to_dict() for sid, student in self._students.items()}, **data}
+        return data
     
     @classmethod
     def from_dict(cls, data: Dict) -> 'GradeManager':
         """Create a GradeManager object from a dictionary."""
         manager = cls()
-        
         for course_data in data.get("courses", {}).values():
-            course = Course.from_dict(course_data)
-            manager._courses[course.course_code] = course
-        
+            manager._load_course(course_data)
         for student_data in data.get("students", {}).values():
-            student = Student.from_dict(student_data)
-            manager._students[student.student_id] = student
-        
-        manager._enrollments = data.get("enrollments", {})
-        return manager
\ No newline at end of file
+            manager._load_student(student_data)
+        for course_code, student_ids in data.get("enrollments", {}).items():
+            manager._load_enrollments(course_code, student_ids)
+        manager._finish_load()
+        return manager
+    
+    ### Loading in steps, used by from_dict and the streaming loader
+    
+    def _load_course(self, data: Dict) -> None:
+        course = Course.from_dict(data)
+        self._courses[course.course_code] = course
+    
+    def _load_student(self, data: Dict) -> None:
+        student = Student.from_dict(data)
+        self._students[student.student_id] = student
+    
+    def _load_enrollments(self, course_code: str, student_ids: List[str]) -> None:
+        self._enrollments[sys.intern(course_code)] = dict.fromkeys(map(sys.intern, student_ids))
+    
+    def _finish_load(self) -> None:
+        """Build the indexes once every section has been loaded."""
+        self._student_order = sorted(self._students)
+        self._course_order = sorted(self._courses)
+        self._rebuild_student_courses()
+        self._rebuild_course_stats()
\ No newline at end of file
@@ -9,6 +9,7 @@ class StudentCreate(BaseModel):
 class CourseCreate(BaseModel):
     course_code: str
     course_name: str
+    grading_scale: str = "standard"
 
 class EnrollmentCreate(BaseModel):
     student_id: str
@@ -30,6 +31,7 @@ class StudentDetailResponse(StudentResponse):
 class CourseResponse(BaseModel):
     course_code: str
     course_name: str
+    grading_scale: str = "standard"
 
 class CourseDetailResponse(CourseResponse):
     students: List[str] = Field(default_factory=list)
@@ -61,6 +63,33 @@ class CoursePerformance(BaseModel):
     pass_rate: Optional[float] = None
     grade_distribution: Dict[str, int] = Field(default_factory=dict)
 
+class CohortSummary(BaseModel):
+    num_students: int
+    average_gpa: Optional[float] = None
+    courses: List[CoursePerformance] = Field(default_factory=list)
+
 class MessageResponse(BaseModel):
     status: str
-    message: str
\ No newline at end of file
+    message: str
+
+class BulkRowError(BaseModel):
+    line: int
+    error: str
+
+class BulkResultResponse(BaseModel):
+    status: str
+    processed: int
+    applied: int
+    failed: int
+    errors: List[BulkRowError] = Field(default_factory=list)
+
+class BulkEnrollmentResponse(BaseModel):
+    status: str
+    processed: int
+    enrolled: int
+    duplicates: int
+    created_students: int
+    unknown_students: int
+    unknown_courses: int
+    failed: int
+    errors: List[BulkRowError] = Field(default_factory=list)
\ No newline at end of file
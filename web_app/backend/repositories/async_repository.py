@@ -0,0 +1,28 @@
+import asyncio
+import functools
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, TypeVar
+
+T = TypeVar("T")
+
+class AsyncRepository:
+    """
+    Storage thread that repository work is awaited on.
+
+    Every call runs on a single thread, so blocking file and database I/O
+    never runs on the event loop or occupies the request thread pool, and
+    writes reach the repository in the order they were issued. Callers pass
+    whole mutations, which apply and persist under the data service's lock.
+    """
+
+    def __init__(self):
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="grade-store")
+
+    async def run(self, func: Callable[..., T], *args) -> T:
+        """Run func(*args) on the storage thread and wait for its result."""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, functools.partial(func, *args))
+
+    def close(self) -> None:
+        """Finish the queued calls and stop the storage thread."""
+        self._executor.shutdown(wait=True)
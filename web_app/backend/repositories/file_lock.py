@@ -0,0 +1,76 @@
+import os
+import threading
+from typing import Iterable, Optional, Tuple
+
+try:
+    import fcntl
+except ImportError:  # fcntl is POSIX-only; without it the lock only covers this process
+    fcntl = None
+
+class FileLock:
+    """
+    Exclusive lock shared by every process that opens the same lock file.
+
+    The lock is reentrant: the thread holding it may acquire it again, for
+    instance when save() runs inside a transaction. Other threads of the
+    process wait for it like other processes do.
+    """
+
+    def __init__(self, path: str):
+        """
+        Args:
+            path: Lock file, created on first use; its contents are never used
+        """
+        self.path = path
+        self._thread_lock = threading.RLock()
+        self._depth = 0
+        self._fd: Optional[int] = None
+
+    def acquire(self) -> None:
+        self._thread_lock.acquire()
+        if self._depth == 0 and fcntl is not None:
+            try:
+                if self._fd is None:
+                    self._fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o644)
+                fcntl.flock(self._fd, fcntl.LOCK_EX)
+            except BaseException:
+                self._thread_lock.release()
+                raise
+        self._depth += 1
+
+    def release(self) -> None:
+        self._depth -= 1
+        if self._depth == 0 and fcntl is not None:
+            fcntl.flock(self._fd, fcntl.LOCK_UN)
+        self._thread_lock.release()
+
+    def __enter__(self) -> "FileLock":
+        self.acquire()
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.release()
+
+    def close(self) -> None:
+        """Close the lock file; the lock must not be held."""
+        with self._thread_lock:
+            if self._fd is not None:
+                os.close(self._fd)
+                self._fd = None
+
+def file_signature(paths: Iterable[str]) -> Tuple:
+    """
+    Identify the current version of a set of files by inode, size and mtime.
+
+    Every save replaces the data file with a new one, so any write by any
+    process changes the signature. Missing files are part of it as None.
+    """
+    signature = []
+    for path in paths:
+        try:
+            st = os.stat(path)
+        except FileNotFoundError:
+            signature.append(None)
+            continue
+        signature.append((st.st_ino, st.st_size, st.st_mtime_ns))
+    return tuple(signature)
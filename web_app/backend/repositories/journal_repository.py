@@ -0,0 +1,185 @@
+import os
+import json
+from typing import Dict, List, Optional
+from models.domain_models import GradeManager
+from repositories.file_lock import file_signature
+from repositories.json_repository import JSONRepository
+from repositories.serializers import JSONSerializer
+from services import metrics
+
+class JournaledJSONRepository(JSONRepository):
+    """
+    JSON repository that appends each mutation to a write-ahead journal.
+
+    The JSON file acts as a snapshot. Every mutation is appended as one
+    compact line to a journal next to it, and after a number of appended
+    records the snapshot is rewritten and the journal truncated. Loading
+    reads the snapshot and replays the journal on top of it.
+
+    A process sharing the files with others can catch_up() with the records
+    they appended instead of loading everything again.
+    """
+
+    def __init__(self, file_path: str = "data/grade_data.json",
+                 journal_path: Optional[str] = None,
+                 compact_every: int = 1000,
+                 serializer: str = JSONSerializer.name):
+        """
+        Initialize the journaled repository.
+
+        Args:
+            file_path: Path to the JSON snapshot file
+            journal_path: Path to the journal file, defaults to file_path + ".journal"
+            compact_every: Number of journal records after which a snapshot is written
+            serializer: Name of the format snapshots are written in
+        """
+        super().__init__(file_path, serializer)
+        self.journal_path = journal_path or file_path + ".journal"
+        self.compact_every = compact_every
+        self.pending_records = 0
+        # Bytes of the journal already applied to the manager this process loaded
+        self._journal_offset = 0
+
+    def record(self, manager: GradeManager, op: str, payload: Dict) -> bool:
+        """
+        Append a mutation to the journal, compacting when the journal is long.
+
+        A failed compaction does not undo the record, which is on disk once
+        appended; it is logged and retried with the next record.
+
+        Returns:
+            True if the record was written, False otherwise
+        """
+        line = json.dumps({"op": op, "args": payload}, separators=(",", ":"))
+        try:
+            with self.lock:
+                # Appending never loses another process's records, but only an
+                # append to data this process has seen keeps it up to date
+                up_to_date = not self.has_changed()
+                with open(self.journal_path, 'a') as f:
+                    f.write(line + "\n")
+                    f.flush()
+                    os.fsync(f.fileno())
+                metrics.REPOSITORY_WRITTEN_BYTES.inc(len(line) + 1, repository=type(self).__name__)
+                if up_to_date:
+                    self._signature = self.signature()
+                    self._journal_offset = os.path.getsize(self.journal_path)
+        except Exception as e:
+            print(f"Error writing journal: {e}")
+            return False
+
+        self.pending_records += 1
+        if self.pending_records >= self.compact_every and not self.save(manager):
+            print("Error compacting journal: the snapshot will be written with a later record")
+        return True
+
+    def save(self, manager: GradeManager) -> bool:
+        """
+        Write a full snapshot and truncate the journal.
+
+        The snapshot is replaced atomically, so a crash leaves either the old
+        snapshot plus the journal or the new snapshot. Replaying the journal
+        onto the new snapshot is harmless because every operation is idempotent.
+
+        Returns:
+            True if saved successfully, False otherwise
+        """
+        with self.lock:
+            if not super().save(manager):
+                return False
+
+            # Only drop the journal once the snapshot is in place
+            try:
+                open(self.journal_path, 'w').close()
+            except Exception as e:
+                print(f"Error truncating journal: {e}")
+                return False
+            self._signature = self.signature()
+            self._journal_offset = 0
+        self.pending_records = 0
+        return True
+
+    def catch_up(self, manager: GradeManager) -> bool:
+        """
+        Apply to manager the records other processes appended since this one
+        last loaded, saved or caught up.
+
+        Returns:
+            True if manager is up to date, False if it must be loaded again
+            because the snapshot was rewritten or the journal is unreadable
+        """
+        with self.lock:
+            # The first element of the signature belongs to the snapshot
+            if self._signature is None or file_signature([self.file_path])[0] != self._signature[0]:
+                return False
+            try:
+                with open(self.journal_path, 'rb') as f:
+                    f.seek(self._journal_offset)
+                    content = f.read()
+            except FileNotFoundError:
+                return False
+            metrics.REPOSITORY_READ_BYTES.inc(len(content), repository=type(self).__name__)
+            # A torn record is left for a full load to deal with
+            if content and not content.endswith(b"\n"):
+                return False
+            try:
+                entries = [json.loads(line) for line in content.splitlines() if line.strip()]
+            except json.JSONDecodeError:
+                return False
+            for entry in entries:
+                manager.apply_operation(entry["op"], entry["args"])
+            self._journal_offset += len(content)
+            self.pending_records += len(entries)
+            self._signature = self.signature()
+            return True
+    
+    def _signature_paths(self) -> List[str]:
+        return [self.file_path, self.journal_path]
+
+    def load(self) -> Optional[GradeManager]:
+        """
+        Load the snapshot and replay the journal on top of it.
+
+        A torn last line, left behind by a crash during an append, is ignored.
+
+        Returns:
+            GradeManager object or None if loading fails
+        """
+        with self.lock:
+            return self._load_and_replay()
+
+    def _load_and_replay(self) -> Optional[GradeManager]:
+        manager = super().load()
+        self._journal_offset = 0
+        if manager is None or not os.path.exists(self.journal_path):
+            return manager
+
+        try:
+            with open(self.journal_path, 'r') as f:
+                lines = f.read().splitlines()
+            self._journal_offset = os.path.getsize(self.journal_path)
+            metrics.REPOSITORY_READ_BYTES.inc(self._journal_offset, repository=type(self).__name__)
+        except Exception as e:
+            print(f"Error reading journal: {e}")
+            return None
+
+        for number, line in enumerate(lines, 1):
+            if not line.strip():
+                continue
+            try:
+                entry = json.loads(line)
+            except json.JSONDecodeError:
+                if number < len(lines):
+                    print(f"Error loading data: corrupt journal record on line {number}")
+                    return None
+                # Drop the torn record so later appends start on a clean line
+                lines.pop()
+                with open(self.journal_path, 'w') as f:
+                    f.write("".join(l + "\n" for l in lines))
+                self._signature = self.signature()
+                self._journal_offset = os.path.getsize(self.journal_path)
+                break
+            manager.apply_operation(entry["op"], entry["args"])
+
+        self.pending_records = len(lines)
+        return manager
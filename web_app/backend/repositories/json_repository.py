@@ -1,20 +1,53 @@
 import os
-import json
-from typing import Optional
+from typing import Dict, List, Optional, Tuple
 from pathlib import Path
 from models.domain_models import GradeManager
+from repositories.file_lock import FileLock, file_signature
+from repositories.serializers import JSONSerializer, get_serializer, is_binary_snapshot, read_snapshot
+from repositories.streaming_loader import stream_load
+from services import metrics
+
+def write_atomic(path: str, content: bytes) -> None:
+    """
+    Replace a file with content without ever exposing a partial file.
+    
+    The content is written to a temporary file in the same directory, flushed
+    to disk and renamed over the target.
+    """
+    tmp_path = path + ".tmp"
+    with open(tmp_path, 'wb') as f:
+        f.write(content)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
 
 class JSONRepository:
-    """Repository for storing and retrieving data using JSON files."""
+    """
+    Repository for storing and retrieving data using JSON files.
+    
+    The file format is chosen by a serializer: indented JSON by default, or
+    compact JSON, orjson or a binary msgpack snapshot. Loading detects the
+    format of the existing file, so the format can be switched at any time.
+    
+    Several processes can share the file. Loads and saves hold a lock file
+    next to it, and save() refuses to overwrite a file another process has
+    written since this one last loaded or saved it, instead of silently
+    dropping the other process's changes.
+    """
     
-    def __init__(self, file_path: str = "data/grade_data.json"):
+    def __init__(self, file_path: str = "data/grade_data.json", serializer: str = JSONSerializer.name):
         """
         Initialize the JSON repository.
         
         Args:
             file_path: Path to the JSON file
+            serializer: Name of the format files are written in (see repositories.serializers)
         """
         self.file_path = file_path
+        self.serializer = get_serializer(serializer)
+        self.lock = FileLock(file_path + ".lock")
+        # Signature of the files as this process last loaded or saved them
+        self._signature: Optional[Tuple] = None
         
         # Ensure the directory exists
         directory = os.path.dirname(file_path)
@@ -25,6 +58,10 @@ class JSONRepository:
         """
         Save the GradeManager data to a JSON file.
         
+        The file is replaced atomically, so a crash leaves the previous version.
+        The save is rejected if another process changed the file since it was
+        loaded; reload and apply the change again in that case.
+        
         Args:
             manager: GradeManager object to save
             
@@ -32,32 +69,91 @@ class JSONRepository:
             True if saved successfully, False otherwise
         """
         try:
-            data = manager.to_dict()
-            
-            with open(self.file_path, 'w') as f:
-                json.dump(data, f, indent=4)
+            with self.lock:
+                if self.has_changed():
+                    print("Error saving data: the data was changed by another process since it was loaded")
+                    return False
+                with metrics.SERIALIZATION_SECONDS.time(operation="to_dict"):
+                    data = manager.to_dict()
+                content = self.serializer.dumps(data)
+                self._write_atomic(content)
+                metrics.REPOSITORY_WRITTEN_BYTES.inc(len(content), repository=type(self).__name__)
+                self._signature = self.signature()
             return True
         except Exception as e:
             print(f"Error saving data: {e}")
             return False
     
+    def _write_atomic(self, content: bytes) -> None:
+        """Replace the data file with content without ever exposing a partial file."""
+        write_atomic(self.file_path, content)
+    
+    def _signature_paths(self) -> List[str]:
+        return [self.file_path]
+    
+    def signature(self) -> Tuple:
+        """Current signature of the data files (see repositories.file_lock.file_signature)."""
+        return file_signature(self._signature_paths())
+    
+    def has_changed(self) -> bool:
+        """
+        Check whether the data was written by someone else since this process
+        last loaded or saved it; a stat() of the data files.
+        
+        Always False before the first load or save.
+        """
+        return self._signature is not None and self._signature != self.signature()
+    
+    def record(self, manager: GradeManager, op: str, payload: Dict) -> bool:
+        """
+        Persist a single mutation that has already been applied to the manager.
+        
+        The plain JSON repository has no cheaper option than rewriting the file.
+        
+        Args:
+            manager: GradeManager the mutation was applied to
+            op: Operation name understood by GradeManager.apply_operation
+            payload: Arguments of the operation
+            
+        Returns:
+            True if persisted successfully, False otherwise
+        """
+        return self.save(manager)
+    
     def load(self) -> Optional[GradeManager]:
         """
         Load GradeManager data from a JSON file.
         
+        JSON files are streamed section by section, so the whole document is
+        never held in memory next to the entities built from it. Binary
+        snapshots are decoded in one go.
+        
         Returns:
             GradeManager object or None if loading fails
         """
-        if not os.path.exists(self.file_path):
-            # Return a new manager if the file doesn't exist
-            return GradeManager()
-        
-        try:
-            with open(self.file_path, 'r') as f:
-                data = json.load(f)
+        with self.lock:
+            # Taken before reading, so a write racing the load shows up as a change
+            signature = self.signature()
+            if not os.path.exists(self.file_path):
+                # Return a new manager if the file doesn't exist
+                self._signature = signature
+                return GradeManager()
             
-            manager = GradeManager.from_dict(data)
+            try:
+                if is_binary_snapshot(self.file_path):
+                    data = read_snapshot(self.file_path)
+                    with metrics.SERIALIZATION_SECONDS.time(operation="from_dict"):
+                        manager = GradeManager.from_dict(data)
+                else:
+                    with metrics.SERIALIZATION_SECONDS.time(operation="stream_load"):
+                        manager = stream_load(self.file_path)
+            except Exception as e:
+                print(f"Error loading data: {e}")
+                return None
+            metrics.REPOSITORY_READ_BYTES.inc(os.path.getsize(self.file_path), repository=type(self).__name__)
+            self._signature = signature
             return manager
-        except Exception as e:
-            print(f"Error loading data: {e}")
-            return None
\ No newline at end of file
+    
+    def close(self) -> None:
+        """Release the lock file."""
+        self.lock.close()
\ No newline at end of file
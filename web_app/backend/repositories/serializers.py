@@ -0,0 +1,134 @@
+import json
+from typing import Dict, List
+
+try:
+    import orjson
+except ImportError:  # orjson is optional; the stdlib json module is used without it
+    orjson = None
+
+try:
+    import msgpack
+except ImportError:  # msgpack is optional; the binary format is unavailable without it
+    msgpack = None
+
+# Binary snapshots start with this header so they are told apart from JSON on load
+MSGPACK_MAGIC = b"\x89GRADES-MSGPACK\x01"
+
+class Serializer:
+    """
+    Turns the dictionary from GradeManager.to_dict into file contents and back.
+
+    Subclasses set name, used to select them, and implement dumps/loads.
+    """
+
+    name = ""
+
+    @staticmethod
+    def is_available() -> bool:
+        """Check whether the libraries this format needs are installed."""
+        return True
+
+    def dumps(self, data: Dict) -> bytes:
+        raise NotImplementedError
+
+    def loads(self, content: bytes) -> Dict:
+        raise NotImplementedError
+
+
+class JSONSerializer(Serializer):
+    """Indented JSON written by the stdlib json module, the original format."""
+
+    name = "json"
+
+    def dumps(self, data: Dict) -> bytes:
+        return json.dumps(data, indent=4).encode("utf-8")
+
+    def loads(self, content: bytes) -> Dict:
+        # Any JSON file parses faster with orjson when it is installed
+        if orjson is not None:
+            return orjson.loads(content)
+        return json.loads(content)
+
+
+class CompactJSONSerializer(JSONSerializer):
+    """JSON without indentation or spaces after separators."""
+
+    name = "json-compact"
+
+    def dumps(self, data: Dict) -> bytes:
+        return json.dumps(data, separators=(",", ":")).encode("utf-8")
+
+
+class OrjsonSerializer(JSONSerializer):
+    """Compact JSON written by orjson, which is several times faster than json."""
+
+    name = "orjson"
+
+    @staticmethod
+    def is_available() -> bool:
+        return orjson is not None
+
+    def dumps(self, data: Dict) -> bytes:
+        return orjson.dumps(data)
+
+
+class MsgpackSerializer(Serializer):
+    """Binary MessagePack snapshot behind a magic header."""
+
+    name = "msgpack"
+
+    @staticmethod
+    def is_available() -> bool:
+        return msgpack is not None
+
+    def dumps(self, data: Dict) -> bytes:
+        return MSGPACK_MAGIC + msgpack.packb(data, use_bin_type=True)
+
+    def loads(self, content: bytes) -> Dict:
+        return msgpack.unpackb(content[len(MSGPACK_MAGIC):], raw=False)
+
+
+SERIALIZERS: Dict[str, Serializer] = {
+    serializer.name: serializer
+    for serializer in (JSONSerializer(), CompactJSONSerializer(), OrjsonSerializer(), MsgpackSerializer())
+}
+
+def available_serializers() -> List[str]:
+    """Names of the formats that can be written with the installed libraries."""
+    return [name for name, serializer in SERIALIZERS.items() if serializer.is_available()]
+
+def get_serializer(name: str) -> Serializer:
+    """
+    Get a serializer by name.
+
+    Raises:
+        ValueError: If the format is unknown or its library is not installed
+    """
+    serializer = SERIALIZERS.get(name)
+    if serializer is None:
+        raise ValueError(f"Unknown serializer: {name}")
+    if not serializer.is_available():
+        raise ValueError(f"Serializer {name} needs a library that is not installed")
+    return serializer
+
+def detect_serializer(content: bytes) -> Serializer:
+    """
+    Pick the serializer able to read file contents, whichever format wrote them.
+
+    Raises:
+        ValueError: If the contents are a binary snapshot and msgpack is not installed
+    """
+    if content.startswith(MSGPACK_MAGIC):
+        return get_serializer(MsgpackSerializer.name)
+    return SERIALIZERS[JSONSerializer.name]
+
+def is_binary_snapshot(path: str) -> bool:
+    """Check whether a data file holds a binary snapshot rather than JSON."""
+    with open(path, 'rb') as f:
+        return f.read(len(MSGPACK_MAGIC)) == MSGPACK_MAGIC
+
+def read_snapshot(path: str) -> Dict:
+    """Read and decode a data file in any supported format."""
+    with open(path, 'rb') as f:
+        content = f.read()
+    return detect_serializer(content).loads(content)
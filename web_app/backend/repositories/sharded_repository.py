@@ -0,0 +1,287 @@
+import os
+import json
+import zlib
+from typing import Dict, List, Optional, Set, Tuple
+from models.domain_models import GradeManager, Student
+from repositories.file_lock import FileLock, file_signature
+from repositories.json_repository import write_atomic
+from repositories.serializers import JSONSerializer, get_serializer, read_snapshot
+from services import metrics
+
+MANIFEST = "manifest.json"
+COURSES_FILE = "courses"
+ENROLLMENTS_FILE = "enrollments"
+LOCK_FILE = "lock"
+
+def shard_of(student_id: str, num_shards: int) -> int:
+    """Shard a student belongs to; a stable hash, unlike the builtin hash()."""
+    return zlib.crc32(student_id.encode("utf-8")) % num_shards
+
+class ShardedJSONRepository:
+    """
+    Repository that spreads the data over several files in one directory.
+
+    Students and their grades are partitioned into num_shards shard files
+    by a hash of the student id; courses and enrollments each have their own
+    file. A manifest records the number of shards the data was written with.
+
+    The repository follows the mutations of the manager it loaded or last
+    saved, so a save only rewrites the files touched since the previous one:
+    a grade change rewrites one shard, a registration the enrollments file.
+
+    Like JSONRepository, loads and saves hold a lock file in the directory
+    and a save is rejected if another process wrote any of the files since
+    this one last loaded or saved them.
+    """
+
+    def __init__(self, directory: str = "data/shards", num_shards: int = 16,
+                 serializer: str = JSONSerializer.name):
+        """
+        Initialize the sharded repository.
+
+        Args:
+            directory: Directory holding the manifest and the data files
+            num_shards: Number of student shards for a new directory; an existing
+                manifest takes precedence (see reshard.py to change it)
+            serializer: Name of the format files are written in
+        """
+        self.directory = directory
+        self.serializer = get_serializer(serializer)
+        os.makedirs(directory, exist_ok=True)
+        self.lock = FileLock(os.path.join(directory, LOCK_FILE))
+        self._signature: Optional[Tuple] = None
+
+        manifest_shards = self._read_manifest()
+        self.num_shards = manifest_shards or num_shards
+        if manifest_shards is None:
+            self._write_manifest()
+
+        self._shard_students: List[Set[str]] = [set() for _ in range(num_shards)]
+        self._tracked: Optional[GradeManager] = None
+        self._dirty_shards: Set[int] = set()
+        self._courses_dirty = False
+        self._enrollments_dirty = False
+
+    def _path(self, name: str) -> str:
+        return os.path.join(self.directory, name)
+
+    def _shard_name(self, shard: int) -> str:
+        # The shard count is part of the name, so resharding never overwrites live files
+        return f"students-{shard:04d}-of-{self.num_shards:04d}"
+
+    ### Following the manager
+
+    def _track(self, manager: GradeManager) -> None:
+        """Start following the mutations of manager, dropping any previous one."""
+        if self._tracked is manager:
+            return
+        if self._tracked is not None:
+            self._tracked.remove_listener(self._on_change)
+        self._tracked = manager
+        self._shard_students = [set() for _ in range(self.num_shards)]
+        for student in manager.get_all_students():
+            self._shard_students[shard_of(student.student_id, self.num_shards)].add(student.student_id)
+        self._dirty_shards = set()
+        self._courses_dirty = self._enrollments_dirty = False
+        manager.add_listener(self._on_change)
+
+    def _on_change(self, op: str, payload: Dict) -> None:
+        if op in ("add_student", "assign_grade"):
+            shard = shard_of(payload["student_id"], self.num_shards)
+            self._shard_students[shard].add(payload["student_id"])
+            self._dirty_shards.add(shard)
+        elif op == "add_course":
+            self._courses_dirty = self._enrollments_dirty = True
+        elif op == "register":
+            self._enrollments_dirty = True
+
+    ### Repository interface
+
+    def save(self, manager: GradeManager) -> bool:
+        """
+        Persist the GradeManager, rewriting only the files that changed.
+
+        The first save of a manager this repository is not following yet
+        writes every file.
+
+        Returns:
+            True if saved successfully, False otherwise
+        """
+        try:
+            with self.lock:
+                if self.has_changed():
+                    print("Error saving data: the data was changed by another process since it was loaded")
+                    return False
+                self._save_dirty(manager)
+                self._signature = self.signature()
+            return True
+        except Exception as e:
+            print(f"Error saving data: {e}")
+            return False
+
+    def _save_dirty(self, manager: GradeManager) -> None:
+        if self._tracked is not manager:
+            self._track(manager)
+            self._dirty_shards = set(range(self.num_shards))
+            self._courses_dirty = self._enrollments_dirty = True
+
+        for shard in sorted(self._dirty_shards):
+            students = {}
+            for sid in self._shard_students[shard]:
+                student = manager.get_student(sid)
+                if student is not None:
+                    students[sid] = student.to_dict()
+            self._write(self._shard_name(shard), {"students": students})
+            self._dirty_shards.discard(shard)
+
+        data = None
+        if self._courses_dirty or self._enrollments_dirty:
+            with metrics.SERIALIZATION_SECONDS.time(operation="to_dict"):
+                data = manager.to_dict(include_students=False)
+        if self._courses_dirty:
+            self._write(COURSES_FILE, {"courses": data["courses"]})
+            self._courses_dirty = False
+        if self._enrollments_dirty:
+            self._write(ENROLLMENTS_FILE, {"enrollments": data["enrollments"]})
+            self._enrollments_dirty = False
+
+    def record(self, manager: GradeManager, op: str, payload: Dict) -> bool:
+        """
+        Persist a single mutation that has already been applied to the manager.
+
+        Only the file holding the changed student, the courses or the
+        enrollments is rewritten.
+
+        Returns:
+            True if persisted successfully, False otherwise
+        """
+        return self.save(manager)
+
+    def load(self) -> Optional[GradeManager]:
+        """
+        Load all shards into a GradeManager and start following it.
+
+        The shard count is read from the manifest again, so data resharded
+        by another process is loaded with its new layout. A directory without
+        any data files loads as empty; one missing only some of them fails.
+
+        Returns:
+            GradeManager object or None if loading fails
+        """
+        manager = GradeManager()
+        with self.lock:
+            try:
+                manifest_shards = self._read_manifest()
+            except Exception as e:
+                print(f"Error loading data: {e}")
+                return None
+            if manifest_shards is not None and manifest_shards != self.num_shards:
+                self._untrack()
+                self.num_shards = manifest_shards
+            signature = self.signature()
+            names = [COURSES_FILE, ENROLLMENTS_FILE] + [self._shard_name(s) for s in range(self.num_shards)]
+            missing = [name for name in names if not os.path.exists(self._path(name))]
+            if missing and len(missing) < len(names):
+                print(f"Error loading data: missing data file {self._path(missing[0])}")
+                return None
+            try:
+                courses = self._read(COURSES_FILE)
+                for course_data in courses.get("courses", {}).values():
+                    manager._load_course(course_data)
+                for shard in range(self.num_shards):
+                    for student_data in self._read(self._shard_name(shard)).get("students", {}).values():
+                        manager._load_student(student_data)
+                for course_code, student_ids in self._read(ENROLLMENTS_FILE).get("enrollments", {}).items():
+                    manager._load_enrollments(course_code, student_ids)
+                manager._finish_load()
+            except Exception as e:
+                print(f"Error loading data: {e}")
+                return None
+
+            self._signature = signature
+            self._track(manager)
+            return manager
+
+    def reshard(self, manager: GradeManager, num_shards: int) -> bool:
+        """
+        Rewrite all data with a different number of shards.
+
+        The new shard files are written under their own names before the
+        manifest is switched over, so a failure leaves the old layout intact.
+
+        Returns:
+            True if resharded successfully, False otherwise
+        """
+        with self.lock:
+            old_count, old_names = self.num_shards, {self._shard_name(s) for s in range(self.num_shards)}
+            self._untrack()
+            self.num_shards = num_shards
+            if not self.save(manager):
+                self._untrack()
+                self.num_shards = old_count
+                return False
+
+            try:
+                self._write_manifest()
+                for name in old_names - {self._shard_name(s) for s in range(num_shards)}:
+                    if os.path.exists(self._path(name)):
+                        os.remove(self._path(name))
+                self._signature = self.signature()
+                return True
+            except Exception as e:
+                print(f"Error saving data: {e}")
+                return False
+
+    def get_student(self, student_id: str) -> Optional[Student]:
+        """Get a student and their grades by ID, reading only their shard."""
+        data = self._read(self._shard_name(shard_of(student_id, self.num_shards)))
+        student_data = data.get("students", {}).get(student_id)
+        return Student.from_dict(student_data) if student_data else None
+
+    def signature(self) -> Tuple:
+        """Current signature of the data files (see repositories.file_lock.file_signature)."""
+        names = [MANIFEST, COURSES_FILE, ENROLLMENTS_FILE]
+        names.extend(self._shard_name(shard) for shard in range(self.num_shards))
+        return file_signature(self._path(name) for name in names)
+
+    def has_changed(self) -> bool:
+        """
+        Check whether any file was written by someone else since this process
+        last loaded or saved; always False before the first load or save.
+        """
+        return self._signature is not None and self._signature != self.signature()
+
+    def close(self) -> None:
+        """Stop following the manager's mutations and release the lock file."""
+        self._untrack()
+        self.lock.close()
+
+    def _untrack(self) -> None:
+        if self._tracked is not None:
+            self._tracked.remove_listener(self._on_change)
+            self._tracked = None
+
+    ### Files
+
+    def _read(self, name: str) -> Dict:
+        path = self._path(name)
+        if not os.path.exists(path):
+            return {}
+        metrics.REPOSITORY_READ_BYTES.inc(os.path.getsize(path), repository=type(self).__name__)
+        return read_snapshot(path)
+
+    def _write(self, name: str, data: Dict) -> None:
+        content = self.serializer.dumps(data)
+        write_atomic(self._path(name), content)
+        metrics.REPOSITORY_WRITTEN_BYTES.inc(len(content), repository=type(self).__name__)
+
+    def _read_manifest(self) -> Optional[int]:
+        """Shard count recorded in the manifest, or None if there is no manifest yet."""
+        path = self._path(MANIFEST)
+        if not os.path.exists(path):
+            return None
+        with open(path, 'r') as f:
+            return json.load(f)["num_shards"]
+
+    def _write_manifest(self) -> None:
+        write_atomic(self._path(MANIFEST), json.dumps({"num_shards": self.num_shards}).encode("utf-8"))
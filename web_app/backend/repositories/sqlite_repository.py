@@ -0,0 +1,354 @@
+import os
+import sqlite3
+import threading
+from itertools import groupby
+from typing import Dict, List, Optional, Tuple
+from models.domain_models import GradeManager, Student, Course, DEFAULT_SCALE
+from repositories.file_lock import FileLock
+from repositories.serializers import read_snapshot
+from services import metrics
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS students (
+    student_id TEXT PRIMARY KEY,
+    student_name TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS courses (
+    course_code TEXT PRIMARY KEY,
+    course_name TEXT NOT NULL,
+    grading_scale TEXT NOT NULL DEFAULT 'standard'
+);
+CREATE TABLE IF NOT EXISTS enrollments (
+    course_code TEXT NOT NULL,
+    student_id TEXT NOT NULL,
+    UNIQUE (course_code, student_id)
+);
+CREATE INDEX IF NOT EXISTS idx_enrollments_student ON enrollments (student_id);
+CREATE TABLE IF NOT EXISTS grades (
+    student_id TEXT NOT NULL,
+    course_code TEXT NOT NULL,
+    grade REAL NOT NULL,
+    UNIQUE (student_id, course_code)
+);
+CREATE INDEX IF NOT EXISTS idx_grades_course ON grades (course_code);
+"""
+
+# Statement and parameter fields persisting each GradeManager operation; all of them
+# are upserts, so applying one twice or next to another process's rows is harmless
+UPSERTS = {
+    "add_student": ("INSERT OR IGNORE INTO students VALUES (?, ?)",
+                    ("student_id", "student_name")),
+    "add_course": ("INSERT OR IGNORE INTO courses VALUES (?, ?, ?)",
+                   ("course_code", "course_name", "grading_scale")),
+    "register": ("INSERT OR IGNORE INTO enrollments VALUES (?, ?)",
+                 ("course_code", "student_id")),
+    "assign_grade": ("INSERT INTO grades VALUES (?, ?, ?) "
+                     "ON CONFLICT (student_id, course_code) DO UPDATE SET grade = excluded.grade",
+                     ("student_id", "course_code", "grade")),
+}
+# Records written before grading scales existed leave the scale out
+DEFAULTS = {"grading_scale": DEFAULT_SCALE}
+
+def upsert_params(fields: Tuple[str, ...], payload: Dict) -> Tuple:
+    return tuple(payload[field] if field in payload else DEFAULTS[field] for field in fields)
+
+class SQLiteRepository:
+    """
+    Repository for storing and retrieving data in a SQLite database.
+
+    Offers the same load/save/record interface as JSONRepository. Like the
+    sharded repository it follows the mutations of the manager it loaded or
+    last saved: record() and save() write just the mutations made since, as
+    upserts in one executemany() per run of operations, so a bulk upload
+    costs its own rows rather than a rewrite of the database. Only a
+    manager the repository is not following yet is written by replacing
+    everything.
+
+    The query methods answer common lookups straight from the database
+    without loading everything into a GradeManager. The API does not use
+    them, since it serves reads from the loaded GradeManager; they are for
+    tools and benchmarks reading a database (see bench_sqlite_vs_json).
+
+    SQLite already serializes writers across processes and the upserts
+    never undo another process's rows, but like JSONRepository save() is
+    rejected when another process committed since the data was loaded.
+    """
+
+    def __init__(self, file_path: str = "data/grade_data.db"):
+        """
+        Initialize the SQLite repository and create the schema if needed.
+
+        Args:
+            file_path: Path to the SQLite database file
+        """
+        self.file_path = file_path
+
+        # Ensure the directory exists
+        directory = os.path.dirname(file_path)
+        if directory and not os.path.exists(directory):
+            os.makedirs(directory)
+
+        self._lock = threading.Lock()
+        # Serializes read-modify-write sequences across processes (see DataService.transaction)
+        self.lock = FileLock(file_path + ".lock")
+        self._signature: Optional[int] = None
+        self._conn = sqlite3.connect(file_path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript(SCHEMA)
+        self._migrate()
+        # A connection of its own for signature(), so checking for changes on the
+        # event loop never waits for a save holding _lock; it counts the commits
+        # of _conn as changes too, so the signature is taken again after each one
+        self._watch = sqlite3.connect(file_path, check_same_thread=False)
+        self._watch_lock = threading.Lock()
+        self._tracked: Optional[GradeManager] = None
+        self._pending: List[Tuple[str, Dict]] = []
+
+    def _migrate(self) -> None:
+        """Add columns introduced after a database was first created."""
+        columns = {row[1] for row in self._conn.execute("PRAGMA table_info(courses)")}
+        if "grading_scale" not in columns:
+            with self._conn:
+                self._conn.execute(
+                    f"ALTER TABLE courses ADD COLUMN grading_scale TEXT NOT NULL DEFAULT '{DEFAULT_SCALE}'")
+
+    def close(self) -> None:
+        """Stop following the manager's mutations and close the database connections."""
+        self._untrack()
+        self._conn.close()
+        self._watch.close()
+        self.lock.close()
+
+    def signature(self) -> int:
+        """Data version of the database, which changes whenever anyone commits."""
+        with self._watch_lock:
+            return self._watch.execute("PRAGMA data_version").fetchone()[0]
+
+    def has_changed(self) -> bool:
+        """
+        Check whether another process committed since this one last loaded or
+        saved; always False before the first load or save.
+        """
+        return self._signature is not None and self._signature != self.signature()
+
+    def save(self, manager: GradeManager) -> bool:
+        """
+        Persist the GradeManager data.
+
+        The mutations made since the manager was loaded or last saved are
+        upserted; a manager this repository is not following yet replaces
+        the database contents.
+
+        Args:
+            manager: GradeManager object to save
+
+        Returns:
+            True if saved successfully, False otherwise
+        """
+        try:
+            with self.lock:
+                if self.has_changed():
+                    print("Error saving data: the data was changed by another process since it was loaded")
+                    return False
+                if manager is not None and self._tracked is manager:
+                    self._write_pending()
+                else:
+                    with metrics.SERIALIZATION_SECONDS.time(operation="to_dict"):
+                        data = manager.to_dict()
+                    self._replace_all(data)
+                    self._track(manager)
+                self._signature = self.signature()
+            return True
+        except Exception as e:
+            print(f"Error saving data: {e}")
+            return False
+
+    def record(self, manager: GradeManager, op: str, payload: Dict) -> bool:
+        """
+        Persist a single mutation that has already been applied to the manager.
+
+        Args:
+            manager: GradeManager the mutation was applied to
+            op: Operation name understood by GradeManager.apply_operation
+            payload: Arguments of the operation
+
+        Returns:
+            True if persisted successfully, False otherwise
+        """
+        if op not in UPSERTS:
+            print(f"Error saving data: unknown operation {op}")
+            return False
+
+        try:
+            with self.lock:
+                # Only a write to data this process has seen keeps it up to date
+                up_to_date = not self.has_changed()
+                if manager is not None and self._tracked is manager:
+                    # Also writes mutations an earlier failed record() left behind
+                    self._write_pending()
+                else:
+                    sql, fields = UPSERTS[op]
+                    with self._lock, self._conn:
+                        self._conn.execute(sql, upsert_params(fields, payload))
+                if up_to_date:
+                    self._signature = self.signature()
+            return True
+        except Exception as e:
+            print(f"Error saving data: {e}")
+            return False
+
+    def _write_pending(self) -> None:
+        """Upsert the mutations of the followed manager that are not written yet."""
+        pending, self._pending = self._pending, []
+        try:
+            with self._lock, self._conn:
+                for op, entries in groupby(pending, key=lambda entry: entry[0]):
+                    sql, fields = UPSERTS[op]
+                    self._conn.executemany(sql, (upsert_params(fields, payload) for _, payload in entries))
+        except Exception:
+            # Kept for the next attempt; the transaction rolled back
+            self._pending = pending + self._pending
+            raise
+
+    def _track(self, manager: GradeManager) -> None:
+        """Start following the mutations of manager, dropping any previous one."""
+        self._untrack()
+        self._tracked = manager
+        self._pending = []
+        manager.add_listener(self._on_change)
+
+    def _untrack(self) -> None:
+        if self._tracked is not None:
+            self._tracked.remove_listener(self._on_change)
+            self._tracked = None
+        self._pending = []
+
+    def _on_change(self, op: str, payload: Dict) -> None:
+        self._pending.append((op, payload))
+
+    def load(self) -> Optional[GradeManager]:
+        """
+        Load all data into a GradeManager and start following it.
+
+        Returns:
+            GradeManager object or None if loading fails
+        """
+        try:
+            with self.lock, self._lock:
+                signature = self.signature()
+                students = {
+                    sid: {"student_id": sid, "student_name": name, "grades": {}}
+                    for sid, name in self._conn.execute(
+                        "SELECT student_id, student_name FROM students ORDER BY rowid")
+                }
+                courses = {
+                    code: {"course_code": code, "course_name": name, "grading_scale": scale}
+                    for code, name, scale in self._conn.execute(
+                        "SELECT course_code, course_name, grading_scale FROM courses ORDER BY rowid")
+                }
+                enrollments = {code: [] for code in courses}
+                for code, sid in self._conn.execute(
+                        "SELECT course_code, student_id FROM enrollments ORDER BY rowid"):
+                    enrollments.setdefault(code, []).append(sid)
+                for sid, code, grade in self._conn.execute(
+                        "SELECT student_id, course_code, grade FROM grades ORDER BY rowid"):
+                    if sid in students:
+                        students[sid]["grades"][code] = grade
+
+            with metrics.SERIALIZATION_SECONDS.time(operation="from_dict"):
+                manager = GradeManager.from_dict({
+                    "students": students,
+                    "courses": courses,
+                    "enrollments": enrollments
+                })
+            self._signature = signature
+            self._track(manager)
+            return manager
+        except Exception as e:
+            print(f"Error loading data: {e}")
+            return None
+
+    def import_json(self, json_path: str) -> bool:
+        """
+        Bulk import a grade_data.json file, replacing the database contents.
+
+        Args:
+            json_path: Path to a file written by JSONRepository, in any of its formats
+
+        Returns:
+            True if imported successfully, False otherwise
+        """
+        try:
+            self._untrack()
+            self._replace_all(read_snapshot(json_path))
+            return True
+        except Exception as e:
+            print(f"Error importing data: {e}")
+            return False
+
+    def _replace_all(self, data: Dict) -> None:
+        students = data.get("students", {}).values()
+        with self._lock, self._conn:
+            for table in ("students", "courses", "enrollments", "grades"):
+                self._conn.execute(f"DELETE FROM {table}")
+            self._conn.executemany(
+                "INSERT INTO students VALUES (?, ?)",
+                ((s["student_id"], s["student_name"]) for s in students))
+            self._conn.executemany(
+                "INSERT INTO courses VALUES (?, ?, ?)",
+                ((c["course_code"], c["course_name"], c.get("grading_scale", DEFAULT_SCALE))
+                 for c in data.get("courses", {}).values()))
+            self._conn.executemany(
+                "INSERT OR IGNORE INTO enrollments VALUES (?, ?)",
+                ((code, sid) for code, sids in data.get("enrollments", {}).items() for sid in sids))
+            self._conn.executemany(
+                "INSERT INTO grades VALUES (?, ?, ?)",
+                ((s["student_id"], code, grade) for s in students for code, grade in s["grades"].items()))
+
+    ### Indexed queries
+
+    def get_student(self, student_id: str) -> Optional[Student]:
+        """Get a student and their grades by ID."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT student_name FROM students WHERE student_id = ?", (student_id,)).fetchone()
+            if row is None:
+                return None
+            student = Student(student_id, row[0])
+            for code, grade in self._conn.execute(
+                    "SELECT course_code, grade FROM grades WHERE student_id = ? ORDER BY rowid", (student_id,)):
+                student.add_grade(code, grade)
+        return student
+
+    def get_course(self, course_code: str) -> Optional[Course]:
+        """Get a course by its code."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT course_name, grading_scale FROM courses WHERE course_code = ?", (course_code,)).fetchone()
+        return Course(course_code, row[0], row[1]) if row else None
+
+    def get_course_students(self, course_code: str) -> List[Student]:
+        """Get all students enrolled in a course, with their grade for that course."""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT s.student_id, s.student_name, g.grade FROM enrollments e "
+                "JOIN students s ON s.student_id = e.student_id "
+                "LEFT JOIN grades g ON g.student_id = e.student_id AND g.course_code = e.course_code "
+                "WHERE e.course_code = ? ORDER BY e.rowid", (course_code,)).fetchall()
+
+        students = []
+        for sid, name, grade in rows:
+            student = Student(sid, name)
+            if grade is not None:
+                student.add_grade(course_code, grade)
+            students.append(student)
+        return students
+
+    def calculate_course_average(self, course_code: str) -> Optional[float]:
+        """Calculate the average grade of the enrolled students of a course."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT AVG(g.grade) FROM enrollments e "
+                "JOIN grades g ON g.student_id = e.student_id AND g.course_code = e.course_code "
+                "WHERE e.course_code = ?", (course_code,)).fetchone()
+        return row[0]
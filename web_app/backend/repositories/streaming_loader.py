@@ -0,0 +1,128 @@
+import json
+import re
+from typing import Any, Iterator, Tuple
+from models.domain_models import GradeManager
+
+# Characters read from the file at a time
+CHUNK_SIZE = 1 << 20
+WHITESPACE = re.compile(r"[ \t\n\r]*")
+
+class JSONStreamReader:
+    """
+    Reads a JSON document whose top level is an object of objects, one
+    member at a time.
+
+    Only a window of the file is held in memory. Each member of a section
+    (a student, a course, a roster) is decoded on its own with the stdlib
+    decoder, so its raw dictionary can be dropped as soon as it is used.
+    """
+
+    def __init__(self, f, chunk_size: int = CHUNK_SIZE):
+        self._file = f
+        self._chunk_size = chunk_size
+        self._buffer = ""
+        self._pos = 0
+        self._eof = False
+        self._decoder = json.JSONDecoder()
+
+    def _fill(self) -> bool:
+        """Read another chunk, dropping what was consumed; False at end of file."""
+        if self._eof:
+            return False
+        chunk = self._file.read(self._chunk_size)
+        self._buffer = self._buffer[self._pos:] + chunk
+        self._pos = 0
+        self._eof = not chunk
+        return bool(chunk)
+
+    def _peek(self) -> str:
+        """Skip whitespace and return the next character, or "" at end of file."""
+        while True:
+            self._pos = WHITESPACE.match(self._buffer, self._pos).end()
+            if self._pos < len(self._buffer) or not self._fill():
+                return self._buffer[self._pos:self._pos + 1]
+
+    def _expect(self, char: str) -> None:
+        if self._peek() != char:
+            raise ValueError(f"Expected {char!r} in JSON stream")
+        self._pos += 1
+
+    def _value(self) -> Any:
+        """Decode the next complete value, reading more of the file as needed."""
+        self._peek()
+        while True:
+            try:
+                value, end = self._decoder.raw_decode(self._buffer, self._pos)
+                # A number running into the end of the buffer may continue in the next chunk
+                if end < len(self._buffer) or self._eof:
+                    self._pos = end
+                    return value
+            except json.JSONDecodeError:
+                if self._eof:
+                    raise
+            self._fill()
+
+    def _keys(self) -> Iterator[str]:
+        """
+        Walk the keys of the object starting at the current position.
+
+        The value of each key must be consumed before asking for the next key.
+        """
+        self._expect("{")
+        if self._peek() == "}":
+            self._pos += 1
+            return
+        while True:
+            key = self._value()
+            self._expect(":")
+            yield key
+            if self._peek() == ",":
+                self._pos += 1
+                continue
+            self._expect("}")
+            return
+
+    def sections(self) -> Iterator[Tuple[str, Iterator[Tuple[str, Any]]]]:
+        """
+        Yield (section name, members) for every top-level key.
+
+        members yields the (key, value) pairs of the section one at a time
+        and must be consumed before moving on to the next section.
+        """
+        for name in self._keys():
+            yield name, self._section_members()
+        if self._peek():
+            raise ValueError("Unexpected data after the JSON document")
+
+    def _section_members(self) -> Iterator[Tuple[str, Any]]:
+        if self._peek() != "{":
+            # Not a section of keyed members; skip the value
+            self._value()
+            return
+        for key in self._keys():
+            yield key, self._value()
+
+def stream_load(path: str) -> GradeManager:
+    """
+    Build a GradeManager from a JSON data file section by section.
+
+    Peak memory stays close to that of the loaded entities because the
+    whole document is never held as one dictionary.
+
+    Raises:
+        ValueError: If the file is not a valid data file
+    """
+    manager = GradeManager()
+    loaders = {
+        "students": lambda key, value: manager._load_student(value),
+        "courses": lambda key, value: manager._load_course(value),
+        "enrollments": manager._load_enrollments,
+    }
+    with open(path, 'r', encoding="utf-8") as f:
+        for name, members in JSONStreamReader(f).sections():
+            load = loaders.get(name)
+            for key, value in members:
+                if load:
+                    load(key, value)
+    manager._finish_load()
+    return manager
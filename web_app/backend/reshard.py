@@ -0,0 +1,41 @@
+"""
+Write grade data into a sharded directory with a given number of shards.
+
+The source is either a single data file (JSONRepository, any format) or an
+existing shard directory, which may be the target itself. New shard files
+are written before the manifest is switched over, so an interrupted run
+leaves the previous layout intact. Usage (from web_app/backend):
+
+    python reshard.py data/grade_data.json data/shards 16
+    python reshard.py data/shards data/shards 64
+"""
+import os
+import sys
+import time
+from repositories.json_repository import JSONRepository
+from repositories.sharded_repository import ShardedJSONRepository
+
+def reshard(source: str, target: str, num_shards: int) -> bool:
+    """Load source and write it to target with num_shards student shards."""
+    start = time.perf_counter()
+    source_repository = ShardedJSONRepository(source) if os.path.isdir(source) else JSONRepository(source)
+    manager = source_repository.load()
+    if manager is None:
+        return False
+    if hasattr(source_repository, "close"):
+        source_repository.close()
+
+    repository = ShardedJSONRepository(target, num_shards)
+    if not repository.reshard(manager, num_shards):
+        return False
+    repository.close()
+
+    print(f"Wrote {len(manager.get_all_students())} students to {num_shards} shards in {target} "
+          f"in {time.perf_counter() - start:.2f}s")
+    return True
+
+if __name__ == "__main__":
+    if len(sys.argv) != 4:
+        print(__doc__.strip())
+        sys.exit(2)
+    sys.exit(0 if reshard(sys.argv[1], sys.argv[2], int(sys.argv[3])) else 1)
@@ -1,8 +1,11 @@
-from fastapi import APIRouter, HTTPException, Depends
-from typing import List
+from fastapi import APIRouter, HTTPException, Depends, Request, Response, Query
+from typing import List, Optional
 from controllers.course_controller import CourseController
 from models.pydantic_models import CourseCreate, CourseResponse, CourseDetailResponse
-from repositories.json_repository import JSONRepository
+from models.domain_models import GRADING_SCALES
+from routes.http_cache import make_etag, not_modified
+from routes.dependencies import get_data_service
+from services.data_service import DataService
 
 router = APIRouter(
     prefix="/courses",
@@ -10,31 +13,60 @@ router = APIRouter(
     responses={404: {"description": "Not found"}},
 )
 
-def get_course_controller():
-    repository = JSONRepository()
-    return CourseController(repository)
+DEFAULT_PAGE_SIZE = 100
+MAX_PAGE_SIZE = 1000
+
+async def get_course_controller(service: DataService = Depends(get_data_service)):
+    return CourseController(service)
 
 @router.post("/", response_model=CourseResponse, status_code=201)
-def create_course(course: CourseCreate, controller: CourseController = Depends(get_course_controller)):
+async def create_course(course: CourseCreate, durable: bool = False, controller: CourseController = Depends(get_course_controller)):
     """Create a new course"""
     if controller.get_course(course.course_code):
         raise HTTPException(status_code=400, detail="Course code already exists")
+    if course.grading_scale not in GRADING_SCALES:
+        raise HTTPException(status_code=400, detail=f"Unknown grading scale: {course.grading_scale}")
     
-    success = controller.create_course(course.course_code, course.course_name)
+    success = await controller.create_course(course.course_code, course.course_name, durable,
+                                             grading_scale=course.grading_scale)
     if not success:
         raise HTTPException(status_code=400, detail="Failed to create course")
     
     return course
 
+# Plain def: without a limit this walks every course, so it runs in the
+# thread pool rather than holding up the event loop
 @router.get("/", response_model=List[CourseResponse])
-def get_all_courses(controller: CourseController = Depends(get_course_controller)):
-    """Getting all courses"""
-    courses = controller.get_all_courses()
-    return [{"course_code": c.course_code, "course_name": c.course_name} for c in courses]
+def get_all_courses(response: Response,
+                    limit: Optional[int] = Query(None, ge=1, le=MAX_PAGE_SIZE),
+                    after: Optional[str] = None,
+                    name_contains: Optional[str] = None,
+                    controller: CourseController = Depends(get_course_controller)):
+    """
+    Getting all courses
+    
+    Without any parameters every course is returned. With limit, after or
+    name_contains one page ordered by code is returned; pass the X-Next-Cursor
+    response header as after to fetch the next page.
+    """
+    if limit is None and after is None and name_contains is None:
+        courses = controller.get_all_courses()
+    else:
+        courses, next_cursor = controller.list_courses(limit or DEFAULT_PAGE_SIZE, after, name_contains)
+        if next_cursor is not None:
+            response.headers["X-Next-Cursor"] = next_cursor
+    return [{"course_code": c.course_code, "course_name": c.course_name, "grading_scale": c.grading_scale}
+            for c in courses]
 
 @router.get("/{course_code}", response_model=CourseDetailResponse)
-def get_course(course_code: str, controller: CourseController = Depends(get_course_controller)):
+async def get_course(course_code: str, request: Request, response: Response,
+                     controller: CourseController = Depends(get_course_controller)):
     """Getting a course by code"""
+    version = controller.get_course_version(course_code)
+    cached = not_modified(request, response, version and make_etag("course", version))
+    if cached:
+        return cached
+    
     course = controller.get_course(course_code)
     if not course:
         raise HTTPException(status_code=404, detail="Course not found")
@@ -47,6 +79,7 @@ def get_course(course_code: str, controller: CourseController = Depends(get_cour
     return {
         "course_code": course.course_code,
         "course_name": course.course_name,
+        "grading_scale": course.grading_scale,
         "students": student_ids,
         "average_grade": avg
     }
\ No newline at end of file
@@ -0,0 +1,13 @@
+from fastapi import Request
+from services.data_service import DataService
+
+async def get_data_service(request: Request) -> DataService:
+    """
+    Get the application's DataService, up to date with the data on disk.
+    
+    Costs one stat() of the data files when nothing changed; writes by other
+    worker processes and edits of the file are picked up before the request.
+    """
+    service = request.app.state.data_service
+    await service.refresh_if_changed_async()
+    return service
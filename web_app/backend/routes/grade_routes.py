@@ -1,7 +1,12 @@
-from fastapi import APIRouter, HTTPException, Depends
+import math
+from typing import Optional
+from fastapi import APIRouter, HTTPException, Depends, Request, Response
 from controllers.grade_controller import GradeController
-from models.pydantic_models import EnrollmentCreate, GradeAssign, MessageResponse
-from repositories.json_repository import JSONRepository
+from models.pydantic_models import EnrollmentCreate, GradeAssign, MessageResponse, BulkResultResponse, BulkEnrollmentResponse
+from services.bulk_import import RowParser, BulkUpload, detect_format
+from routes.http_cache import make_etag, not_modified
+from routes.dependencies import get_data_service
+from services.data_service import DataService
 
 router = APIRouter(
     prefix="/grades",
@@ -9,26 +14,25 @@ router = APIRouter(
     responses={404: {"description": "Not found"}},
 )
 
-def get_grade_controller():
-    repository = JSONRepository()
-    return GradeController(repository)
+async def get_grade_controller(service: DataService = Depends(get_data_service)):
+    return GradeController(service)
 
 @router.post("/enroll", response_model=MessageResponse, status_code=201)
-def create_enrollment(enrollment: EnrollmentCreate, controller: GradeController = Depends(get_grade_controller)):
+async def create_enrollment(enrollment: EnrollmentCreate, durable: bool = False, controller: GradeController = Depends(get_grade_controller)):
     """Register a student for a course"""
-    success = controller.register_for_course(enrollment.student_id, enrollment.course_code)
+    success = await controller.register_for_course(enrollment.student_id, enrollment.course_code, durable)
     if not success:
         raise HTTPException(status_code=400, detail="Failed to register student for course")
     
     return {"status": "success", "message": "Student enrolled successfully"}
 
 @router.post("/assign", response_model=MessageResponse, status_code=201)
-def assign_grade(grade: GradeAssign, controller: GradeController = Depends(get_grade_controller)):
+async def assign_grade(grade: GradeAssign, durable: bool = False, controller: GradeController = Depends(get_grade_controller)):
     """Assign a grade to a student for a course"""
-    if grade.grade < 0 or grade.grade > 100:
+    if not math.isfinite(grade.grade) or grade.grade < 0 or grade.grade > 100:
         raise HTTPException(status_code=400, detail="Grade must be between 0 and 100")
     
-    success, letter_grade = controller.assign_grade(grade.student_id, grade.course_code, grade.grade)
+    success, letter_grade = await controller.assign_grade(grade.student_id, grade.course_code, grade.grade, durable)
     if not success:
         raise HTTPException(status_code=400, detail="Failed to assign grade")
     
@@ -37,9 +41,91 @@ def assign_grade(grade: GradeAssign, controller: GradeController = Depends(get_g
         "message": f"Grade {grade.grade} ({letter_grade}) assigned successfully"
     }
 
+@router.post("/assign/bulk", response_model=BulkResultResponse)
+async def assign_grades_bulk(request: Request, format: Optional[str] = None,
+                             controller: GradeController = Depends(get_grade_controller)):
+    """
+    Assign many grades from a streamed CSV or NDJSON body.
+    
+    Each row holds student_id, course_code and grade. Rows are validated and
+    applied as they arrive, everything is saved once at the end (also when
+    the upload breaks off) and the response lists the rows that failed.
+    """
+    try:
+        parser = RowParser(detect_format(request.headers.get("content-type"), format),
+                           ["student_id", "course_code", "grade"])
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    
+    upload = BulkUpload(parser)
+    submitted = False
+    try:
+        async for batch in upload.batches(request.stream()):
+            submitted = True
+            upload.add_errors(await controller.assign_grades(batch))
+    finally:
+        # Batches already applied in memory are saved even if the upload broke off
+        if submitted:
+            await controller.save()
+    
+    applied = upload.processed - upload.failed
+    
+    return {
+        "status": "success" if not upload.failed else "partial" if applied else "failed",
+        "processed": upload.processed,
+        "applied": applied,
+        "failed": upload.failed,
+        "errors": upload.sorted_errors
+    }
+
+@router.post("/enroll/bulk", response_model=BulkEnrollmentResponse)
+async def enroll_students_bulk(request: Request, format: Optional[str] = None, create_missing: bool = False,
+                               controller: GradeController = Depends(get_grade_controller)):
+    """
+    Enroll many students from a streamed CSV or NDJSON roster.
+    
+    Each row holds student_id, course_code and optionally student_name, which
+    is used to create unknown students when create_missing is set. The whole
+    roster is saved once at the end.
+    """
+    try:
+        parser = RowParser(detect_format(request.headers.get("content-type"), format),
+                           ["student_id", "course_code"], optional=["student_name"])
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    
+    upload = BulkUpload(parser)
+    totals = {"enrolled": 0, "duplicates": 0, "created_students": 0, "unknown_students": 0, "unknown_courses": 0}
+    submitted = False
+    try:
+        async for batch in upload.batches(request.stream()):
+            submitted = True
+            summary = await controller.enroll_students(batch, create_missing)
+            upload.add_errors(summary.pop("errors"))
+            for key, value in summary.items():
+                totals[key] += value
+    finally:
+        # Batches already applied in memory are saved even if the upload broke off
+        if submitted:
+            await controller.save()
+    
+    return {
+        "status": "success" if not upload.failed else "partial" if totals["enrolled"] or totals["duplicates"] else "failed",
+        "processed": upload.processed,
+        "failed": upload.failed,
+        "errors": upload.sorted_errors,
+        **totals
+    }
+
 @router.get("/student/{student_id}")
-def get_student_grades(student_id: str, controller: GradeController = Depends(get_grade_controller)):
+async def get_student_grades(student_id: str, request: Request, response: Response,
+                             controller: GradeController = Depends(get_grade_controller)):
     """Getting all grades for a student"""
+    version = controller.get_student_version(student_id)
+    cached = not_modified(request, response, version and make_etag("student-grades", version))
+    if cached:
+        return cached
+    
     grades = controller.get_student_grades(student_id)
     if not grades:
         raise HTTPException(status_code=404, detail="Student not found")
@@ -47,8 +133,14 @@ def get_student_grades(student_id: str, controller: GradeController = Depends(ge
     return grades
 
 @router.get("/course/{course_code}")
-def get_course_grades(course_code: str, controller: GradeController = Depends(get_grade_controller)):
+async def get_course_grades(course_code: str, request: Request, response: Response,
+                            controller: GradeController = Depends(get_grade_controller)):
     """Getting all grades for a course"""
+    version = controller.get_course_version(course_code)
+    cached = not_modified(request, response, version and make_etag("course-grades", version))
+    if cached:
+        return cached
+    
     grades = controller.get_course_grades(course_code)
     if not grades:
         raise HTTPException(status_code=404, detail="Course not found")
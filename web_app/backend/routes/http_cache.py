@@ -0,0 +1,29 @@
+from typing import Optional
+from fastapi import Request, Response
+
+def make_etag(scope: str, version: str) -> str:
+    """Build a weak ETag for a data version; scope keeps different views apart."""
+    return f'W/"{scope}-{version}"'
+
+def not_modified(request: Request, response: Response, etag: Optional[str]) -> Optional[Response]:
+    """
+    Attach the ETag to the response and short-circuit repeat requests.
+    
+    Args:
+        request: Incoming request, checked for If-None-Match
+        response: Response whose headers receive the ETag
+        etag: Current ETag, or None if the resource does not exist
+        
+    Returns:
+        A 304 response if the client already has this version, otherwise None
+    """
+    if etag is None:
+        return None
+    
+    response.headers["ETag"] = etag
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match:
+        tags = [tag.strip() for tag in if_none_match.split(",")]
+        if "*" in tags or etag in tags:
+            return Response(status_code=304, headers={"ETag": etag})
+    return None
@@ -0,0 +1,62 @@
+import time
+from fastapi import APIRouter, Request, Response
+from services import metrics
+
+router = APIRouter(tags=["metrics"])
+
+class MetricsMiddleware:
+    """
+    ASGI middleware counting requests and timing them per route.
+
+    Requests are labelled with the route's path template, e.g.
+    /students/{student_id}, so ids do not create a series each; requests
+    that match no route share the label "unmatched".
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status = 500
+        start = time.perf_counter()
+
+        async def send_with_status(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            # The router stores the matched route in the scope
+            route = scope.get("route")
+            path = getattr(route, "path", "unmatched")
+            method = scope["method"]
+            metrics.HTTP_REQUEST_SECONDS.observe(time.perf_counter() - start, method=method, route=path)
+            metrics.HTTP_REQUESTS.inc(method=method, route=path, status=status)
+
+@router.get("/metrics", include_in_schema=False)
+def get_metrics(request: Request):
+    """
+    Metrics in the Prometheus text exposition format.
+
+    The gauges are read from the current data when the page is scraped.
+    Answers served from HTTP caches show up as status="304" requests.
+    """
+    service = request.app.state.data_service
+    manager = service.manager
+    stats = manager.get_transcript_cache_stats()
+    lookups = stats["hits"] + stats["misses"]
+    metrics.TRANSCRIPT_CACHE_HITS.set(stats["hits"])
+    metrics.TRANSCRIPT_CACHE_MISSES.set(stats["misses"])
+    metrics.TRANSCRIPT_CACHE_HIT_RATIO.set(stats["hits"] / lookups if lookups else 0)
+    metrics.TRANSCRIPT_CACHE_SIZE.set(stats["size"])
+    metrics.STUDENTS.set(manager.count_students())
+    metrics.COURSES.set(manager.count_courses())
+    metrics.PENDING_WRITES.set(service.writer.pending if service.writer else 0)
+    return Response(metrics.REGISTRY.render(), media_type=metrics.CONTENT_TYPE)
@@ -1,7 +1,12 @@
-from fastapi import APIRouter, HTTPException, Depends
+import json
+from typing import Optional
+from fastapi import APIRouter, HTTPException, Depends, Request, Response
+from fastapi.responses import StreamingResponse
 from controllers.report_controller import ReportController
-from models.pydantic_models import TranscriptResponse, CoursePerformance
-from repositories.json_repository import JSONRepository
+from models.pydantic_models import TranscriptResponse, CoursePerformance, CohortSummary
+from routes.http_cache import make_etag, not_modified
+from routes.dependencies import get_data_service
+from services.data_service import DataService
 
 router = APIRouter(
     prefix="/reports",
@@ -9,13 +14,28 @@ router = APIRouter(
     responses={404: {"description": "Not found"}},
 )
 
-def get_report_controller():
-    repository = JSONRepository()
-    return ReportController(repository)
+async def get_report_controller(service: DataService = Depends(get_data_service)):
+    return ReportController(service)
+
+# The whole-cohort reports stay plain def so they run in the thread pool
+@router.get("/transcripts")
+def get_all_transcripts(course_code: Optional[str] = None, controller: ReportController = Depends(get_report_controller)):
+    """Streaming the transcripts of all students as NDJSON, one transcript per line"""
+    if course_code is not None and not controller.get_course(course_code):
+        raise HTTPException(status_code=404, detail="Course not found")
+    
+    lines = (json.dumps(t) + "\n" for t in controller.iter_transcripts(course_code))
+    return StreamingResponse(lines, media_type="application/x-ndjson")
 
 @router.get("/transcript/{student_id}", response_model=TranscriptResponse)
-def get_student_transcript(student_id: str, controller: ReportController = Depends(get_report_controller)):
+async def get_student_transcript(student_id: str, request: Request, response: Response,
+                                 controller: ReportController = Depends(get_report_controller)):
     """Generating a transcript for a student"""
+    version = controller.get_student_version(student_id)
+    cached = not_modified(request, response, version and make_etag("transcript", version))
+    if cached:
+        return cached
+    
     transcript = controller.generate_student_transcript(student_id)
     if not transcript:
         raise HTTPException(status_code=404, detail="Student not found")
@@ -23,10 +43,30 @@ def get_student_transcript(student_id: str, controller: ReportController = Depen
     return transcript
 
 @router.get("/course-performance/{course_code}", response_model=CoursePerformance)
-def get_course_performance(course_code: str, controller: ReportController = Depends(get_report_controller)):
+async def get_course_performance(course_code: str, request: Request, response: Response,
+                                 controller: ReportController = Depends(get_report_controller)):
     """Generating a performance report for a course"""
+    version = controller.get_course_version(course_code)
+    cached = not_modified(request, response, version and make_etag("course-performance", version))
+    if cached:
+        return cached
+    
     performance = controller.generate_course_performance(course_code)
     if not performance:
         raise HTTPException(status_code=404, detail="Course not found")
     
-    return performance
\ No newline at end of file
+    return performance
+
+@router.get("/cohort-summary", response_model=CohortSummary)
+def get_cohort_summary(controller: ReportController = Depends(get_report_controller)):
+    """Generating performance figures for all courses and the cohort GPA"""
+    summary = controller.generate_cohort_summary()
+    if summary is None:
+        raise HTTPException(status_code=501, detail="Cohort analytics require numpy to be installed")
+    
+    return summary
+
+@router.get("/cache-stats")
+async def get_cache_stats(controller: ReportController = Depends(get_report_controller)):
+    """Getting the transcript cache hit/miss counters for monitoring"""
+    return {"transcripts": controller.get_cache_stats()}
\ No newline at end of file
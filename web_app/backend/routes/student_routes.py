@@ -1,8 +1,10 @@
-from fastapi import APIRouter, HTTPException, Depends
-from typing import List
+from fastapi import APIRouter, HTTPException, Depends, Request, Response, Query
+from typing import List, Optional
 from controllers.student_controller import StudentController
-from models.pydantic_models import StudentCreate, StudentResponse, StudentDetailResponse
-from repositories.json_repository import JSONRepository
+from models.pydantic_models import StudentCreate, StudentResponse, StudentDetailResponse, CourseResponse
+from routes.http_cache import make_etag, not_modified
+from routes.dependencies import get_data_service
+from services.data_service import DataService
 
 router = APIRouter(
     prefix="/students",
@@ -10,31 +12,56 @@ router = APIRouter(
     responses={404: {"description": "Not found"}},
 )
 
-def get_student_controller():
-    repository = JSONRepository()
-    return StudentController(repository)
+DEFAULT_PAGE_SIZE = 100
+MAX_PAGE_SIZE = 1000
+
+async def get_student_controller(service: DataService = Depends(get_data_service)):
+    return StudentController(service)
 
 @router.post("/", response_model=StudentResponse, status_code=201)
-def create_student(student: StudentCreate, controller: StudentController = Depends(get_student_controller)):
+async def create_student(student: StudentCreate, durable: bool = False, controller: StudentController = Depends(get_student_controller)):
     """Creating a new student"""
     if controller.get_student(student.student_id):
         raise HTTPException(status_code=400, detail="Student ID already exists")
     
-    success = controller.create_student(student.student_id, student.student_name)
+    success = await controller.create_student(student.student_id, student.student_name, durable)
     if not success:
         raise HTTPException(status_code=400, detail="Failed to create student")
     
     return student
 
+# Plain def: without a limit this walks every student, so it runs in the
+# thread pool rather than holding up the event loop
 @router.get("/", response_model=List[StudentResponse])
-def get_all_students(controller: StudentController = Depends(get_student_controller)):
-    """Getting all students"""
-    students = controller.get_all_students()
+def get_all_students(response: Response,
+                     limit: Optional[int] = Query(None, ge=1, le=MAX_PAGE_SIZE),
+                     after: Optional[str] = None,
+                     name_contains: Optional[str] = None,
+                     controller: StudentController = Depends(get_student_controller)):
+    """
+    Getting all students
+    
+    Without any parameters every student is returned. With limit, after or
+    name_contains one page ordered by ID is returned; pass the X-Next-Cursor
+    response header as after to fetch the next page.
+    """
+    if limit is None and after is None and name_contains is None:
+        students = controller.get_all_students()
+    else:
+        students, next_cursor = controller.list_students(limit or DEFAULT_PAGE_SIZE, after, name_contains)
+        if next_cursor is not None:
+            response.headers["X-Next-Cursor"] = next_cursor
     return [{"student_id": s.student_id, "student_name": s.student_name} for s in students]
 
 @router.get("/{student_id}", response_model=StudentDetailResponse)
-def get_student(student_id: str, controller: StudentController = Depends(get_student_controller)):
+async def get_student(student_id: str, request: Request, response: Response,
+                      controller: StudentController = Depends(get_student_controller)):
     """Getting a student by ID"""
+    version = controller.get_student_version(student_id)
+    cached = not_modified(request, response, version and make_etag("student", version))
+    if cached:
+        return cached
+    
     student = controller.get_student(student_id)
     if not student:
         raise HTTPException(status_code=404, detail="Student not found")
@@ -43,4 +70,14 @@ def get_student(student_id: str, controller: StudentController = Depends(get_stu
         "student_id": student.student_id,
         "student_name": student.student_name,
         "grades": student.get_all_grades()
-    }
\ No newline at end of file
+    }
+
+@router.get("/{student_id}/courses", response_model=List[CourseResponse])
+async def get_student_courses(student_id: str, controller: StudentController = Depends(get_student_controller)):
+    """Getting all courses a student is enrolled in"""
+    if not controller.get_student(student_id):
+        raise HTTPException(status_code=404, detail="Student not found")
+    
+    courses = controller.get_student_courses(student_id)
+    return [{"course_code": c.course_code, "course_name": c.course_name, "grading_scale": c.grading_scale}
+            for c in courses]
\ No newline at end of file
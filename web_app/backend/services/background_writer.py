@@ -0,0 +1,167 @@
+import asyncio
+import threading
+import time
+from typing import List, Optional, Tuple
+
+class BackgroundWriter:
+    """
+    Background thread that coalesces many mutations into a single save.
+
+    Each mutation calls notify(), which returns a ticket. The writer saves
+    once the oldest unsaved mutation is max_delay seconds old or max_pending
+    mutations have piled up, whichever comes first. Callers that need the
+    change on disk before answering can wait() on their ticket, or await
+    wait_async() from the event loop. A failed save wakes the waiters it
+    covered with a failure; the writer keeps retrying in the background.
+    """
+
+    def __init__(self, service, max_delay: float = 0.5, max_pending: int = 500):
+        """
+        Initialize the writer; call start() to launch the thread.
+
+        Args:
+            service: DataService whose manager is saved
+            max_delay: Longest time in seconds a mutation waits before it is saved
+            max_pending: Number of unsaved mutations that triggers an immediate save
+        """
+        self.service = service
+        self.max_delay = max_delay
+        self.max_pending = max_pending
+        self._condition = threading.Condition()
+        self._requested = 0      # ticket of the latest mutation
+        self._saved = 0          # latest ticket known to be on disk
+        self._failed = 0         # latest ticket whose save attempt failed
+        self._waiters: List[Tuple[int, asyncio.Future]] = []  # (ticket, future) of wait_async() calls
+        self._first_pending_at: Optional[float] = None
+        self._stopping = False
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> None:
+        """Start the writer thread."""
+        self._thread = threading.Thread(target=self._run, name="grade-writer", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Save anything still pending and stop the writer thread."""
+        with self._condition:
+            self._stopping = True
+            self._condition.notify_all()
+        if self._thread:
+            self._thread.join()
+            self._thread = None
+        with self._condition:
+            # Whatever the last save did not cover will not be saved any more
+            self._resolve_waiters(self._requested, False)
+
+    def notify(self) -> int:
+        """
+        Register a mutation that needs to be saved.
+
+        Returns:
+            Ticket that can be passed to wait()
+        """
+        with self._condition:
+            self._requested += 1
+            if self._first_pending_at is None:
+                self._first_pending_at = time.monotonic()
+            self._condition.notify_all()
+            return self._requested
+
+    def wait(self, ticket: int, timeout: Optional[float] = None) -> bool:
+        """
+        Block until the mutation identified by ticket has been saved.
+
+        Returns:
+            True if the mutation is on disk, False if the save failed or on timeout
+        """
+        with self._condition:
+            self._condition.wait_for(lambda: self._saved >= ticket or self._failed >= ticket, timeout)
+            return self._saved >= ticket
+
+    async def wait_async(self, ticket: int, timeout: Optional[float] = None) -> bool:
+        """
+        Awaitable wait() that holds no thread while waiting.
+
+        Returns:
+            True if the mutation is on disk, False if the save failed or on timeout
+        """
+        future = asyncio.get_running_loop().create_future()
+        with self._condition:
+            if self._saved >= ticket or self._failed >= ticket:
+                return self._saved >= ticket
+            self._waiters.append((ticket, future))
+        try:
+            return await asyncio.wait_for(future, timeout)
+        except asyncio.TimeoutError:
+            return False
+        finally:
+            with self._condition:
+                if (ticket, future) in self._waiters:
+                    self._waiters.remove((ticket, future))
+
+    def latest_ticket(self) -> int:
+        """Ticket of the most recent mutation."""
+        with self._condition:
+            return self._requested
+
+    @property
+    def pending(self) -> int:
+        """Number of mutations not yet saved."""
+        with self._condition:
+            return self._requested - self._saved
+
+    def _run(self) -> None:
+        while True:
+            with self._condition:
+                self._condition.wait_for(lambda: self._stopping or self._requested > self._saved)
+                if not self._stopping:
+                    deadline = self._first_pending_at + self.max_delay
+                    self._condition.wait_for(
+                        lambda: self._stopping or self._requested - self._saved >= self.max_pending,
+                        max(0.0, deadline - time.monotonic())
+                    )
+                if self._requested == self._saved:
+                    return
+                target = self._requested
+                self._first_pending_at = None
+
+            # The manager lock keeps mutations out while the snapshot is taken;
+            # notify() is called under the same lock, so every ticket issued so
+            # far is covered by this save
+            with self.service.lock:
+                target = max(target, self._requested)
+                success = self.service.save()
+
+            with self._condition:
+                if success:
+                    self._saved = target
+                    if self._saved == self._requested:
+                        self._first_pending_at = None
+                else:
+                    self._failed = target
+                    if self._first_pending_at is None:
+                        # Retry after the usual delay instead of spinning
+                        self._first_pending_at = time.monotonic()
+                self._resolve_waiters(target, success)
+                self._condition.notify_all()
+                if self._stopping and (not success or self._saved == self._requested):
+                    return
+
+    def _resolve_waiters(self, target: int, success: bool) -> None:
+        """Hand the outcome of a save covering tickets up to target to their wait_async() calls."""
+        remaining = []
+        for ticket, future in self._waiters:
+            if ticket > target:
+                remaining.append((ticket, future))
+                continue
+            try:
+                future.get_loop().call_soon_threadsafe(self._set_result, future, success)
+            except RuntimeError:
+                # The waiter's event loop has been closed
+                pass
+        self._waiters = remaining
+
+    @staticmethod
+    def _set_result(future: asyncio.Future, result: bool) -> None:
+        if not future.done():
+            future.set_result(result)
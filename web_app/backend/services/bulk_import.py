@@ -0,0 +1,160 @@
+import csv
+import json
+from typing import AsyncIterator, Dict, List, Optional, Tuple
+
+# Errors beyond this many are counted but not listed in the response
+MAX_REPORTED_ERRORS = 1000
+# Parsed rows are handed out in batches of this size
+BATCH_SIZE = 1000
+
+async def iter_lines(chunks: AsyncIterator[bytes]) -> AsyncIterator[bytes]:
+    """
+    Split a stream of byte chunks into lines as they arrive.
+
+    Lines are left undecoded, so a line that is not valid UTF-8 can be
+    reported on its own instead of failing the whole upload.
+
+    Args:
+        chunks: Asynchronous iterator of raw body chunks
+    """
+    buffer = b""
+    async for chunk in chunks:
+        buffer += chunk
+        *lines, buffer = buffer.split(b"\n")
+        for line in lines:
+            yield line.rstrip(b"\r")
+    if buffer:
+        yield buffer.rstrip(b"\r")
+
+def detect_format(content_type: Optional[str], requested: Optional[str] = None) -> str:
+    """
+    Pick the row format from an explicit choice or the request content type.
+
+    Returns:
+        "csv" or "ndjson"
+    """
+    if requested:
+        return requested
+    if content_type and ("ndjson" in content_type or "jsonl" in content_type or "json" in content_type):
+        return "ndjson"
+    return "csv"
+
+class RowParser:
+    """
+    Parses the lines of an uploaded CSV or NDJSON file into field dictionaries.
+
+    CSV rows list the fields in order and may start with a header row naming
+    them; NDJSON rows are objects with the fields as keys. Fields listed as
+    optional may be left out.
+    """
+
+    def __init__(self, fmt: str, fields: List[str], optional: Optional[List[str]] = None):
+        """
+        Initialize the parser.
+
+        Args:
+            fmt: "csv" or "ndjson"
+            fields: Required fields, in CSV column order
+            optional: Optional fields following the required ones
+        """
+        if fmt not in ("csv", "ndjson"):
+            raise ValueError(f"Unsupported format: {fmt}")
+        self.fmt = fmt
+        self.fields = fields
+        self.optional = optional or []
+        self._first_row = True
+
+    def parse(self, line: str) -> Optional[Dict[str, str]]:
+        """
+        Parse one line.
+
+        Returns:
+            Mapping of field name to value, or None for blank and header lines
+
+        Raises:
+            ValueError: If the line is malformed or misses a required field
+        """
+        if not line.strip():
+            return None
+        first_row, self._first_row = self._first_row, False
+
+        if self.fmt == "ndjson":
+            try:
+                data = json.loads(line)
+            except json.JSONDecodeError as e:
+                raise ValueError(f"Invalid JSON: {e.msg}")
+            if not isinstance(data, dict):
+                raise ValueError("Row must be a JSON object")
+        else:
+            values = [v.strip() for v in next(csv.reader([line]))]
+            if first_row and values[:len(self.fields)] == self.fields:
+                return None
+            data = dict(zip(self.fields + self.optional, values))
+
+        row = {}
+        for field in self.fields:
+            value = data.get(field)
+            if value is None or str(value).strip() == "":
+                raise ValueError(f"Missing field: {field}")
+            row[field] = str(value).strip()
+        for field in self.optional:
+            value = data.get(field)
+            if value is not None and str(value).strip():
+                row[field] = str(value).strip()
+        return row
+
+class BulkUpload:
+    """
+    Turns a streamed upload into batches of parsed rows and collects errors.
+
+    Rows that fail to parse are recorded here; errors found while applying
+    a batch are handed back through add_errors().
+    """
+
+    def __init__(self, parser: RowParser, batch_size: int = BATCH_SIZE):
+        self.parser = parser
+        self.batch_size = batch_size
+        self.processed = 0
+        self.failed = 0
+        self.errors: List[Dict] = []
+
+    def add_errors(self, errors: List[Dict]) -> None:
+        """Record rows that failed, keeping at most MAX_REPORTED_ERRORS of them."""
+        self.failed += len(errors)
+        self.errors.extend(errors[:MAX_REPORTED_ERRORS - len(self.errors)])
+
+    async def batches(self, chunks: AsyncIterator[bytes]) -> AsyncIterator[List[Tuple[int, Dict[str, str]]]]:
+        """
+        Yield batches of (line number, row) pairs as the body streams in.
+
+        Args:
+            chunks: Asynchronous iterator of raw body chunks
+        """
+        batch = []
+        line_number = 0
+        async for line in iter_lines(chunks):
+            line_number += 1
+            try:
+                row = self.parser.parse(line.decode("utf-8"))
+            except UnicodeDecodeError as e:
+                self.processed += 1
+                self.add_errors([{"line": line_number, "error": f"Invalid UTF-8 at byte {e.start}"}])
+                continue
+            except ValueError as e:
+                self.processed += 1
+                self.add_errors([{"line": line_number, "error": str(e)}])
+                continue
+            if row is None:
+                continue
+            self.processed += 1
+            batch.append((line_number, row))
+            if len(batch) >= self.batch_size:
+                yield batch
+                batch = []
+        if batch:
+            yield batch
+
+    @property
+    def sorted_errors(self) -> List[Dict]:
+        """Recorded errors ordered by line number."""
+        return sorted(self.errors, key=lambda e: e["line"])
\ No newline at end of file
@@ -0,0 +1,251 @@
+from typing import Dict, List, Optional
+from models.domain_models import GradeManager, GradeCategory, GradingScale, DEFAULT_SCALE
+
+try:
+    import numpy as np
+except ImportError:  # numpy is optional; the engine is unavailable without it
+    np = None
+
+def is_available() -> bool:
+    """Check whether numpy is installed so the engine can be used."""
+    return np is not None
+
+class ColumnarGradeEngine:
+    """
+    Column-oriented copy of the grade data for cohort-wide analytics.
+
+    Every (student, course) pair that is enrolled or graded is one row in a
+    set of parallel NumPy arrays holding integer student and course ids, the
+    grade and two masks saying whether the row is enrolled and whether it has
+    a grade. Reports over all courses or all students are then single
+    vectorized passes instead of Python loops over objects.
+
+    The engine registers itself as a GradeManager listener, so it stays in
+    sync with every mutation made through the manager.
+    """
+
+    def __init__(self, manager: GradeManager):
+        """
+        Build the columns from a manager and start following its mutations.
+
+        Args:
+            manager: GradeManager to mirror
+        """
+        if np is None:
+            raise RuntimeError("The columnar engine requires numpy")
+
+        self.student_ids: List[str] = []
+        self.course_codes: List[str] = []
+        self.course_scales: List[GradingScale] = []    # Grading scale per course index
+        self._student_index: Dict[str, int] = {}
+        self._course_index: Dict[str, int] = {}
+        self._rows: Dict[tuple, int] = {}    # Maps (student index, course index) to row
+
+        for course in manager.get_all_courses():
+            self._index_course(course.course_code, course.grading_scale)
+        for student in manager.get_all_students():
+            self._index_student(student.student_id)
+
+        students, courses, grades, graded, enrolled = [], [], [], [], []
+        for student in manager.get_all_students():
+            s = self._student_index[student.student_id]
+            enrolled_codes = {course.course_code for course in manager.get_student_courses(student.student_id)}
+            for code in enrolled_codes:
+                self._rows[(s, self._course_index[code])] = len(students)
+                students.append(s)
+                courses.append(self._course_index[code])
+                grades.append(0.0)
+                graded.append(False)
+                enrolled.append(True)
+            for code, grade in student.get_all_grades().items():
+                if code not in self._course_index:
+                    continue
+                key = (s, self._course_index[code])
+                row = self._rows.get(key)
+                if row is None:
+                    row = self._rows[key] = len(students)
+                    students.append(s)
+                    courses.append(key[1])
+                    grades.append(0.0)
+                    graded.append(False)
+                    enrolled.append(False)
+                grades[row] = grade
+                graded[row] = True
+
+        self._size = len(students)
+        capacity = max(16, self._size)
+        self._student = np.zeros(capacity, dtype=np.int32)
+        self._course = np.zeros(capacity, dtype=np.int32)
+        self._grade = np.zeros(capacity, dtype=np.float64)
+        self._graded = np.zeros(capacity, dtype=bool)
+        self._enrolled = np.zeros(capacity, dtype=bool)
+        self._student[:self._size] = students
+        self._course[:self._size] = courses
+        self._grade[:self._size] = grades
+        self._graded[:self._size] = graded
+        self._enrolled[:self._size] = enrolled
+
+        self._manager = manager
+        manager.add_listener(self.on_change)
+
+    def close(self) -> None:
+        """Stop following the manager's mutations."""
+        self._manager.remove_listener(self.on_change)
+
+    ### Keeping in sync
+
+    def on_change(self, op: str, payload: Dict) -> None:
+        """Apply a mutation reported by the GradeManager."""
+        if op == "add_student":
+            self._index_student(payload["student_id"])
+        elif op == "add_course":
+            self._index_course(payload["course_code"], payload.get("grading_scale", DEFAULT_SCALE))
+        elif op == "register":
+            row = self._row(payload["student_id"], payload["course_code"])
+            self._enrolled[row] = True
+        elif op == "assign_grade":
+            row = self._row(payload["student_id"], payload["course_code"])
+            self._grade[row] = payload["grade"]
+            self._graded[row] = True
+
+    def _index_student(self, student_id: str) -> int:
+        if student_id not in self._student_index:
+            self._student_index[student_id] = len(self.student_ids)
+            self.student_ids.append(student_id)
+        return self._student_index[student_id]
+
+    def _index_course(self, course_code: str, grading_scale: str = DEFAULT_SCALE) -> int:
+        if course_code not in self._course_index:
+            self._course_index[course_code] = len(self.course_codes)
+            self.course_codes.append(course_code)
+            self.course_scales.append(GradeCategory.get_scale(grading_scale))
+        return self._course_index[course_code]
+
+    def _row(self, student_id: str, course_code: str) -> int:
+        """Get the row of a (student, course) pair, appending it if new."""
+        key = (self._index_student(student_id), self._index_course(course_code))
+        row = self._rows.get(key)
+        if row is not None:
+            return row
+
+        if self._size == len(self._student):
+            self._grow()
+        row = self._rows[key] = self._size
+        self._student[row], self._course[row] = key
+        self._grade[row] = 0.0
+        self._graded[row] = False
+        self._enrolled[row] = False
+        self._size += 1
+        return row
+
+    def _grow(self) -> None:
+        capacity = len(self._student) * 2
+        for name in ("_student", "_course", "_grade", "_graded", "_enrolled"):
+            old = getattr(self, name)
+            new = np.zeros(capacity, dtype=old.dtype)
+            new[:len(old)] = old
+            setattr(self, name, new)
+
+    ### Vectorized reports
+
+    def _course_columns(self):
+        """Course ids and grades of the graded rows of enrolled students."""
+        n = self._size
+        mask = self._graded[:n] & self._enrolled[:n]
+        return self._course[:n][mask], self._grade[:n][mask]
+
+    def course_averages(self) -> Dict[str, Optional[float]]:
+        """Average grade per course, None for courses without grades."""
+        courses, grades = self._course_columns()
+        counts = np.bincount(courses, minlength=len(self.course_codes))
+        sums = np.bincount(courses, weights=grades, minlength=len(self.course_codes))
+        return {
+            code: float(sums[i] / counts[i]) if counts[i] else None
+            for i, code in enumerate(self.course_codes)
+        }
+
+    def _scale_groups(self, courses):
+        """
+        Split rows by the grading scale of their course.
+
+        Yields each scale used together with a mask selecting its rows.
+        """
+        scale_ids = {}
+        course_scale = np.array([scale_ids.setdefault(scale.name, len(scale_ids)) for scale in self.course_scales],
+                                dtype=np.int32)
+        row_scale = course_scale[courses] if len(course_scale) else np.zeros(0, dtype=np.int32)
+        scales = {scale.name: scale for scale in self.course_scales}
+        for name, scale_id in scale_ids.items():
+            yield scales[name], row_scale == scale_id
+
+    def course_pass_rates(self) -> Dict[str, Optional[float]]:
+        """Percentage of passing grades per course, None for courses without grades."""
+        courses, grades = self._course_columns()
+        counts = np.bincount(courses, minlength=len(self.course_codes))
+        pass_marks = np.array([scale.pass_mark for scale in self.course_scales], dtype=np.float64)
+        passing = grades >= pass_marks[courses] if len(pass_marks) else np.zeros(0, dtype=bool)
+        passed = np.bincount(courses[passing], minlength=len(self.course_codes))
+        return {
+            code: float(passed[i] / counts[i] * 100) if counts[i] else None
+            for i, code in enumerate(self.course_codes)
+        }
+
+    def grade_distributions(self) -> Dict[str, Dict[str, int]]:
+        """Number of students per letter grade per course, leaving out empty letters."""
+        courses, grades = self._course_columns()
+        num_courses = len(self.course_codes)
+        distributions = {code: {} for code in self.course_codes}
+        for scale, mask in self._scale_groups(courses):
+            width = len(scale.letters)
+            letters = scale.letter_indexes(grades[mask])
+            counts = np.bincount(courses[mask] * width + letters, minlength=num_courses * width)
+            counts = counts.reshape(num_courses, width)
+            for i, code in enumerate(self.course_codes):
+                if self.course_scales[i] is scale:
+                    distributions[code] = {scale.letters[j]: int(counts[i, j])
+                                           for j in reversed(range(width)) if counts[i, j]}
+        return distributions
+
+    def course_summaries(self) -> Dict[str, Dict]:
+        """Count, average, highest, lowest, pass rate and distribution per course."""
+        courses, grades = self._course_columns()
+        num_courses = len(self.course_codes)
+        counts = np.bincount(courses, minlength=num_courses)
+        highest = np.full(num_courses, -np.inf)
+        lowest = np.full(num_courses, np.inf)
+        np.maximum.at(highest, courses, grades)
+        np.minimum.at(lowest, courses, grades)
+        averages = self.course_averages()
+        pass_rates = self.course_pass_rates()
+        distributions = self.grade_distributions()
+        return {
+            code: {
+                "num_graded": int(counts[i]),
+                "average_grade": averages[code],
+                "highest_grade": float(highest[i]) if counts[i] else None,
+                "lowest_grade": float(lowest[i]) if counts[i] else None,
+                "pass_rate": pass_rates[code],
+                "grade_distribution": distributions[code]
+            }
+            for i, code in enumerate(self.course_codes)
+        }
+
+    def student_gpas(self) -> Dict[str, float]:
+        """GPA of every student, computed the same way as the transcript."""
+        n = self._size
+        mask = self._graded[:n]
+        students = self._student[:n][mask]
+        courses = self._course[:n][mask]
+        grades = self._grade[:n][mask]
+
+        points = np.zeros(len(grades))
+        counted = np.zeros(len(grades), dtype=bool)
+        for scale, scale_mask in self._scale_groups(courses):
+            if scale.counts_towards_gpa:
+                points[scale_mask] = scale.get_grade_points_batch(grades[scale_mask])
+                counted |= scale_mask
+
+        taken = np.bincount(students[counted], minlength=len(self.student_ids))
+        total = np.bincount(students[counted], weights=points[counted], minlength=len(self.student_ids))
+        gpas = np.round(np.divide(total, taken, out=np.zeros(len(self.student_ids)), where=taken > 0), 2)
+        return dict(zip(self.student_ids, gpas.tolist()))
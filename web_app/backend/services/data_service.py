@@ -0,0 +1,362 @@
+import threading
+from contextlib import contextmanager
+from typing import Callable, Dict, Iterator, List, Optional, Tuple, TypeVar, Union
+from models.domain_models import GradeManager
+from repositories.async_repository import AsyncRepository
+from repositories.json_repository import JSONRepository
+from repositories.sqlite_repository import SQLiteRepository
+from repositories.sharded_repository import ShardedJSONRepository
+from services.background_writer import BackgroundWriter
+from services import columnar_engine, metrics
+
+T = TypeVar("T")
+
+# Longest time in seconds a durable request waits for the background writer's save
+DURABLE_SAVE_TIMEOUT = 10.0
+
+class PersistenceError(Exception):
+    """
+    A mutation could not be persisted and was undone in memory.
+    
+    conflict is True when another process changed the data meanwhile, so
+    the request may succeed when repeated.
+    """
+    
+    def __init__(self, message: str, conflict: bool = False):
+        super().__init__(message)
+        self.conflict = conflict
+
+class DurabilityError(Exception):
+    """
+    A mutation was applied but could not be confirmed on disk in time.
+    
+    The background writer keeps trying to save it, so it is not undone.
+    """
+
+class DataService:
+    """
+    Application-scoped holder for the in-memory GradeManager.
+
+    The data file is loaded once when the service is created and every
+    controller works against the same manager, so a request no longer
+    re-reads and re-parses the whole file.
+    
+    Async request handlers read the manager directly on the event loop and
+    hand mutations to execute(), which applies and persists them on the
+    storage thread of an AsyncRepository.
+    
+    When several processes (uvicorn workers) serve the same data, the
+    service is created with shared=True and every mutation runs in a
+    transaction() that holds the repository's cross-process lock, first
+    reloads the data if another process changed it and saves before the
+    lock is released. Each process then applies its change on top of the
+    others' instead of overwriting them. Readers call refresh_if_changed(),
+    which only reloads when the repository's files changed on disk.
+    
+    Without shared=True another process can still write in between; the
+    repository then rejects the save. The service keeps the mutations made
+    since the last successful save, so it reloads the other process's data,
+    applies them again on top and saves once more. A mutation that still
+    cannot be persisted is undone in memory and record() raises
+    PersistenceError.
+    """
+    
+    def __init__(self, repository: Union[JSONRepository, SQLiteRepository, ShardedJSONRepository],
+                 manager: Optional[GradeManager] = None, shared: bool = False):
+        """
+        Initialize the data service.
+        
+        Args:
+            repository: Repository used to load and persist the data
+            manager: Already loaded manager; loaded from the repository if omitted
+            shared: Whether other processes write to the same repository
+        
+        Raises:
+            RuntimeError: If the repository's data exists but cannot be loaded;
+                starting empty would overwrite it with the first save
+        """
+        self.repository = repository
+        # Label of the repository's load, save and record timings on /metrics
+        self.repository_name = type(repository).__name__
+        if manager is None:
+            # Repositories without any data yet load as an empty manager
+            manager = self._load()
+            if manager is None:
+                raise RuntimeError("Could not load the data; refusing to start with an empty data set")
+        self.manager = manager
+        self.shared = shared
+        # Mutations since the last successful save, as (operation, arguments)
+        self._unsaved: List[Tuple[str, Dict]] = []
+        self.manager.add_listener(self._on_change)
+        # Version of the manager known to be persisted, used by shared transactions
+        self._saved_version = self.manager.version
+        # Requests run in a thread pool, so mutations and saves are serialized
+        self.lock = threading.RLock()
+        self.store = AsyncRepository()
+        self.writer: Optional[BackgroundWriter] = None
+        self._engine: Optional[columnar_engine.ColumnarGradeEngine] = None
+    
+    def start_background_writer(self, max_delay: float = 0.5, max_pending: int = 500) -> None:
+        """
+        Save through a background writer that groups many mutations into one save.
+        
+        Args:
+            max_delay: Longest time in seconds a mutation waits before it is saved
+            max_pending: Number of unsaved mutations that triggers an immediate save
+        
+        Raises:
+            ValueError: If the service is shared, where every mutation must be
+                saved before the cross-process lock is released
+        """
+        if self.shared:
+            raise ValueError("A background writer cannot be used with shared storage")
+        self.writer = BackgroundWriter(self, max_delay, max_pending)
+        self.writer.start()
+    
+    def close(self) -> None:
+        """Flush pending saves, stop the background writer and release the repository."""
+        self.store.close()
+        if self.writer:
+            self.writer.stop()
+            self.writer = None
+        if hasattr(self.repository, "close"):
+            self.repository.close()
+    
+    @contextmanager
+    def transaction(self) -> Iterator[GradeManager]:
+        """
+        Hold the locks a mutation needs and yield the manager to apply it to.
+        
+        Use the yielded manager rather than one fetched earlier: with shared
+        storage it is reloaded here when another process changed the data,
+        and any change left unsaved by the block is saved before the
+        cross-process lock is released.
+        """
+        with self.lock:
+            if not self.shared:
+                yield self.manager
+                return
+            with self.repository.lock:
+                if self.repository.has_changed() and not self._catch_up_locked():
+                    raise RuntimeError("Could not reload data changed by another process")
+                yield self.manager
+                if self.manager.version != self._saved_version and not self.save():
+                    self.discard_unsaved()
+                    raise PersistenceError("Could not save the data")
+    
+    def save(self) -> bool:
+        """
+        Persist the current state of the manager.
+        
+        If another process wrote since the data was loaded, its data is
+        loaded, the unsaved mutations are applied on top and saved instead.
+        """
+        with self.lock:
+            if self._save_locked():
+                return True
+            if not self.repository.has_changed():
+                return False
+            with self.repository.lock:
+                return self._rebase_locked() is not None and self._save_locked()
+    
+    def discard_unsaved(self) -> bool:
+        """
+        Drop the mutations made since the last successful save by loading
+        the repository's data again.
+        
+        Returns:
+            True if the data was reloaded, False if loading failed
+        """
+        with self.lock:
+            manager = self._load()
+            if manager is None:
+                return False
+            self._replace_manager(manager)
+            return True
+    
+    def record(self, op: str, payload: Dict) -> bool:
+        """
+        Persist a mutation that has just been applied to the manager.
+        
+        With a background writer the mutation is only queued for the next
+        group save; use wait_until_saved() when it must be on disk.
+        
+        Args:
+            op: Operation name understood by GradeManager.apply_operation
+            payload: Arguments of the operation
+        
+        Raises:
+            PersistenceError: If the mutation could not be persisted; it has
+                been undone in memory
+        """
+        with self.lock:
+            if self.writer:
+                self.writer.notify()
+                return True
+            version = self.manager.version
+            with metrics.REPOSITORY_SECONDS.time(repository=self.repository_name, operation="record"):
+                success = self.repository.record(self.manager, op, payload)
+            # The mutation being recorded is the last one applied
+            unsaved = self._unsaved[:-1] if self._unsaved[-1:] == [(op, payload)] else self._unsaved
+            if success:
+                self._unsaved = unsaved
+                if not unsaved:
+                    self._saved_version = version
+                return True
+            
+            conflict = self.repository.has_changed()
+            if conflict:
+                # Another process wrote meanwhile: apply the mutation on top of its data
+                with self.repository.lock:
+                    rejected = self._rebase_locked()
+                    if rejected is not None and (op, payload) not in rejected and self._save_locked():
+                        return True
+            with self.repository.lock:
+                self._rebase_locked(unsaved)
+            raise PersistenceError("The data was changed by another process, try again" if conflict
+                                   else "Could not save the data", conflict)
+    
+    async def execute(self, func: Callable[..., T], *args) -> T:
+        """
+        Run a mutation, including its record() call, off the event loop.
+        
+        Mutations run one at a time on the storage thread, so the loop never
+        blocks on the lock while a save is in progress.
+        """
+        return await self.store.run(func, *args)
+    
+    async def wait_until_saved_async(self, timeout: Optional[float] = DURABLE_SAVE_TIMEOUT) -> bool:
+        """
+        Awaitable wait_until_saved() that keeps the event loop free and
+        holds no thread while waiting.
+        
+        Raises:
+            DurabilityError: If the save failed or did not finish within timeout
+        """
+        if not self.writer:
+            return True
+        if not await self.writer.wait_async(self.writer.latest_ticket(), timeout):
+            raise DurabilityError("The change could not be saved yet, it will be retried")
+        return True
+    
+    def wait_until_saved(self, timeout: Optional[float] = None) -> bool:
+        """
+        Block until every mutation recorded so far has been saved.
+        
+        Must not be called while holding the lock, or the writer cannot save.
+        
+        Returns:
+            True if everything is on disk, False if a save failed or on timeout
+        """
+        if not self.writer:
+            return True
+        return self.writer.wait(self.writer.latest_ticket(), timeout)
+    
+    def get_columnar_engine(self) -> Optional[columnar_engine.ColumnarGradeEngine]:
+        """
+        Get the columnar analytics engine, building it on first use.
+        
+        Returns:
+            The engine, or None if numpy is not installed
+        """
+        if not columnar_engine.is_available():
+            return None
+        with self.lock:
+            if self._engine is None:
+                self._engine = columnar_engine.ColumnarGradeEngine(self.manager)
+            return self._engine
+    
+    def refresh_if_changed(self) -> bool:
+        """
+        Pick up data written by other processes or edited on disk.
+        
+        When nothing changed this costs one stat() of the data files (a
+        PRAGMA for SQLite). The refresh is skipped while this process has
+        changes of its own that are not saved yet, since a reload would drop
+        them.
+        
+        Returns:
+            True if the manager was brought up to date with the repository
+        """
+        if not self.repository.has_changed():
+            return False
+        with self.lock, self.repository.lock:
+            if not self.repository.has_changed() or self.manager.version != self._saved_version:
+                return False
+            return self._catch_up_locked()
+    
+    async def refresh_if_changed_async(self) -> bool:
+        """
+        Awaitable refresh_if_changed() for request handlers.
+        
+        The change check runs on the event loop; a reload, when needed, runs
+        on the storage thread in turn with the mutations.
+        """
+        if not self.repository.has_changed():
+            return False
+        return await self.execute(self.refresh_if_changed)
+    
+    def _catch_up_locked(self) -> bool:
+        """
+        Bring the manager up to date with the repository, whose lock is
+        already held.
+        
+        A journaled repository replays just the records other processes
+        appended, anything else is loaded again in full.
+        """
+        catch_up = getattr(self.repository, "catch_up", None)
+        if catch_up is not None:
+            with metrics.REPOSITORY_SECONDS.time(repository=self.repository_name, operation="catch_up"):
+                caught_up = catch_up(self.manager)
+            if caught_up:
+                # The replayed records are on disk already
+                self._saved_version = self.manager.version
+                self._unsaved = []
+                return True
+        manager = self._load()
+        if manager is None:
+            return False
+        self._replace_manager(manager)
+        return True
+    
+    def _save_locked(self) -> bool:
+        version = self.manager.version
+        with metrics.REPOSITORY_SECONDS.time(repository=self.repository_name, operation="save"):
+            success = self.repository.save(self.manager)
+        if success:
+            self._saved_version = version
+            self._unsaved = []
+        return success
+    
+    def _rebase_locked(self, mutations: Optional[List[Tuple[str, Dict]]] = None) -> Optional[List[Tuple[str, Dict]]]:
+        """
+        Load the repository's data, whose lock is already held, and apply
+        mutations on top of it, by default the unsaved ones.
+        
+        Returns:
+            The mutations that no longer apply to the loaded data, or None if
+            loading failed and the manager was left as it was
+        """
+        mutations = self._unsaved if mutations is None else mutations
+        manager = self._load()
+        if manager is None:
+            return None
+        self._replace_manager(manager)
+        return [(op, payload) for op, payload in mutations if not manager.apply_operation(op, payload)]
+    
+    def _on_change(self, op: str, payload: Dict) -> None:
+        self._unsaved.append((op, payload))
+    
+    def _load(self) -> Optional[GradeManager]:
+        with metrics.REPOSITORY_SECONDS.time(repository=self.repository_name, operation="load"):
+            return self.repository.load()
+    
+    def _replace_manager(self, manager: GradeManager) -> None:
+        self.manager.remove_listener(self._on_change)
+        self.manager = manager
+        self._saved_version = manager.version
+        self._unsaved = []
+        manager.add_listener(self._on_change)
+        if self._engine is not None:
+            self._engine.close()
+            self._engine = None
@@ -0,0 +1,191 @@
+import bisect
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, Iterator, List, Tuple
+
+# Version 0.0.4 of the Prometheus text exposition format
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+# Upper bounds in seconds, from a dictionary lookup to a full save of a large file
+DEFAULT_BUCKETS = (0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05,
+                   0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+def _escape(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if not float(value).is_integer() else str(int(value))
+
+class Metric:
+    """
+    A named metric with a fixed set of labels, rendered in the text format.
+
+    Values are kept per tuple of label values; updates may come from any
+    thread.
+    """
+
+    kind = ""
+
+    def __init__(self, name: str, documentation: str, labels: Tuple[str, ...] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labels = labels
+        self._lock = threading.Lock()
+
+    def _key(self, labels: Dict[str, object]) -> Tuple:
+        # Values are turned into text when rendered, which keeps updates cheap
+        return tuple([labels[name] for name in self.labels])
+
+    def _label_text(self, key: Tuple, extra: str = "") -> str:
+        pairs = [f'{name}="{_escape(value)}"' for name, value in zip(self.labels, key)]
+        if extra:
+            pairs.append(extra)
+        return "{" + ",".join(pairs) + "}" if pairs else ""
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.kind}"]
+        lines.extend(self._samples())
+        return lines
+
+    def _samples(self) -> List[str]:
+        raise NotImplementedError
+
+
+class Counter(Metric):
+    """Value that only goes up, such as a number of requests or bytes."""
+
+    kind = "counter"
+
+    def __init__(self, name: str, documentation: str, labels: Tuple[str, ...] = ()):
+        super().__init__(name, documentation, labels)
+        self._values: Dict[Tuple, float] = {}
+
+    def inc(self, amount: float = 1, **labels) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def _samples(self) -> List[str]:
+        with self._lock:
+            values = sorted(self._values.items())
+        return [f"{self.name}{self._label_text(key)} {_format_value(value)}" for key, value in values]
+
+
+class Gauge(Metric):
+    """Value that is set to the current state, such as a cache size."""
+
+    kind = "gauge"
+
+    def __init__(self, name: str, documentation: str, labels: Tuple[str, ...] = ()):
+        super().__init__(name, documentation, labels)
+        self._values: Dict[Tuple, float] = {}
+
+    def set(self, value: float, **labels) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = value
+
+    def _samples(self) -> List[str]:
+        with self._lock:
+            values = sorted(self._values.items())
+        return [f"{self.name}{self._label_text(key)} {_format_value(value)}" for key, value in values]
+
+
+class Histogram(Metric):
+    """Distribution of durations over fixed buckets, with their sum and count."""
+
+    kind = "histogram"
+
+    def __init__(self, name: str, documentation: str, labels: Tuple[str, ...] = (),
+                 buckets: Tuple[float, ...] = DEFAULT_BUCKETS):
+        super().__init__(name, documentation, labels)
+        self.buckets = tuple(buckets)
+        # Per label values: observations per bucket (the last one is +Inf), sum
+        self._values: Dict[Tuple, Tuple[List[int], List[float]]] = {}
+
+    def observe(self, value: float, **labels) -> None:
+        key = self._key(labels)
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            entry = self._values.get(key)
+            if entry is None:
+                entry = self._values[key] = ([0] * (len(self.buckets) + 1), [0.0])
+            entry[0][index] += 1
+            entry[1][0] += value
+
+    @contextmanager
+    def time(self, **labels) -> Iterator[None]:
+        """Observe the duration of the block in seconds."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - start, **labels)
+
+    def _samples(self) -> List[str]:
+        with self._lock:
+            values = sorted((key, (list(counts), total[0])) for key, (counts, total) in self._values.items())
+        lines = []
+        for key, (counts, total) in values:
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float("inf"),), counts):
+                cumulative += count
+                bound_label = 'le="' + _format_value(bound) + '"'
+                lines.append(f"{self.name}_bucket{self._label_text(key, bound_label)} {cumulative}")
+            lines.append(f"{self.name}_sum{self._label_text(key)} {_format_value(total)}")
+            lines.append(f"{self.name}_count{self._label_text(key)} {cumulative}")
+        return lines
+
+
+class Registry:
+    """The metrics exposed together on one /metrics page."""
+
+    def __init__(self):
+        self._metrics: List[Metric] = []
+
+    def register(self, metric: Metric) -> Metric:
+        self._metrics.append(metric)
+        return metric
+
+    def render(self) -> str:
+        lines = []
+        for metric in self._metrics:
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+REGISTRY = Registry()
+
+HTTP_REQUESTS = REGISTRY.register(Counter(
+    "grade_http_requests_total", "HTTP requests by route template and status.", ("method", "route", "status")))
+HTTP_REQUEST_SECONDS = REGISTRY.register(Histogram(
+    "grade_http_request_duration_seconds", "Time from receiving a request to the end of its response.",
+    ("method", "route")))
+REPOSITORY_SECONDS = REGISTRY.register(Histogram(
+    "grade_repository_operation_seconds",
+    "Duration of repository loads, saves, single-mutation records and journal catch-ups.",
+    ("repository", "operation")))
+REPOSITORY_READ_BYTES = REGISTRY.register(Counter(
+    "grade_repository_read_bytes_total", "Bytes of data and journal files read by repositories.", ("repository",)))
+REPOSITORY_WRITTEN_BYTES = REGISTRY.register(Counter(
+    "grade_repository_written_bytes_total", "Bytes of data and journal files written by repositories.",
+    ("repository",)))
+SERIALIZATION_SECONDS = REGISTRY.register(Histogram(
+    "grade_manager_serialization_seconds",
+    "Duration of GradeManager.to_dict, GradeManager.from_dict and of streaming a JSON file into a GradeManager.",
+    ("operation",)))
+TRANSCRIPT_CACHE_HITS = REGISTRY.register(Gauge(
+    "grade_transcript_cache_hits", "Transcript cache hits since the data was loaded."))
+TRANSCRIPT_CACHE_MISSES = REGISTRY.register(Gauge(
+    "grade_transcript_cache_misses", "Transcript cache misses since the data was loaded."))
+TRANSCRIPT_CACHE_HIT_RATIO = REGISTRY.register(Gauge(
+    "grade_transcript_cache_hit_ratio", "Share of transcript requests served from the cache."))
+TRANSCRIPT_CACHE_SIZE = REGISTRY.register(Gauge(
+    "grade_transcript_cache_entries", "Transcripts held in the cache."))
+STUDENTS = REGISTRY.register(Gauge("grade_students", "Students in the loaded data."))
+COURSES = REGISTRY.register(Gauge("grade_courses", "Courses in the loaded data."))
+PENDING_WRITES = REGISTRY.register(Gauge(
+    "grade_pending_writes", "Mutations waiting for the background writer's next save."))